@@ -0,0 +1,178 @@
+"""
+Compare throughput of the WSGI and ASGI deployments under concurrent connections.
+
+    python benchmarks/bench_asgi.py [--concurrency 1,16,64] [--duration 5] [--workers 2] [--db-latency-ms 0]
+
+Seeds a throwaway SQLite database, then starts gunicorn twice with the same
+number of workers: sync workers serving taskmanager.wsgi (the current
+deployment) and uvicorn workers serving taskmanager.asgi. Each keeps
+`concurrency` keep-alive connections busy on the read endpoints for
+`duration` seconds: the DRF views under WSGI, the async views under ASGI.
+--db-latency-ms adds a sleep to every query to mimic a remote database.
+"""
+
+import argparse
+import http.client
+import os
+import re
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+SETTINGS_TEMPLATE = '''
+import time
+from django.db.backends.signals import connection_created
+from taskmanager.settings_test import *
+
+DEBUG = False
+ALLOWED_HOSTS = ['127.0.0.1', 'localhost']
+DATABASES['default']['NAME'] = {db_path!r}
+LOGGING = {{'version': 1, 'disable_existing_loggers': False}}
+
+def _add_latency(execute, sql, params, many, context):
+    time.sleep({latency})
+    return execute(sql, params, many, context)
+
+def _install_latency(sender, connection, **kwargs):
+    if {latency} and _add_latency not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_add_latency)
+
+connection_created.connect(_install_latency, weak=False)
+'''
+
+MODES = {
+    'wsgi': (['taskmanager.wsgi:application', '--worker-class', 'sync'], ''),
+    'asgi': (['taskmanager.asgi:application', '--worker-class', 'uvicorn.workers.UvicornWorker'], 'async/'),
+}
+ENDPOINTS = ['tasks/', 'tasks/dashboard_stats/', 'profile/me/', 'quick-actions/']
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def wait_for(port, timeout=20):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with socket.create_connection(('127.0.0.1', port), timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f'server on port {port} did not start')
+
+
+def login(port, email, password):
+    """Log in through /login/ and return the Cookie header for API requests"""
+    conn = http.client.HTTPConnection('127.0.0.1', port)
+    conn.request('GET', '/login/')
+    response = conn.getresponse()
+    response.read()
+    csrf = re.search(r'csrftoken=([^;]+)', response.getheader('Set-Cookie')).group(1)
+    body = f'email={email}&password={password}&csrfmiddlewaretoken={csrf}'
+    conn.request('POST', '/login/', body, {
+        'Content-Type': 'application/x-www-form-urlencoded',
+        'Cookie': f'csrftoken={csrf}',
+        'Referer': f'http://127.0.0.1:{port}/login/',
+    })
+    response = conn.getresponse()
+    response.read()
+    session = re.search(r'sessionid=([^;]+)', response.getheader('Set-Cookie') or '')
+    if not session:
+        raise RuntimeError('login failed')
+    return f'sessionid={session.group(1)}'
+
+
+def drive(port, prefix, cookie, concurrency, duration):
+    """Keep `concurrency` connections busy; return (requests, errors, latencies)"""
+    latencies, errors = [], [0]
+    lock = threading.Lock()
+    stop = time.perf_counter() + duration
+
+    def worker(index):
+        conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+        own, failed, i = [], 0, index
+        while time.perf_counter() < stop:
+            path = f'/api/{prefix}{ENDPOINTS[i % len(ENDPOINTS)]}'
+            i += 1
+            start = time.perf_counter()
+            try:
+                conn.request('GET', path, headers={'Cookie': cookie, 'Accept': 'application/json'})
+                response = conn.getresponse()
+                response.read()
+                if response.status != 200:
+                    failed += 1
+            except (OSError, http.client.HTTPException):
+                failed += 1
+                conn.close()
+                conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+            own.append(time.perf_counter() - start)
+        with lock:
+            latencies.extend(own)
+            errors[0] += failed
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return len(latencies), errors[0], sorted(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--concurrency', default='1,16,64', help='comma-separated connection counts')
+    parser.add_argument('--duration', type=float, default=5, help='seconds per measurement')
+    parser.add_argument('--workers', type=int, default=2, help='gunicorn workers in both modes')
+    parser.add_argument('--tasks', type=int, default=2000, help='tasks owned by the benchmark user')
+    parser.add_argument('--db-latency-ms', type=float, default=0, help='sleep added to every query')
+    args = parser.parse_args()
+
+    workdir = Path(tempfile.mkdtemp(prefix='taskflow-bench-'))
+    try:
+        (workdir / 'bench_settings.py').write_text(SETTINGS_TEMPLATE.format(
+            db_path=str(workdir / 'bench.sqlite3'), latency=args.db_latency_ms / 1000,
+        ))
+        env = dict(os.environ, PYTHONPATH=f'{workdir}{os.pathsep}{ROOT}', DJANGO_SETTINGS_MODULE='bench_settings')
+        env.pop('PROMETHEUS_MULTIPROC_DIR', None)
+        manage = [sys.executable, str(ROOT / 'manage.py')]
+        subprocess.run(manage + ['migrate', '-v0'], env=env, check=True, cwd=ROOT)
+        subprocess.run(manage + ['seed_perf_data', '--users', '1', '--max-tasks', str(args.tasks)],
+                       env=env, check=True, cwd=ROOT, stdout=subprocess.DEVNULL)
+
+        print(f'{args.workers} workers, {args.tasks} tasks, +{args.db_latency_ms}ms per query\n')
+        print(f'{"mode":<6}{"conns":>7}{"req/s":>10}{"p50 ms":>10}{"p95 ms":>10}{"p99 ms":>10}{"errors":>8}')
+        for mode, (app_args, prefix) in MODES.items():
+            port = free_port()
+            server = subprocess.Popen(
+                ['gunicorn', *app_args, '--workers', str(args.workers), '--bind', f'127.0.0.1:{port}',
+                 '--log-level', 'warning'],
+                env=env, cwd=ROOT,
+            )
+            try:
+                wait_for(port)
+                cookie = login(port, 'perf_user_0@example.com', 'perf-password')
+                for concurrency in (int(value) for value in args.concurrency.split(',')):
+                    count, errors, latencies = drive(port, prefix, cookie, concurrency, args.duration)
+                    pct = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else [0] * 99
+                    print(f'{mode:<6}{concurrency:>7}{count / args.duration:>10.1f}{pct[49] * 1000:>10.1f}'
+                          f'{pct[94] * 1000:>10.1f}{pct[98] * 1000:>10.1f}{errors:>8}')
+            finally:
+                server.terminate()
+                server.wait()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+"""
+Measure email login latency against a large auth_user table.
+
+    python benchmarks/bench_email_login.py [--users 1000000] [--logins 50]
+
+Builds a throwaway SQLite database with `users` accounts, then times
+`logins` logins with randomly chosen, randomly cased emails in two ways: the
+old lookup (User.objects.get(email=...) and then a username authenticate())
+and EmailBackend (one lookup through the NULLIF(LOWER(email), '') index).
+Passwords use the test settings' MD5 hasher so the numbers show the lookup
+rather than the password hash, which production pays on top of either.
+"""
+
+import argparse
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+SETTINGS_TEMPLATE = '''
+from taskmanager.settings_test import *
+
+DATABASES['default']['NAME'] = {db_path!r}
+LOGGING = {{'version': 1, 'disable_existing_loggers': False}}
+'''
+
+BATCH = 20_000
+
+
+def seed(count, password_hash):
+    from django.db import connection, transaction
+    from django.utils import timezone
+
+    now = timezone.now()
+    sql = ('INSERT INTO auth_user (password, is_superuser, username, first_name, last_name, email, '
+           'is_staff, is_active, date_joined) VALUES (%s, 0, %s, %s, %s, %s, 0, 1, %s)')
+    with transaction.atomic(), connection.cursor() as cursor:
+        for start in range(0, count, BATCH):
+            cursor.executemany(sql, [
+                (password_hash, f'user{i}', 'Bench', f'User {i}', f'user{i}@example.com', now)
+                for i in range(start, min(start + BATCH, count))
+            ])
+
+
+def old_login(email, password):
+    from django.contrib.auth import authenticate
+    from django.contrib.auth.models import User
+
+    try:
+        username = User.objects.get(email=email).username
+    except User.DoesNotExist:
+        return None
+    return authenticate(None, username=username, password=password)
+
+
+def new_login(email, password):
+    from django.contrib.auth import authenticate
+
+    return authenticate(None, email=email, password=password)
+
+
+def time_logins(login, emails):
+    latencies, found = [], 0
+    for email in emails:
+        start = time.perf_counter()
+        found += login(email, 'password') is not None
+        latencies.append(time.perf_counter() - start)
+    return found, latencies
+
+
+def report(label, found, latencies):
+    pct = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+    print(f'{label:<28}{found:>7}/{len(latencies):<5}{pct[49] * 1000:>10.3f}{pct[94] * 1000:>10.3f}'
+          f'{max(latencies) * 1000:>10.3f}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--users', type=int, default=1_000_000, help='accounts in auth_user')
+    parser.add_argument('--logins', type=int, default=50, help='logins timed per method')
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    workdir = Path(tempfile.mkdtemp(prefix='taskflow-bench-'))
+    try:
+        (workdir / 'bench_settings.py').write_text(SETTINGS_TEMPLATE.format(db_path=str(workdir / 'bench.sqlite3')))
+        sys.path[:0] = [str(workdir), str(ROOT)]
+        os.environ['DJANGO_SETTINGS_MODULE'] = 'bench_settings'
+
+        import django
+        from django.contrib.auth.hashers import make_password
+        from django.core.management import call_command
+
+        django.setup()
+        call_command('migrate', verbosity=0)
+        start = time.perf_counter()
+        seed(args.users, make_password('password'))
+        print(f'{args.users} users seeded in {time.perf_counter() - start:.1f}s\n')
+
+        rng = random.Random(args.seed)
+        exact = [f'user{rng.randrange(args.users)}@example.com' for _ in range(args.logins)]
+        mixed = [email.capitalize() if i % 2 else email.upper() for i, email in enumerate(exact)]
+        missing = [f'nobody{i}@example.com' for i in range(args.logins)]
+
+        print(f'{"method":<28}{"logged in":>13}{"p50 ms":>10}{"p95 ms":>10}{"max ms":>10}')
+        report('old, exact case', *time_logins(old_login, exact))
+        report('old, mixed case', *time_logins(old_login, mixed))
+        report('EmailBackend, exact case', *time_logins(new_login, exact))
+        report('EmailBackend, mixed case', *time_logins(new_login, mixed))
+        report('EmailBackend, unknown', *time_logins(new_login, missing))
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
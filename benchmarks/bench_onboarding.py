@@ -0,0 +1,65 @@
+"""
+Count the queries spent on signup and login.
+
+    python benchmarks/bench_onboarding.py [--rounds N]
+
+Signup goes through the /signup/ view (user, profile and default quick
+actions), login through /login/. The script prints the queries per request
+and the average wall-clock time of each.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import django_test_database
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rounds', type=int, default=50, help='signups and logins to time')
+    parser.add_argument('-v', '--verbose', action='store_true', help='print the queries of the last request')
+    args = parser.parse_args()
+
+    with django_test_database():
+        from django.db import connection
+        from django.test import Client
+        from django.test.utils import CaptureQueriesContext
+
+        def measure(label, make_request):
+            queries, elapsed = [], 0.0
+            for i in range(args.rounds):
+                client = Client()
+                with CaptureQueriesContext(connection) as ctx:
+                    start = time.perf_counter()
+                    response = make_request(client, i)
+                    elapsed += time.perf_counter() - start
+                assert response.status_code == 302, response.status_code
+                queries.append(len(ctx.captured_queries))
+            print(f'{label:<8} queries/request: {max(queries):>3}   avg: {elapsed / args.rounds * 1000:7.2f} ms')
+            return ctx.captured_queries
+
+        def signup(client, i):
+            return client.post('/signup/', {
+                'username': f'bench{i}', 'email': f'bench{i}@example.com',
+                'password': 'a-long-password', 'password2': 'a-long-password',
+            })
+
+        def login(client, i):
+            return client.post('/login/', {'email': f'bench{i}@example.com', 'password': 'a-long-password'})
+
+        signup_queries = measure('signup', signup)
+        login_queries = measure('login', login)
+
+        if args.verbose:
+            for label, captured in (('signup', signup_queries), ('login', login_queries)):
+                print(f'\n{label}:')
+                for query in captured:
+                    print('  ', query['sql'][:120])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+"""
+Compare the rows per second of the task list's serialization paths.
+
+    python benchmarks/bench_task_serialization.py [--tasks N] [--page-size N] [--rounds N]
+
+Each round reads one page of tasks and renders it to JSON, as GET
+/api/tasks/ does: through TaskSerializer and DRF's json renderer (the old
+path), through values() rows and the json renderer, and through values()
+rows and orjson (the current path, when orjson is installed). A second
+table leaves the query out: the rows are read once and only converted and
+rendered. The script checks that every path writes the same bytes before
+timing them.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import django_test_database
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--tasks', type=int, default=5000, help='tasks to create')
+    parser.add_argument('--page-size', type=int, default=50, help='tasks rendered per round')
+    parser.add_argument('--rounds', type=int, default=200, help='pages to render per path')
+    args = parser.parse_args()
+
+    with django_test_database():
+        from django.contrib.auth.models import User
+        from django.utils import timezone
+        from rest_framework.renderers import JSONRenderer
+
+        from tasks.models import Task
+        from tasks.renderers import FastJSONRenderer, orjson
+        from tasks.representation import task_representations, task_values
+        from tasks.serializers import TaskSerializer
+
+        user = User.objects.create_user('bench', 'bench@example.com', 'password')
+        today = timezone.localdate()
+        Task.objects.bulk_create(
+            [Task(user=user, title=f'Task {i}', description='Something to do ' * 4, priority='high',
+                  due_date=today if i % 3 else None) for i in range(args.tasks)],
+            batch_size=1000,
+        )
+        tasks = Task.objects.filter(user=user).order_by('-created_at', '-id')
+
+        offsets = [(i * args.page_size) % max(args.tasks - args.page_size, 1) for i in range(args.rounds)]
+        instances = {offset: list(tasks[offset:offset + args.page_size]) for offset in set(offsets)}
+        rows = {offset: list(task_values(tasks)[offset:offset + args.page_size]) for offset in set(offsets)}
+
+        def serializer_page(offset):
+            return TaskSerializer(tasks[offset:offset + args.page_size], many=True).data
+
+        def values_page(offset):
+            return task_representations(task_values(tasks)[offset:offset + args.page_size])
+
+        def fetched_serializer_page(offset):
+            return TaskSerializer(instances[offset], many=True).data
+
+        def fetched_values_page(offset):
+            return task_representations(rows[offset])
+
+        renderers = [('json', JSONRenderer())]
+        if orjson is not None:
+            renderers.append(('orjson', FastJSONRenderer()))
+        else:
+            print('orjson is not installed, skipping the orjson path')
+
+        expected = JSONRenderer().render(serializer_page(0))
+        for title, serializer, values in (
+            ('query + serialize + render', serializer_page, values_page),
+            ('serialize + render', fetched_serializer_page, fetched_values_page),
+        ):
+            paths = [('TaskSerializer + json', serializer, JSONRenderer())]
+            paths += [(f'values() + {name}', values, renderer) for name, renderer in renderers]
+            print(f'\n{title}, {args.page_size} rows per page:')
+            baseline = None
+            for label, page, renderer in paths:
+                assert renderer.render(page(0)) == expected, f'{label} renders different bytes'
+                start = time.perf_counter()
+                for offset in offsets:
+                    renderer.render(page(offset))
+                elapsed = time.perf_counter() - start
+                rows_per_second = args.rounds * args.page_size / elapsed
+                baseline = baseline or rows_per_second
+                print(f'  {label:<22} {rows_per_second:>10,.0f} rows/s   '
+                      f'{elapsed / args.rounds * 1000:6.2f} ms/page   x{rows_per_second / baseline:.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,35 @@
+"""
+Shared setup for the benchmark scripts in this directory.
+
+Each script boots Django against the SQLite test settings and runs inside a
+throwaway test database, so benchmarks never touch a real database.
+"""
+
+import os
+import sys
+from contextlib import contextmanager
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+@contextmanager
+def django_test_database(settings_module='taskmanager.settings_test'):
+    """Configure Django and yield inside a freshly created test database"""
+    sys.path.insert(0, str(ROOT))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', settings_module)
+
+    import django
+    django.setup()
+
+    from django.test.utils import setup_test_environment, teardown_test_environment
+    from django.db import connection
+
+    setup_test_environment()
+    old_name = connection.settings_dict['NAME']
+    connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
@@ -0,0 +1,38 @@
+"""Gunicorn settings for production (see start.sh).
+
+Request metrics are written by each worker to PROMETHEUS_MULTIPROC_DIR; the
+hooks below add worker lifecycle metrics from the master and clean up the
+files of workers that exit.
+"""
+import os
+
+from prometheus_client import Counter, Gauge, multiprocess
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+
+WORKERS = Gauge(
+    'taskflow_gunicorn_workers', 'Gunicorn worker processes the master is maintaining',
+    multiprocess_mode='mostrecent',
+)
+WORKER_STARTS = Counter('taskflow_gunicorn_worker_starts_total', 'Gunicorn worker processes forked')
+WORKER_EXITS = Counter('taskflow_gunicorn_worker_exits_total', 'Gunicorn worker processes that exited')
+WORKER_TIMEOUTS = Counter('taskflow_gunicorn_worker_timeouts_total', 'Gunicorn workers aborted for timing out')
+
+
+def nworkers_changed(server, new_value, old_value):
+    WORKERS.set(new_value)
+
+
+def post_fork(server, worker):
+    WORKER_STARTS.inc()
+
+
+def worker_abort(worker):
+    WORKER_TIMEOUTS.inc()
+
+
+def child_exit(server, worker):
+    WORKER_EXITS.inc()
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        # Drop the exited worker's live gauges (requests in progress) from the totals
+        multiprocess.mark_process_dead(worker.pid)
@@ -2,4 +2,16 @@
 set -o errexit
 
 export DJANGO_SETTINGS_MODULE=taskmanager.settings_production
-exec gunicorn taskmanager.wsgi:application --bind 0.0.0.0:$PORT
+
+# Per-process metric files shared by the gunicorn workers; stale ones from a
+# previous run would be summed into the new totals
+export PROMETHEUS_MULTIPROC_DIR=${PROMETHEUS_MULTIPROC_DIR:-/tmp/taskflow-metrics}
+rm -rf "$PROMETHEUS_MULTIPROC_DIR"
+mkdir -p "$PROMETHEUS_MULTIPROC_DIR"
+
+# SERVER_MODE=asgi runs uvicorn workers on the ASGI app, which serves the
+# async read views (/api/async/...) without tying up a worker per request
+if [ "$SERVER_MODE" = "asgi" ]; then
+    exec gunicorn taskmanager.asgi:application --config gunicorn.conf.py --worker-class uvicorn.workers.UvicornWorker
+fi
+exec gunicorn taskmanager.wsgi:application --config gunicorn.conf.py
@@ -0,0 +1,97 @@
+// Profile dropdown functionality
+function toggleProfileDropdown() {
+    const dropdown = document.getElementById('profileDropdownMenu');
+    const trigger = document.querySelector('.profile-btn-nav');
+    const profileDropdown = document.querySelector('.profile-dropdown');
+
+    if (dropdown.classList.contains('show')) {
+        dropdown.classList.remove('show');
+        profileDropdown.classList.remove('active');
+    } else {
+        dropdown.classList.add('show');
+        profileDropdown.classList.add('active');
+    }
+}
+
+// Close dropdown when clicking outside
+document.addEventListener('click', function(event) {
+    const dropdown = document.getElementById('profileDropdownMenu');
+    const trigger = document.querySelector('.profile-btn-nav');
+    const profileDropdown = document.querySelector('.profile-dropdown');
+
+    if (dropdown && trigger && !trigger.contains(event.target) && !dropdown.contains(event.target)) {
+        dropdown.classList.remove('show');
+        profileDropdown.classList.remove('active');
+    }
+});
+
+// Profile hover card functionality
+document.addEventListener('DOMContentLoaded', function() {
+    const profileName = document.querySelector('.profile-name-hover');
+    const profileCard = document.getElementById('profileInfoCard');
+    let hoverTimeout;
+
+    if (profileName && profileCard) {
+        profileName.addEventListener('mouseenter', function() {
+            clearTimeout(hoverTimeout);
+            profileCard.style.opacity = '1';
+            profileCard.style.visibility = 'visible';
+            profileCard.style.transform = 'translateY(0)';
+        });
+
+        profileName.addEventListener('mouseleave', function() {
+            hoverTimeout = setTimeout(() => {
+                if (!profileCard.matches(':hover')) {
+                    profileCard.style.opacity = '0';
+                    profileCard.style.visibility = 'hidden';
+                    profileCard.style.transform = 'translateY(-10px)';
+                }
+            }, 300);
+        });
+
+        profileCard.addEventListener('mouseenter', function() {
+            clearTimeout(hoverTimeout);
+        });
+
+        profileCard.addEventListener('mouseleave', function() {
+            profileCard.style.opacity = '0';
+            profileCard.style.visibility = 'hidden';
+            profileCard.style.transform = 'translateY(-10px)';
+        });
+    }
+});
+
+// Modal functionality
+function openModal(modalId) {
+    const modal = document.getElementById(modalId);
+    if (modal) {
+        modal.style.display = 'block';
+        document.body.style.overflow = 'hidden';
+
+        // Close dropdown when opening modal
+        const dropdown = document.getElementById('profileDropdownMenu');
+        const trigger = document.querySelector('.profile-trigger');
+        if (dropdown && trigger) {
+            dropdown.classList.remove('show');
+            trigger.classList.remove('active');
+        }
+    }
+}
+
+function closeModal(modalId) {
+    const modal = document.getElementById(modalId);
+    if (modal) {
+        modal.style.display = 'none';
+        document.body.style.overflow = 'auto';
+    }
+}
+
+// Close modal when clicking outside
+window.onclick = function(event) {
+    const modals = document.querySelectorAll('.modal');
+    modals.forEach(modal => {
+        if (event.target === modal) {
+            closeModal(modal.id);
+        }
+    });
+};
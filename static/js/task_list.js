@@ -0,0 +1,2343 @@
+function formatDate(dateString) {
+    const options = { 
+        year: 'numeric', 
+        month: 'short', 
+        day: 'numeric',
+        hour: '2-digit',
+        minute: '2-digit'
+    };
+    return new Date(dateString).toLocaleDateString('en-US', options);
+}
+
+function isOverdue(dueDateString) {
+    if (!dueDateString) return false;
+    const dueDate = new Date(dueDateString);
+    const today = new Date();
+    today.setHours(0, 0, 0, 0);
+    return dueDate < today;
+}
+
+function getDaysUntilDue(dueDateString) {
+    if (!dueDateString) return null;
+    const dueDate = new Date(dueDateString);
+    const today = new Date();
+    const diffTime = dueDate - today;
+    const diffDays = Math.ceil(diffTime / (1000 * 60 * 60 * 24));
+    return diffDays;
+}
+
+function getPriorityEmoji(priority) {
+    const emojis = {
+        'high': '🔴',
+        'medium': '🟡',
+        'low': '🟢'
+    };
+    return emojis[priority] || '⚪';
+}
+
+function getCategoryEmoji(category) {
+    const emojis = {
+        'work': '💼',
+        'personal': '👤',
+        'health': '🏥',
+        'education': '📚',
+        'shopping': '🛒',
+        'other': '📋'
+    };
+    return emojis[category] || '📋';
+}
+
+let allTasks = [];
+let currentFilter = 'all';
+let currentView = 'card';
+let quickActions = [];
+let quickActionInProgress = {}; // Track which quick actions are being processed
+let quickActionCooldowns = {}; // Track cooldowns for quick actions
+// Values from the page, set on this script's tag by the template
+const taskListScript = document.currentScript;
+const currentUserId = Number(taskListScript.dataset.userId) || null;
+const currentUserEmail = taskListScript.dataset.userEmail;
+// First page of tasks, stats, profile and quick actions, embedded by the server
+// (tasks/bootstrap.py) so the page can render without waiting on the API
+const pageDataElement = document.getElementById('task-page-data');
+const pageData = pageDataElement ? JSON.parse(pageDataElement.textContent) : null;
+
+function updateDashboardStats(stats) {
+    // Update stat cards with real data from backend
+    const pendingCountEl = document.getElementById('pendingCount');
+    const inProgressCountEl = document.getElementById('inProgressCount');
+    const completedCountEl = document.getElementById('completedCount');
+    const productivityScoreEl = document.getElementById('productivityScore');
+    
+    if (pendingCountEl) pendingCountEl.textContent = stats.total_tasks - stats.completed_tasks - stats.in_progress_tasks;
+    if (inProgressCountEl) inProgressCountEl.textContent = stats.in_progress_tasks;
+    if (completedCountEl) completedCountEl.textContent = stats.completed_tasks;
+    if (productivityScoreEl) productivityScoreEl.textContent = stats.productivity + '%';
+    
+    // Update profile card total tasks count
+    const totalTasksCount = document.getElementById('totalTasksCount');
+    if (totalTasksCount) {
+        totalTasksCount.textContent = stats.total_tasks || 0;
+    }
+    
+    // Update progress bars
+    const total = stats.total_tasks || 1; // Avoid division by zero
+    updateProgressBar('pendingProgress', (stats.total_tasks - stats.completed_tasks - stats.in_progress_tasks) / total * 100);
+    updateProgressBar('progressProgress', stats.in_progress_tasks / total * 100);
+    updateProgressBar('completedProgress', stats.completed_tasks / total * 100);
+    updateProgressBar('productivityProgress', stats.productivity);
+}
+
+function updateProgressBar(id, percentage) {
+    const progressBar = document.getElementById(id);
+    if (progressBar) {
+        progressBar.style.width = percentage + '%';
+    }
+}
+
+function showToast(message, type = 'info') {
+    const toast = document.createElement('div');
+    toast.className = `toast toast-${type}`;
+    toast.innerHTML = `
+        <i class="fas fa-${type === 'success' ? 'check' : type === 'error' ? 'exclamation-triangle' : 'info'}"></i>
+        <span>${message}</span>
+    `;
+    
+    document.body.appendChild(toast);
+    
+    setTimeout(() => {
+        toast.classList.add('show');
+    }, 100);
+    
+    setTimeout(() => {
+        toast.classList.remove('show');
+        setTimeout(() => {
+            if (document.body.contains(toast)) {
+                document.body.removeChild(toast);
+            }
+        }, 300);
+    }, 3000);
+}
+
+function getCookie(name) {
+    let cookieValue = null;
+    if (document.cookie && document.cookie !== '') {
+        const cookies = document.cookie.split(';');
+        for (let i = 0; i < cookies.length; i++) {
+            const cookie = cookies[i].trim();
+            if (cookie.substring(0, name.length + 1) === (name + '=')) {
+                cookieValue = decodeURIComponent(cookie.substring(name.length + 1));
+                break;
+            }
+        }
+    }
+    return cookieValue;
+}
+
+// The task API is cursor-paginated; later pages are loaded on scroll
+let nextTasksUrl = null;
+let loadingMoreTasks = false;
+
+function toRelativeUrl(url) {
+    // Pagination links are absolute; keep requests on the page's own origin/scheme
+    const parsed = new URL(url, window.location.href);
+    return parsed.pathname + parsed.search;
+}
+
+function hydrateTasks(data) {
+    syncToken = data.sync_token;
+    allTasks = data.tasks.results;
+    nextTasksUrl = data.tasks.next ? toRelativeUrl(data.tasks.next) : null;
+    renderTasks();
+    updateDashboardStats(data.stats);
+}
+
+function fetchTasks() {
+    requestSyncToken();
+    fetch('/api/tasks/')
+        .then(response => response.json())
+        .then(page => {
+            allTasks = page.results;
+            nextTasksUrl = page.next ? toRelativeUrl(page.next) : null;
+            renderTasks();
+            
+            // Fetch dashboard stats
+            return fetch('/api/tasks/dashboard_stats/');
+        })
+        .then(response => response.json())
+        .then(stats => {
+            updateDashboardStats(stats);
+        })
+        .catch(error => {
+            console.error('Error fetching tasks:', error);
+            showToast('Error loading tasks', 'error');
+        });
+}
+
+// Incremental sync: after the initial load only changed and deleted tasks are fetched
+let syncToken = null;
+
+function requestSyncToken() {
+    return fetch('/api/tasks/changes/')
+        .then(response => response.json())
+        .then(data => {
+            syncToken = data.token;
+        })
+        .catch(error => console.error('Error starting task sync:', error));
+}
+
+function applyTaskChanges(changed, deleted) {
+    const tasksById = new Map(allTasks.map(task => [task.id, task]));
+    changed.forEach(task => {
+        if (tasksById.has(task.id)) {
+            Object.assign(tasksById.get(task.id), task);
+        } else {
+            allTasks.unshift(task);
+        }
+    });
+    const deletedIds = new Set(deleted);
+    allTasks = allTasks.filter(task => !deletedIds.has(task.id));
+}
+
+function syncTasks() {
+    if (!syncToken) {
+        fetchTasks();
+        return;
+    }
+    fetch(`/api/tasks/changes/?since=${encodeURIComponent(syncToken)}`)
+        .then(response => response.json())
+        .then(data => {
+            if (data.reset) {
+                fetchTasks();
+                return;
+            }
+            syncToken = data.token;
+            if (data.changed.length === 0 && data.deleted.length === 0) return;
+            applyTaskChanges(data.changed, data.deleted);
+            renderTasks();
+            return fetch('/api/tasks/dashboard_stats/')
+                .then(response => response.json())
+                .then(stats => updateDashboardStats(stats));
+        })
+        .catch(error => {
+            console.error('Error syncing tasks:', error);
+        });
+}
+
+// Live updates: task changes are pushed over Server-Sent Events, so polling
+// is only needed while the stream is down (or the server answers 204 under WSGI)
+let taskEvents = null;
+let taskEventsOpened = false;
+let statsRefreshTimer = null;
+
+// Sync interval while no stream is available at all (WSGI answers 204), and
+// while a stream that was open is reconnecting
+const TASK_POLL_MS = 300000;
+const TASK_STREAM_RETRY_POLL_MS = 60000;
+
+function refreshDashboardStats() {
+    // A burst of changes costs a single stats request
+    clearTimeout(statsRefreshTimer);
+    statsRefreshTimer = setTimeout(() => {
+        fetch('/api/tasks/dashboard_stats/')
+            .then(response => response.json())
+            .then(stats => updateDashboardStats(stats))
+            .catch(error => console.error('Error refreshing stats:', error));
+    }, 300);
+}
+
+function connectTaskEvents() {
+    if (!('EventSource' in window)) return;
+    taskEvents = new EventSource('/api/events/');
+    taskEvents.addEventListener('open', () => {
+        taskEventsOpened = true;
+        // Catch up on anything that changed while reconnecting
+        if (syncToken) syncTasks();
+    });
+    taskEvents.addEventListener('task.saved', event => {
+        applyTaskChanges([JSON.parse(event.data).task], []);
+        renderTasks();
+    });
+    taskEvents.addEventListener('task.deleted', event => {
+        applyTaskChanges([], [JSON.parse(event.data).id]);
+        renderTasks();
+    });
+    taskEvents.addEventListener('tasks.sync', () => syncTasks());
+    taskEvents.addEventListener('stats.changed', () => refreshDashboardStats());
+}
+
+function taskEventsConnected() {
+    return taskEvents !== null && taskEvents.readyState === EventSource.OPEN;
+}
+
+function scheduleTaskPolling() {
+    // Poll faster only after a real stream dropped; without one, keep the
+    // background request rate of the plain polling page
+    const delay = taskEventsOpened ? TASK_STREAM_RETRY_POLL_MS : TASK_POLL_MS;
+    setTimeout(() => {
+        if (!taskEventsConnected()) syncTasks();
+        scheduleTaskPolling();
+    }, delay);
+}
+
+function loadMoreTasks() {
+    if (!nextTasksUrl || loadingMoreTasks) return;
+    loadingMoreTasks = true;
+    fetch(nextTasksUrl)
+        .then(response => response.json())
+        .then(page => {
+            const knownIds = new Set(allTasks.map(task => task.id));
+            allTasks = allTasks.concat(page.results.filter(task => !knownIds.has(task.id)));
+            nextTasksUrl = page.next ? toRelativeUrl(page.next) : null;
+            renderTasks();
+        })
+        .catch(error => {
+            console.error('Error loading more tasks:', error);
+            showToast('Error loading tasks', 'error');
+        })
+        .finally(() => {
+            loadingMoreTasks = false;
+        });
+}
+
+    function previewProfilePhoto(event) {
+        const file = event.target.files[0];
+        if (file) {
+            const reader = new FileReader();
+            reader.onload = function(e) {
+                const profileAvatar = document.getElementById('profileAvatar');
+                const defaultAvatar = document.getElementById('defaultAvatar');
+                
+                if (profileAvatar && defaultAvatar) {
+                    // Hide the default icon
+                    defaultAvatar.style.display = 'none';
+                    
+                    // Set background image
+                    profileAvatar.style.backgroundImage = `url(${e.target.result})`;
+                    profileAvatar.style.backgroundSize = 'cover';
+                    profileAvatar.style.backgroundPosition = 'center';
+                }
+            };
+            reader.readAsDataURL(file);
+        }
+    }
+
+    // Enhanced profile functionality with real API integration
+async function loadUserProfile() {
+        try {
+            const response = await fetch('/api/profile/me/');
+            if (response.ok) {
+                const profile = await response.json();
+                updateProfileDisplay(profile);
+            }
+        } catch (error) {
+            console.error('Error loading profile:', error);
+        }
+    }
+
+    function profilePhotoUrl(profile, size) {
+        // Thumbnails exist once the upload has been processed; until then show the upload itself
+        const variant = (profile.profile_photo_variants || {})[size];
+        return variant ? variant.webp : profile.profile_photo_url;
+    }
+
+    function updateProfileDisplay(profile) {
+        // Update profile name in the profile card
+        const profileInfo = document.querySelector('.profile-info h2');
+        if (profileInfo && profile.name) {
+            profileInfo.textContent = profile.name;
+        }
+        
+        // Update profile photo
+        const profileImage = document.getElementById('profileImage');
+        const defaultAvatar = document.getElementById('defaultAvatar');
+        if (profile.profile_photo_url) {
+            if (profileImage) {
+                profileImage.src = profilePhotoUrl(profile, '256');
+                profileImage.style.display = 'block';
+            }
+            if (defaultAvatar) {
+                defaultAvatar.style.display = 'none';
+            }
+        }
+        
+        // Update navbar profile avatar
+        const profileImageNav = document.getElementById('profileImageNav');
+        const defaultAvatarNav = document.getElementById('defaultAvatarNav');
+        const profileImageCardNav = document.getElementById('profileImageCardNav');
+        const navbarDefaultAvatar = document.getElementById('navbarDefaultAvatar');
+        
+        if (profile.profile_photo_url) {
+            if (profileImageNav) {
+                profileImageNav.src = profilePhotoUrl(profile, '64');
+                profileImageNav.style.display = 'block';
+                defaultAvatarNav.style.display = 'none';
+            }
+            if (profileImageCardNav) {
+                profileImageCardNav.src = profilePhotoUrl(profile, '64');
+                profileImageCardNav.style.display = 'block';
+                navbarDefaultAvatar.style.display = 'none';
+            }
+        }
+        
+        // Update bio if we add a bio display element later
+        const bioElement = document.querySelector('.profile-bio');
+        if (bioElement && profile.bio) {
+            bioElement.textContent = profile.bio;
+        }
+        
+        // Update navbar profile card bio
+        const profileCardBio = document.getElementById('profileCardBio');
+        if (profileCardBio) {
+            profileCardBio.textContent = profile.bio || 'Click Edit Profile to add a bio';
+            profileCardBio.style.fontStyle = profile.bio ? 'normal' : 'italic';
+        }
+        
+        // Populate edit profile form with current data
+        const editFullName = document.getElementById('editFullName');
+        const editEmail = document.getElementById('editEmail');
+        const editBio = document.getElementById('editBio');
+        
+        if (editFullName) {
+            editFullName.value = profile.display_name || profile.name || '';
+        }
+        if (editEmail && profile.user) {
+            editEmail.value = profile.user.email || '';
+        }
+        if (editBio) {
+            editBio.value = profile.bio || '';
+        }
+        
+        // Update navbar profile info
+        const navbarUsername = document.querySelector('.profile-dropdown .username');
+        const navbarEmail = document.querySelector('.profile-dropdown .email');
+        const profileCardName = document.getElementById('profileCardName');
+        const profileCardEmail = document.getElementById('profileCardEmail');
+        
+        if (navbarUsername) {
+            navbarUsername.textContent = profile.display_name || profile.name || profile.user?.username || '';
+        }
+        if (navbarEmail && profile.user) {
+            navbarEmail.textContent = profile.user.email || '';
+        }
+        if (profileCardName) {
+            profileCardName.textContent = profile.display_name || profile.name || profile.user?.username || '';
+        }
+        if (profileCardEmail && profile.user) {
+            profileCardEmail.textContent = profile.user.email || '';
+        }
+    }
+
+    async function saveProfile() {
+        const formData = new FormData();
+        const photoInput = document.getElementById('profile-photo');
+        const displayName = document.getElementById('display-name').value;
+        const bio = document.getElementById('bio').value;
+        
+        if (photoInput.files[0]) {
+            formData.append('profile_photo', photoInput.files[0]);
+        }
+        if (displayName) {
+            formData.append('display_name', displayName);
+        }
+        if (bio) {
+            formData.append('bio', bio);
+        }
+        
+        try {
+            const response = await fetch('/api/profile/update_profile/', {
+                method: 'PATCH',
+                body: formData,
+                headers: {
+                    'X-CSRFToken': getCookie('csrftoken')
+                }
+            });
+            
+            if (response.ok) {
+                const updatedProfile = await response.json();
+                updateProfileDisplay(updatedProfile);
+                closeModal('edit-profile-modal');
+                showToast('Profile updated successfully!', 'success');
+                
+                // Clear form
+                document.getElementById('profile-form').reset();
+            } else {
+                showToast('Error updating profile', 'error');
+            }
+        } catch (error) {
+            console.error('Error saving profile:', error);
+            showToast('Error updating profile', 'error');
+        }
+    }
+
+    // Enhanced Quick Actions with API integration
+    async function loadQuickActions() {
+        try {
+            const response = await fetch('/api/quick-actions/');
+            if (response.ok) {
+                const actions = await response.json();
+                currentQuickActions = actions;
+                renderQuickActions();
+                renderQuickActionsList();
+            }
+        } catch (error) {
+            console.error('Error loading quick actions:', error);
+            // Fallback to default actions
+            renderQuickActions();
+            renderQuickActionsList();
+        }
+    }
+
+    async function addQuickAction() {
+        const icon = document.getElementById('action-icon').value;
+        const label = document.getElementById('action-label').value;
+        
+        if (!icon || !label) {
+            showToast('Please fill in all fields', 'error');
+            return;
+        }
+        
+        try {
+            const response = await fetch('/api/quick-actions/', {
+                method: 'POST',
+                headers: {
+                    'Content-Type': 'application/json',
+                    'X-CSRFToken': getCookie('csrftoken')
+                },
+                body: JSON.stringify({
+                    icon: icon,
+                    label: label,
+                    action_type: 'custom',
+                    is_active: true
+                })
+            });
+            
+            if (response.ok) {
+                const newAction = await response.json();
+                await loadQuickActions(); // Reload actions
+                
+                // Clear form
+                document.getElementById('action-icon').value = '';
+                document.getElementById('action-label').value = '';
+                
+                showToast('Quick action added successfully!', 'success');
+            } else {
+                showToast('Error adding quick action', 'error');
+            }
+        } catch (error) {
+            console.error('Error adding quick action:', error);
+            showToast('Error adding quick action', 'error');
+        }
+    }
+
+    async function removeQuickAction(actionId) {
+        try {
+            const response = await fetch(`/api/quick-actions/${actionId}/`, {
+                method: 'DELETE',
+                headers: {
+                    'X-CSRFToken': getCookie('csrftoken')
+                }
+            });
+            
+            if (response.ok) {
+                await loadQuickActions(); // Reload actions
+                showToast('Quick action removed', 'success');
+            } else {
+                showToast('Error removing quick action', 'error');
+            }
+        } catch (error) {
+            console.error('Error removing quick action:', error);
+            showToast('Error removing quick action', 'error');
+        }
+    }
+
+    function renderQuickActions() {
+        const container = document.getElementById('quickButtonsContainer');
+        if (!container) {
+            console.warn('Quick actions container not found');
+            return;
+        }
+        
+        const actions = currentQuickActions.length > 0 ? currentQuickActions : getDefaultQuickActions();
+        
+        container.innerHTML = actions.map(action => `
+            <button class="quick-btn" onclick="handleQuickAction('${action.label}', '${action.action_type}')">
+                <i class="${action.icon}"></i>
+                <span>${action.label}</span>
+            </button>
+        `).join('');
+    }
+
+    function renderQuickActionsList() {
+        const container = document.querySelector('.quick-actions-list');
+        if (!container) {
+            console.warn('Quick actions list container not found');
+            return;
+        }
+        
+        const actions = currentQuickActions.length > 0 ? currentQuickActions : getDefaultQuickActions();
+        
+        container.innerHTML = actions.map(action => `
+            <div class="quick-action-item">
+                <div class="action-info">
+                    <i class="${action.icon}"></i>
+                    <span>${action.label}</span>
+                </div>
+                <button class="remove-action-btn" onclick="removeQuickAction(${action.id})">
+                    <i class="fas fa-times"></i>
+                </button>
+            </div>
+        `).join('');
+    }
+
+    function getDefaultQuickActions() {
+        return [
+            { id: 'default-1', icon: 'fas fa-plus', label: 'Add Task', action_type: 'modal' },
+            { id: 'default-2', icon: 'fas fa-clock', label: 'Due Today', action_type: 'filter' },
+            { id: 'default-3', icon: 'fas fa-star', label: 'High Priority', action_type: 'filter' },
+            { id: 'default-4', icon: 'fas fa-chart-bar', label: 'Report', action_type: 'modal' }
+        ];
+    }
+
+    async function handleQuickAction(actionLabel, actionType) {
+        switch(actionType) {
+            case 'modal':
+                if (actionLabel === 'Add Task') {
+                    toggleModal();
+                } else if (actionLabel === 'Report') {
+                    await generateReport();
+                }
+                break;
+            case 'filter':
+                await applyQuickFilter(actionLabel);
+                break;
+            default:
+                showToast(`${actionLabel} action triggered`, 'info');
+        }
+    }
+
+    async function applyQuickFilter(filterType) {
+        try {
+            let filterParams = '';
+            
+            switch(filterType) {
+                case 'Due Today':
+                    filterParams = '?filter_type=due_date&filter_value=today';
+                    break;
+                case 'High Priority':
+                    filterParams = '?filter_type=priority&filter_value=high';
+                    break;
+                case 'Overdue':
+                    filterParams = '?filter_type=due_date&filter_value=overdue';
+                    break;
+                default:
+                    return;
+            }
+            
+            const response = await fetch(`/api/tasks/filter_tasks/${filterParams}`);
+            if (response.ok) {
+                const page = await response.json();
+                allTasks = page.results;
+                nextTasksUrl = page.next ? toRelativeUrl(page.next) : null;
+                renderTasks();
+                showToast(`Showing ${filterType.toLowerCase()} tasks`, 'info');
+            }
+        } catch (error) {
+            console.error('Error filtering tasks:', error);
+            showToast('Error filtering tasks', 'error');
+        }
+    }
+
+    async function generateReport() {
+        try {
+            const response = await fetch('/api/tasks/dashboard_stats/');
+            if (response.ok) {
+                const stats = await response.json();
+                
+                const reportHtml = `
+                    <div class="report-content">
+                        <h3><i class="fas fa-chart-line"></i> Productivity Report</h3>
+                        <div class="report-stats">
+                            <div class="report-item">
+                                <span class="report-label">Total Tasks:</span>
+                                <span class="report-value">${stats.total_tasks}</span>
+                            </div>
+                            <div class="report-item">
+                                <span class="report-label">Completed:</span>
+                                <span class="report-value">${stats.completed_tasks}</span>
+                            </div>
+                            <div class="report-item">
+                                <span class="report-label">Productivity:</span>
+                                <span class="report-value">${stats.productivity}%</span>
+                            </div>
+                            <div class="report-item">
+                                <span class="report-label">Recent Completed:</span>
+                                <span class="report-value">${stats.recent_completed}</span>
+                            </div>
+                        </div>
+                    </div>
+                `;
+                
+                // Create temporary modal for report
+                showReportModal(reportHtml);
+            }
+        } catch (error) {
+            console.error('Error generating report:', error);
+            showToast('Error generating report', 'error');
+        }
+    }
+
+    function showReportModal(content) {
+        const modal = document.createElement('div');
+        modal.className = 'modal';
+        modal.innerHTML = `
+            <div class="modal-content">
+                <div class="modal-header">
+                    <h2><i class="fas fa-chart-bar"></i> Productivity Report</h2>
+                    <button class="close-btn" onclick="this.closest('.modal').remove()">&times;</button>
+                </div>
+                ${content}
+                <div class="modal-actions">
+                    <button class="btn-secondary" onclick="this.closest('.modal').remove()">
+                        <i class="fas fa-times"></i> Close
+                    </button>
+                </div>
+            </div>
+        `;
+        
+        document.body.appendChild(modal);
+        modal.style.display = 'block';
+    }
+
+    // CSRF Token helper
+    function getCookie(name) {
+        let cookieValue = null;
+        if (document.cookie && document.cookie !== '') {
+            const cookies = document.cookie.split(';');
+            for (let i = 0; i < cookies.length; i++) {
+                const cookie = cookies[i].trim();
+                if (cookie.substring(0, name.length + 1) === (name + '=')) {
+                    cookieValue = decodeURIComponent(cookie.substring(name.length + 1));
+                    break;
+                }
+            }
+        }
+        return cookieValue;
+    }
+
+    // Enhanced task creation with real API
+    async function createTask() {
+        const title = document.getElementById('taskTitle').value;
+        const description = document.getElementById('taskDescription').value;
+        const priority = document.getElementById('taskPriority').value;
+        const category = document.getElementById('taskCategory').value;
+        const dueDate = document.getElementById('taskDueDate').value;
+        
+        if (!title.trim()) {
+            showToast('Please enter a task title', 'error');
+            return;
+        }
+        
+        const taskData = {
+            title: title.trim(),
+            description: description.trim(),
+            priority: priority,
+            category: category,
+            status: 'pending'
+        };
+        
+        if (dueDate) {
+            taskData.due_date = dueDate;
+        }
+        
+        try {
+            const response = await fetch('/api/tasks/', {
+                method: 'POST',
+                headers: {
+                    'Content-Type': 'application/json',
+                    'X-CSRFToken': getCookie('csrftoken')
+                },
+                body: JSON.stringify(taskData)
+            });
+            
+            if (response.ok) {
+                const newTask = await response.json();
+                allTasks.unshift(newTask);
+                renderTasks();
+                refreshDashboardStats();
+                
+                // Clear form and close modal
+                document.getElementById('taskForm').reset();
+                toggleModal();
+                
+                showToast('Task created successfully!', 'success');
+            } else {
+                const errorData = await response.json();
+                showToast('Error creating task: ' + (errorData.detail || 'Unknown error'), 'error');
+            }
+        } catch (error) {
+            console.error('Error creating task:', error);
+            showToast('Error creating task', 'error');
+        }
+    }
+
+    // Store current quick actions
+    let currentQuickActions = [];
+
+    // CSRF Token helper
+    function getCookie(name) {
+        let cookieValue = null;
+        if (document.cookie && document.cookie !== '') {
+            const cookies = document.cookie.split(';');
+            for (let i = 0; i < cookies.length; i++) {
+                const cookie = cookies[i].trim();
+                if (cookie.substring(0, name.length + 1) === (name + '=')) {
+                    cookieValue = decodeURIComponent(cookie.substring(name.length + 1));
+                    break;
+                }
+            }
+        }
+        return cookieValue;
+    }
+
+    // Essential missing functions that were in the original code
+    function createTask() {
+        const title = document.getElementById('title').value;
+        const description = document.getElementById('description').value;
+        const priority = document.getElementById('priority').value;
+        const category = document.getElementById('category').value;
+        const dueDate = document.getElementById('due_date').value;
+        
+        if (!title.trim()) {
+            showToast('Please enter a task title', 'error');
+            return;
+        }
+        
+        const taskData = {
+            title: title.trim(),
+            description: description.trim(),
+            priority: priority,
+            category: category,
+            status: 'pending'
+        };
+        
+        if (dueDate) {
+            taskData.due_date = dueDate;
+        }
+        
+        fetch('/api/tasks/', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+                'X-CSRFToken': getCookie('csrftoken')
+            },
+            body: JSON.stringify(taskData)
+        })
+        .then(response => response.json())
+        .then(newTask => {
+            allTasks.unshift(newTask);
+            renderTasks();
+            refreshDashboardStats();
+            
+            // Clear form and close modal
+            document.getElementById('taskForm').reset();
+            
+            showToast('Task created successfully!', 'success');
+        })
+        .catch(error => {
+            console.error('Error creating task:', error);
+            showToast('Error creating task', 'error');
+        });
+    }
+
+    function openEditProfile() {
+        openModal('editProfileModal');
+    }
+
+    function addQuickTask(title, category) {
+        console.log('addQuickTask called with:', { title, category });
+        
+        // Create a unique key for this specific task
+        const taskKey = `${title}_${category}`;
+        const buttonId = `quick-btn-${title.replace(/\s+/g, '-').toLowerCase()}`;
+        const button = document.getElementById(buttonId);
+        const now = Date.now();
+        
+        // Check if this exact task is already being processed
+        if (quickActionInProgress[taskKey]) {
+            console.log('Task already in progress, ignoring duplicate click');
+            showToast('Task is already being created...', 'info');
+            return;
+        }
+        
+        // Check for cooldown (prevent same task within 3 seconds)
+        if (quickActionCooldowns[taskKey] && (now - quickActionCooldowns[taskKey]) < 3000) {
+            console.log('Task in cooldown period, ignoring rapid click');
+            showToast('Please wait before creating the same task again', 'warning');
+            return;
+        }
+        
+        // Check if a task with the same title already exists and is pending
+        const existingTask = allTasks.find(task => 
+            task.title === title && 
+            task.status === 'pending' && 
+            task.category === category
+        );
+        
+        if (existingTask) {
+            console.log('Similar task already exists:', existingTask);
+            showToast(`Task "${title}" already exists in your pending list`, 'info');
+            return;
+        }
+        
+        // Mark this task as in progress and disable button
+        quickActionInProgress[taskKey] = true;
+        
+        if (button) {
+            button.disabled = true;
+            button.style.opacity = '0.6';
+            button.innerHTML = `<i class="fas fa-spinner fa-spin"></i> Creating...`;
+        }
+        
+        const taskData = {
+            title: title,
+            description: '',
+            priority: 'medium',
+            category: category,
+            status: 'pending'
+        };
+        
+        console.log('Sending task data:', taskData);
+        
+        fetch('/api/tasks/', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+                'X-CSRFToken': getCookie('csrftoken')
+            },
+            body: JSON.stringify(taskData)
+        })
+        .then(response => {
+            console.log('Response status:', response.status);
+            return response.json();
+        })
+        .then(newTask => {
+            console.log('New task created:', newTask);
+            allTasks.unshift(newTask);
+            renderTasks();
+            refreshDashboardStats();
+            showToast(`Quick task "${title}" created!`, 'success');
+            
+            // Set cooldown for this task
+            quickActionCooldowns[taskKey] = now;
+        })
+        .catch(error => {
+            console.error('Error creating quick task:', error);
+            showToast('Error creating quick task', 'error');
+        })
+        .finally(() => {
+            // Remove from in-progress tracking and restore button
+            delete quickActionInProgress[taskKey];
+            
+            if (button) {
+                button.disabled = false;
+                button.style.opacity = '1';
+                // Find the original action to restore the button content
+                const action = quickActions.find(a => a.label === title);
+                if (action) {
+                    button.innerHTML = `<i class="${action.icon}"></i> ${action.label}`;
+                }
+            }
+        });
+    }
+
+// Essential missing functions that were in the original code
+function toggleModal() {
+    const taskForm = document.querySelector('.task-form');
+    if (taskForm) {
+        if (taskForm.style.display === 'none') {
+            taskForm.style.display = 'block';
+        } else {
+            taskForm.style.display = 'none';
+        }
+    }
+}
+
+// Continue with the rest of the functions
+
+// The task list is windowed: only the rows near the viewport are in the DOM,
+// between two spacers that stand in for the rows above and below. Cards are
+// kept per task id and rebuilt only when the task, or today's date, changes.
+const TASK_LIST_OVERSCAN_PX = 800;
+let listedTasks = [];           // every task that passes the filter, in display order
+let listedTasksDay = '';        // the day overdue badges were worked out for
+const taskCards = new Map();    // task id -> {key, element}
+let taskRowHeights = [];        // measured height of each row, by index
+let averageTaskRowHeight = 260; // used for rows that haven't been measured yet
+let taskWindowFrame = null;
+let taskListSpacers = null;
+
+const PRIORITY_ORDER = {'high': 3, 'medium': 2, 'low': 1};
+const TASK_SORT_KEYS = {
+    'created_desc': task => -Date.parse(task.created_at),
+    'created_asc': task => Date.parse(task.created_at),
+    'priority': task => -(PRIORITY_ORDER[task.priority] || 0),
+    'due_date': task => task.due_date ? Date.parse(task.due_date) : Infinity,
+};
+
+function sortTasks(tasks, sortOption) {
+    if (sortOption === 'alphabetical') {
+        return tasks.sort((a, b) => a.title.localeCompare(b.title));
+    }
+    const sortKey = TASK_SORT_KEYS[sortOption];
+    if (!sortKey) return tasks;
+    // Work out each key once rather than on every comparison
+    return tasks
+        .map((task, index) => ({task, index, key: sortKey(task)}))
+        .sort((a, b) => (a.key - b.key) || (a.index - b.index))
+        .map(entry => entry.task);
+}
+
+function renderTasks() {
+    const taskList = document.getElementById('taskList');
+    const sortOption = document.getElementById('sortTasks')?.value || 'created_desc';
+    // While searching, show the server's ranked matches instead of the loaded pages
+    const sourceTasks = searchResults || allTasks;
+    listedTasksDay = new Date().toDateString();
+    
+    let filteredTasks = sourceTasks.filter(task => {
+        // Status/priority filter
+        let matchesFilter = true;
+        if (currentFilter === 'all') matchesFilter = true;
+        else if (currentFilter === 'high') matchesFilter = (task.priority === 'high');
+        else if (currentFilter === 'overdue') matchesFilter = isOverdue(task.due_date) && task.status !== 'completed';
+        else matchesFilter = (task.status === currentFilter);
+        
+        return matchesFilter;
+    });
+    
+    // Sort tasks (search results keep their relevance order)
+    listedTasks = searchResults ? filteredTasks : sortTasks(filteredTasks, sortOption);
+    taskRowHeights = [];
+    
+    // Forget the cards of tasks that are gone
+    const sourceIds = new Set(sourceTasks.map(task => task.id));
+    taskCards.forEach((card, id) => {
+        if (!sourceIds.has(id)) taskCards.delete(id);
+    });
+    
+    if (listedTasks.length === 0) {
+        taskList.innerHTML = `
+            <div class="empty-state">
+                <i class="fas fa-clipboard-list"></i>
+                <p>No tasks found. ${sourceTasks.length === 0 && !searchResults ? 'Add your first task to get started!' : 'Try adjusting your search or filters.'}</p>
+            </div>
+        `;
+        return;
+    }
+    
+    renderTaskWindow();
+}
+
+function scheduleTaskWindow() {
+    if (taskWindowFrame === null) {
+        taskWindowFrame = requestAnimationFrame(renderTaskWindow);
+    }
+}
+
+function taskListColumns(taskList) {
+    const columns = getComputedStyle(taskList).gridTemplateColumns;
+    return columns && columns !== 'none' ? columns.split(' ').length : 1;
+}
+
+function taskRowHeight(row) {
+    return taskRowHeights[row] ?? averageTaskRowHeight;
+}
+
+function renderTaskWindow() {
+    taskWindowFrame = null;
+    const taskList = document.getElementById('taskList');
+    if (!taskList || listedTasks.length === 0) return;
+    if (!taskListSpacers) {
+        taskListSpacers = [document.createElement('div'), document.createElement('div')];
+        taskListSpacers.forEach(spacer => spacer.className = 'task-list-spacer');
+    }
+    const [topSpacer, bottomSpacer] = taskListSpacers;
+    
+    const columns = taskListColumns(taskList);
+    const gap = parseFloat(getComputedStyle(taskList).rowGap) || 0;
+    const rowCount = Math.ceil(listedTasks.length / columns);
+    const listTop = taskList.getBoundingClientRect().top + window.scrollY;
+    const windowTop = window.scrollY - listTop - TASK_LIST_OVERSCAN_PX;
+    const windowBottom = window.scrollY + window.innerHeight - listTop + TASK_LIST_OVERSCAN_PX;
+    
+    // Rows above the window, the rows in it, and the rows below it
+    let startRow = 0;
+    let offset = 0;
+    while (startRow < rowCount - 1 && offset + taskRowHeight(startRow) + gap <= windowTop) {
+        offset += taskRowHeight(startRow) + gap;
+        startRow++;
+    }
+    const topHeight = offset;
+    let endRow = startRow;
+    while (endRow < rowCount && (endRow === startRow || offset < windowBottom)) {
+        offset += taskRowHeight(endRow) + gap;
+        endRow++;
+    }
+    let bottomHeight = 0;
+    for (let row = endRow; row < rowCount; row++) {
+        bottomHeight += taskRowHeight(row) + gap;
+    }
+    
+    const cards = listedTasks.slice(startRow * columns, endRow * columns).map(taskElementFor);
+    const children = [];
+    // A spacer is one more grid row, so the gap after it is already counted
+    if (topHeight > 0) {
+        topSpacer.style.height = `${topHeight - gap}px`;
+        children.push(topSpacer);
+    }
+    children.push(...cards);
+    if (bottomHeight > 0) {
+        bottomSpacer.style.height = `${bottomHeight - gap}px`;
+        children.push(bottomSpacer);
+    }
+    replaceTaskListChildren(taskList, children);
+    
+    if (measureTaskRows(cards, startRow, columns)) {
+        // Estimates were off; lay the window out again with the real heights
+        scheduleTaskWindow();
+    }
+}
+
+function replaceTaskListChildren(taskList, children) {
+    // Keyed update: nodes that stay are left alone, so only new cards are inserted
+    const keep = new Set(children);
+    Array.from(taskList.childNodes).forEach(node => {
+        if (!keep.has(node)) node.remove();
+    });
+    let current = taskList.firstChild;
+    children.forEach(child => {
+        if (child === current) {
+            current = current.nextSibling;
+        } else {
+            taskList.insertBefore(child, current);
+        }
+    });
+}
+
+function measureTaskRows(cards, startRow, columns) {
+    if (cards.length === 0) return false;
+    const style = getComputedStyle(cards[0]);
+    const margins = parseFloat(style.marginTop) + parseFloat(style.marginBottom);
+    let changed = false;
+    for (let i = 0; i < cards.length; i += columns) {
+        const row = startRow + i / columns;
+        const height = Math.max(...cards.slice(i, i + columns).map(card => card.offsetHeight)) + margins;
+        if (Math.abs(taskRowHeight(row) - height) > 1) changed = true;
+        taskRowHeights[row] = height;
+    }
+    const measured = taskRowHeights.filter(height => height !== undefined);
+    averageTaskRowHeight = measured.reduce((sum, height) => sum + height, 0) / measured.length;
+    return changed;
+}
+
+function taskCardKey(task) {
+    return [task.title, task.description, task.status, task.priority, task.category,
+            task.due_date, task.created_at, task.updated_at, listedTasksDay].join('\u0000');
+}
+
+function taskElementFor(task) {
+    const key = taskCardKey(task);
+    let card = taskCards.get(task.id);
+    if (!card || card.key !== key) {
+        card = {key, element: buildTaskElement(task)};
+        taskCards.set(task.id, card);
+    }
+    return card.element;
+}
+
+function buildTaskElement(task) {
+    const taskElement = document.createElement('div');
+    const isTaskOverdue = isOverdue(task.due_date) && task.status !== 'completed';
+    const daysUntilDue = getDaysUntilDue(task.due_date);
+    
+    let taskClasses = `task-item ${task.status}`;
+    if (task.priority === 'high') taskClasses += ' high-priority';
+    if (isTaskOverdue) taskClasses += ' overdue';
+    
+    taskElement.className = taskClasses;
+    
+    const statusText = {
+        'pending': 'Pending',
+        'in_progress': 'In Progress',
+        'completed': 'Completed'
+    }[task.status];
+    
+    const statusIcon = {
+        'pending': 'clock',
+        'in_progress': 'spinner',
+        'completed': 'check-circle'
+    }[task.status];
+    
+    const nextStatus = {
+        'pending': { text: 'Start', status: 'in_progress', class: 'btn-status', icon: 'play' },
+        'in_progress': { text: 'Complete', status: 'completed', class: 'btn-complete', icon: 'check' },
+        'completed': { text: 'Reset', status: 'pending', class: 'btn-status', icon: 'undo' }
+    }[task.status];
+    
+    let dueBadge = '';
+    if (task.due_date) {
+        const dueDateFormatted = new Date(task.due_date).toLocaleDateString();
+        if (isTaskOverdue) {
+            dueBadge = `<span class="due-badge overdue"><i class="fas fa-exclamation-triangle"></i> Overdue</span>`;
+        } else if (daysUntilDue <= 3 && daysUntilDue >= 0) {
+            dueBadge = `<span class="due-badge"><i class="fas fa-calendar-alt"></i> Due ${daysUntilDue === 0 ? 'today' : 'in ' + daysUntilDue + ' day' + (daysUntilDue > 1 ? 's' : '')}</span>`;
+        } else if (daysUntilDue > 3) {
+            dueBadge = `<span class="due-badge"><i class="fas fa-calendar"></i> Due ${dueDateFormatted}</span>`;
+        }
+    }
+    
+    taskElement.innerHTML = `
+        <div class="task-header">
+            <h3 class="task-title">
+                <i class="fas fa-tasks"></i>
+                ${task.title}
+            </h3>
+            <div class="task-badges">
+                <span class="priority-badge ${task.priority || 'medium'}">
+                    ${getPriorityEmoji(task.priority)} ${(task.priority || 'medium').charAt(0).toUpperCase() + (task.priority || 'medium').slice(1)}
+                </span>
+                <span class="category-badge">
+                    ${getCategoryEmoji(task.category)} ${(task.category || 'other').charAt(0).toUpperCase() + (task.category || 'other').slice(1)}
+                </span>
+                ${dueBadge}
+            </div>
+        </div>
+        <p class="task-description">${task.description || 'No description provided'}</p>
+        <span class="task-status ${task.status}">
+            <i class="fas fa-${statusIcon}"></i>
+            ${statusText}
+        </span>
+        <div class="task-actions">
+            <button class="btn-delete" onclick="deleteTask(${task.id})">
+                <i class="fas fa-trash"></i> Delete
+            </button>
+            <button class="${nextStatus.class}" onclick="updateStatus(${task.id}, '${nextStatus.status}')">
+                <i class="fas fa-${nextStatus.icon}"></i> ${nextStatus.text}
+            </button>
+        </div>
+        <div class="task-meta">
+            <span><i class="fas fa-calendar"></i> Created: ${formatDate(task.created_at)}</span>
+            <span><i class="fas fa-clock"></i> Updated: ${formatDate(task.updated_at)}</span>
+        </div>
+    `;
+    
+    return taskElement;
+}
+
+// Overdue badges only change when the date does, so the list is re-rendered
+// then rather than on a timer
+function refreshOverdueTasks() {
+    if (new Date().toDateString() !== listedTasksDay) renderTasks();
+}
+
+window.addEventListener('scroll', scheduleTaskWindow, {passive: true});
+window.addEventListener('resize', () => {
+    // Column count and card heights depend on the width
+    taskRowHeights = [];
+    scheduleTaskWindow();
+});
+
+document.getElementById('taskForm').addEventListener('submit', function(e) {
+    e.preventDefault();
+    const task = {
+        title: document.getElementById('title').value,
+        description: document.getElementById('description').value,
+        status: document.getElementById('status').value,
+        priority: document.getElementById('priority').value,
+        category: document.getElementById('category').value,
+        due_date: document.getElementById('due_date').value || null
+    };
+    fetch('/api/tasks/', {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json',
+            'X-CSRFToken': getCookie('csrftoken')
+        },
+        body: JSON.stringify(task)
+    })
+    .then(response => response.json())
+    .then(() => {
+        document.getElementById('taskForm').reset();
+        syncTasks();
+        toggleModal(); // Close the task form modal
+        showToast('Task added successfully!', 'success');
+    })
+    .catch(() => {
+        showToast('Error adding task', 'error');
+    });
+});
+
+// Search functionality: ranked full-text search on the server, debounced per keystroke
+let searchResults = null;
+let searchDebounceTimer = null;
+let latestSearchTerm = '';
+
+function searchTasks(term) {
+    latestSearchTerm = term;
+    if (!term) {
+        searchResults = null;
+        renderTasks();
+        return;
+    }
+    fetch(`/api/tasks/search/?q=${encodeURIComponent(term)}`)
+        .then(response => response.json())
+        .then(page => {
+            // Ignore responses that arrive after the user kept typing
+            if (term !== latestSearchTerm) return;
+            searchResults = page.results;
+            renderTasks();
+        })
+        .catch(error => {
+            console.error('Error searching tasks:', error);
+            showToast('Error searching tasks', 'error');
+        });
+}
+
+document.getElementById('searchTasks')?.addEventListener('input', function() {
+    const term = this.value.trim();
+    clearTimeout(searchDebounceTimer);
+    searchDebounceTimer = setTimeout(() => searchTasks(term), 250);
+});
+
+// Sort functionality
+document.getElementById('sortTasks')?.addEventListener('change', function() {
+    renderTasks();
+});
+
+// Filter functionality
+document.querySelectorAll('.filter-btn').forEach(btn => {
+    btn.addEventListener('click', function() {
+        document.querySelectorAll('.filter-btn').forEach(b => b.classList.remove('active'));
+        this.classList.add('active');
+        currentFilter = this.dataset.filter;
+        renderTasks();
+    });
+});
+
+// View toggle functionality
+document.querySelectorAll('.view-btn').forEach(btn => {
+    btn.addEventListener('click', function() {
+        document.querySelectorAll('.view-btn').forEach(b => b.classList.remove('active'));
+        this.classList.add('active');
+        currentView = this.dataset.view;
+        const taskList = document.getElementById('taskList');
+        
+        if (currentView === 'list') {
+            taskList.classList.add('list-view');
+            taskList.classList.remove('card-view');
+        } else {
+            taskList.classList.remove('list-view');
+            taskList.classList.add('card-view');
+        }
+        // Cards change height with the view, so the window is laid out afresh
+        taskRowHeights = [];
+        scheduleTaskWindow();
+        
+        // Save user preference
+        localStorage.setItem(`taskViewPreference_${currentUserId}`, currentView);
+    });
+});
+
+// Load saved view preference
+document.addEventListener('DOMContentLoaded', function() {
+    const savedView = localStorage.getItem(`taskViewPreference_${currentUserId}`) || 'card';
+    const taskList = document.getElementById('taskList');
+    const viewBtn = document.querySelector(`[data-view="${savedView}"]`);
+    
+    if (viewBtn) {
+        document.querySelectorAll('.view-btn').forEach(b => b.classList.remove('active'));
+        viewBtn.classList.add('active');
+        currentView = savedView;
+        
+        if (currentView === 'list') {
+            taskList.classList.add('list-view');
+            taskList.classList.remove('card-view');
+        } else {
+            taskList.classList.remove('list-view');
+            taskList.classList.add('card-view');
+        }
+    }
+    
+    // Initialize photo upload as backup (in case modal opens before initialization)
+    console.log('DOM loaded, setting up backup photo upload initialization');
+    
+    // Add a mutation observer to watch for modal opens
+    const observer = new MutationObserver(function(mutations) {
+        mutations.forEach(function(mutation) {
+            if (mutation.type === 'attributes' && mutation.attributeName === 'style') {
+                const modal = mutation.target;
+                if (modal.id === 'editProfileModal' && modal.style.display === 'block') {
+                    console.log('Edit profile modal opened, initializing photo upload');
+                    setTimeout(() => {
+                        initializePhotoUpload();
+                    }, 50);
+                }
+            }
+        });
+    });
+    
+    const editProfileModal = document.getElementById('editProfileModal');
+    if (editProfileModal) {
+        observer.observe(editProfileModal, { attributes: true });
+    }
+});
+
+function showNotification(message, type = 'info') {
+    const notification = document.createElement('div');
+    notification.className = `notification ${type}`;
+    notification.style.cssText = `
+        position: fixed;
+        top: 20px;
+        right: 20px;
+        background: ${type === 'success' ? '#22c55e' : type === 'error' ? '#ef4444' : '#6c63ff'};
+        color: white;
+        padding: 1rem 1.5rem;
+        border-radius: 0.8rem;
+        box-shadow: 0 8px 32px -8px rgba(0,0,0,0.3);
+        z-index: 1000;
+        transform: translateX(100%);
+        transition: transform 0.3s ease;
+        font-weight: 500;
+        display: flex;
+        align-items: center;
+        gap: 0.5rem;
+    `;
+    
+    const icon = type === 'success' ? 'fas fa-check-circle' : type === 'error' ? 'fas fa-exclamation-circle' : 'fas fa-info-circle';
+    notification.innerHTML = `<i class="${icon}"></i> ${message}`;
+    
+    document.body.appendChild(notification);
+    
+    // Animate in
+    setTimeout(() => {
+        notification.style.transform = 'translateX(0)';
+    }, 100);
+    
+    // Auto remove
+    setTimeout(() => {
+        notification.style.transform = 'translateX(100%)';
+        setTimeout(() => {
+            document.body.removeChild(notification);
+        }, 300);
+    }, 3000);
+}
+function deleteTask(id) {
+    showConfirmation(
+        'Delete Task',
+        'Are you sure you want to delete this task? This action cannot be undone.',
+        function() {
+            // Confirmed - proceed with deletion
+            fetch(`/api/tasks/${id}/`, {
+                method: 'DELETE',
+                headers: {
+                    'X-CSRFToken': getCookie('csrftoken')
+                }
+            })
+            .then(() => {
+                syncTasks();
+                showToast('Task deleted successfully!', 'success');
+            })
+            .catch(() => {
+                showToast('Error deleting task', 'error');
+            });
+        }
+    );
+}
+
+function updateStatus(id, newStatus) {
+    fetch(`/api/tasks/${id}/`)
+        .then(response => response.json())
+        .then(task => {
+            task.status = newStatus;
+            return fetch(`/api/tasks/${id}/`, {
+                method: 'PUT',
+                headers: {
+                    'Content-Type': 'application/json',
+                    'X-CSRFToken': getCookie('csrftoken')
+                },
+                body: JSON.stringify(task)
+            });
+        })
+        .then(() => {
+            syncTasks();
+            const statusMessages = {
+                'pending': 'Task moved to pending',
+                'in_progress': 'Task started!',
+                'completed': 'Task completed! 🎉'
+            };
+            showNotification(statusMessages[newStatus], 'success');
+        })
+        .catch(() => {
+            showNotification('Error updating task status', 'error');
+        });
+}
+
+function getCookie(name) {
+    let cookieValue = null;
+    if (document.cookie && document.cookie !== '') {
+        const cookies = document.cookie.split(';');
+        for (let i = 0; i < cookies.length; i++) {
+            const cookie = cookies[i].trim();
+            if (cookie.substring(0, name.length + 1) === (name + '=')) {
+                cookieValue = decodeURIComponent(cookie.substring(name.length + 1));
+                break;
+            }
+        }
+    }
+    return cookieValue;
+}
+
+// Global functions that need to be accessible to HTML onclick handlers
+function openModal(modalId) {
+    const modal = document.getElementById(modalId);
+    if (modal) {
+        modal.style.display = 'block';
+        document.body.style.overflow = 'hidden';
+        
+        // Initialize photo upload for edit profile modal
+        if (modalId === 'editProfileModal') {
+            setTimeout(() => {
+                initializePhotoUpload();
+            }, 100);
+        }
+    } else {
+        console.error('Modal not found:', modalId);
+    }
+}
+
+function closeModal(modalId) {
+    const modal = document.getElementById(modalId);
+    if (modal) {
+        modal.style.display = 'none';
+        document.body.style.overflow = 'auto';
+    } else {
+        console.error('Modal not found:', modalId);
+    }
+}
+
+// Confirmation Modal Functions
+let confirmationCallback = null;
+
+function showConfirmation(title, message, onConfirm, onCancel = null) {
+    const modal = document.getElementById('confirmationModal');
+    const titleElement = document.getElementById('confirmationTitle');
+    const messageElement = document.getElementById('confirmationMessage');
+    
+    if (!modal || !titleElement || !messageElement) {
+        console.error('Confirmation modal elements not found');
+        return;
+    }
+    
+    titleElement.textContent = title;
+    messageElement.textContent = message;
+    confirmationCallback = { onConfirm, onCancel };
+    
+    modal.style.display = 'block';
+    document.body.style.overflow = 'hidden';
+}
+
+function proceedConfirmation() {
+    const modal = document.getElementById('confirmationModal');
+    if (modal) {
+        modal.style.display = 'none';
+        document.body.style.overflow = 'auto';
+    }
+    
+    if (confirmationCallback && confirmationCallback.onConfirm) {
+        confirmationCallback.onConfirm();
+    }
+    
+    confirmationCallback = null;
+}
+
+function cancelConfirmation() {
+    const modal = document.getElementById('confirmationModal');
+    if (modal) {
+        modal.style.display = 'none';
+        document.body.style.overflow = 'auto';
+    }
+    
+    if (confirmationCallback && confirmationCallback.onCancel) {
+        confirmationCallback.onCancel();
+    }
+    
+    confirmationCallback = null;
+}
+
+function toggleModal() {
+    const modal = document.getElementById('taskModal');
+    if (modal.style.display === 'block') {
+        closeModal('taskModal');
+    } else {
+        openModal('taskModal');
+    }
+}
+
+function createTask() {
+    const title = document.getElementById('title').value;
+    const description = document.getElementById('description').value;
+    const priority = document.getElementById('priority').value;
+    const dueDate = document.getElementById('due_date').value;
+
+    if (!title.trim()) {
+        showToast('Please enter a task title', 'error');
+        return;
+    }
+
+    const taskData = {
+        title: title,
+        description: description,
+        priority: priority,
+        due_date: dueDate || null
+    };
+
+    fetch('/api/tasks/', {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json',
+            'X-CSRFToken': getCookie('csrftoken')
+        },
+        body: JSON.stringify(taskData)
+    })
+    .then(response => response.json())
+    .then(data => {
+        if (data.id) {
+            showToast('Task created successfully!', 'success');
+            closeModal('taskModal');
+            document.getElementById('taskForm').reset();
+            syncTasks(); // Refresh the task list
+        } else {
+            showToast('Error creating task', 'error');
+        }
+    })
+    .catch(error => {
+        console.error('Error:', error);
+        showToast('Error creating task', 'error');
+    });
+}
+
+function deleteTask(taskId) {
+    showConfirmation(
+        'Delete Task',
+        'Are you sure you want to delete this task? This action cannot be undone.',
+        function() {
+            // Confirmed - proceed with deletion
+            fetch(`/api/tasks/${taskId}/`, {
+                method: 'DELETE',
+                headers: {
+                    'X-CSRFToken': getCookie('csrftoken')
+                }
+            })
+            .then(response => {
+                if (response.ok) {
+                    showToast('Task deleted successfully!', 'success');
+                    syncTasks(); // Refresh the task list
+                } else {
+                    showToast('Error deleting task', 'error');
+                }
+            })
+            .catch(error => {
+                console.error('Error:', error);
+                showToast('Error deleting task', 'error');
+            });
+        }
+    );
+}
+
+function updateTaskStatus(taskId, newStatus) {
+    fetch(`/api/tasks/${taskId}/`, {
+        method: 'PATCH',
+        headers: {
+            'Content-Type': 'application/json',
+            'X-CSRFToken': getCookie('csrftoken')
+        },
+        body: JSON.stringify({ status: newStatus })
+    })
+    .then(response => response.json())
+    .then(data => {
+        if (data.id) {
+            showToast('Task status updated!', 'success');
+            syncTasks(); // Refresh the task list
+        } else {
+            showToast('Error updating task', 'error');
+        }
+    })
+    .catch(error => {
+        console.error('Error:', error);
+        showToast('Error updating task', 'error');
+    });
+}
+
+function showToast(message, type = 'info') {
+    const toast = document.getElementById('toast');
+    if (!toast) return;
+    
+    toast.textContent = message;
+    toast.className = `toast show ${type}`;
+    
+    setTimeout(() => {
+        toast.className = 'toast';
+    }, 3000);
+}
+
+// Profile and Customization Functions
+function previewProfilePhoto(event) {
+    const file = event.target.files[0];
+    if (file) {
+        const reader = new FileReader();
+        reader.onload = function(e) {
+            const profileImage = document.getElementById('profileImage');
+            const defaultAvatar = document.getElementById('defaultAvatar');
+            
+            if (profileImage) {
+                profileImage.src = e.target.result;
+                profileImage.style.display = 'block';
+            }
+            if (defaultAvatar) {
+                defaultAvatar.style.display = 'none';
+            }
+        };
+        reader.readAsDataURL(file);
+    }
+}
+
+async function saveProfile() {
+    const formData = new FormData();
+    const photoInput = document.getElementById('avatarInput');
+    const fullName = document.getElementById('editFullName').value;
+    const email = document.getElementById('editEmail').value;
+    const bio = document.getElementById('editBio').value;
+    
+    if (photoInput && photoInput.files[0]) {
+        formData.append('profile_photo', photoInput.files[0]);
+    }
+    
+    // Add user data
+    if (fullName) {
+        formData.append('display_name', fullName);
+    }
+    if (bio) {
+        formData.append('bio', bio);
+    }
+    
+    try {
+        // Update profile
+        const profileResponse = await fetch('/api/profile/update_profile/', {
+            method: 'PATCH',
+            body: formData,
+            headers: {
+                'X-CSRFToken': getCookie('csrftoken')
+            }
+        });
+        
+        if (profileResponse.ok) {
+            const updatedProfile = await profileResponse.json();
+            
+            // Update user email if changed
+            if (email && email !== currentUserEmail) {
+                const userResponse = await fetch('/api/auth/update_user/', {
+                    method: 'PATCH',
+                    headers: {
+                        'Content-Type': 'application/json',
+                        'X-CSRFToken': getCookie('csrftoken')
+                    },
+                    body: JSON.stringify({
+                        email: email,
+                        first_name: fullName.split(' ')[0] || '',
+                        last_name: fullName.split(' ').slice(1).join(' ') || ''
+                    })
+                });
+            }
+            
+            // Update display
+            loadUserProfile();
+            updateNavbarProfile(updatedProfile);
+            
+            closeModal('editProfileModal');
+            showToast('Profile updated successfully!', 'success');
+        } else {
+            const errorData = await profileResponse.json();
+            showToast(errorData.error || 'Error updating profile', 'error');
+        }
+    } catch (error) {
+        console.error('Error saving profile:', error);
+        showToast('Error updating profile', 'error');
+    }
+}
+
+async function changePassword() {
+    const currentPassword = document.getElementById('currentPassword').value;
+    const newPassword = document.getElementById('newPassword').value;
+    const confirmPassword = document.getElementById('confirmPassword').value;
+    
+    if (!currentPassword || !newPassword || !confirmPassword) {
+        showToast('All password fields are required', 'error');
+        return;
+    }
+    
+    if (newPassword !== confirmPassword) {
+        showToast('New passwords do not match', 'error');
+        return;
+    }
+    
+    if (newPassword.length < 8) {
+        showToast('New password must be at least 8 characters long', 'error');
+        return;
+    }
+    
+    try {
+        const response = await fetch('/api/profile/change_password/', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+                'X-CSRFToken': getCookie('csrftoken')
+            },
+            body: JSON.stringify({
+                current_password: currentPassword,
+                new_password: newPassword
+            })
+        });
+        
+        const data = await response.json();
+        
+        if (response.ok) {
+            closeModal('changePasswordModal');
+            document.getElementById('changePasswordForm').reset();
+            
+            // Show success modal instead of toast
+            openModal('passwordSuccessModal');
+            
+            // Force logout and redirect to login after password change
+            setTimeout(() => {
+                window.location.href = '/logout/';
+            }, 4000); // Give more time to see the success modal
+        } else {
+            // Check if it's a wrong current password error
+            if (response.status === 400 && data.error && data.error.includes('Current password is incorrect')) {
+                // Show the specific password error modal
+                openModal('passwordErrorModal');
+                // Clear the current password field
+                document.getElementById('currentPassword').value = '';
+                // Focus back on the current password field for retry
+                setTimeout(() => {
+                    document.getElementById('currentPassword').focus();
+                }, 500);
+            } else {
+                // Show generic error for other issues
+                showToast(data.error || 'Error changing password', 'error');
+            }
+        }
+    } catch (error) {
+        console.error('Error changing password:', error);
+        showToast('Error changing password', 'error');
+    }
+}
+
+// Photo Upload Drag and Drop Functionality
+function initializePhotoUpload() {
+    const photoPreview = document.getElementById('photoPreview');
+    const avatarInput = document.getElementById('avatarInput');
+    const previewImage = document.getElementById('previewImage');
+    const uploadPlaceholder = document.getElementById('uploadPlaceholder');
+    const removePhotoBtn = document.getElementById('removePhotoBtn');
+    
+    if (!photoPreview || !avatarInput) {
+        console.log('Photo upload elements not found');
+        return;
+    }
+    
+    console.log('Initializing photo upload drag and drop');
+    
+    // Store the file for later use
+    let currentFile = null;
+    
+    // Prevent default drag behaviors on the whole document
+    ['dragenter', 'dragover', 'dragleave', 'drop'].forEach(eventName => {
+        document.addEventListener(eventName, preventDefaults, false);
+        photoPreview.addEventListener(eventName, preventDefaults, false);
+    });
+    
+    // Highlight drop area when item is dragged over it
+    ['dragenter', 'dragover'].forEach(eventName => {
+        photoPreview.addEventListener(eventName, highlight, false);
+    });
+    
+    ['dragleave', 'drop'].forEach(eventName => {
+        photoPreview.addEventListener(eventName, unhighlight, false);
+    });
+    
+    // Handle dropped files
+    photoPreview.addEventListener('drop', handleDrop, false);
+    
+    // Handle file selection via input
+    avatarInput.addEventListener('change', handleFileSelect);
+    
+    // Handle click to open file selector
+    photoPreview.addEventListener('click', (e) => {
+        e.preventDefault();
+        e.stopPropagation();
+        avatarInput.click();
+    });
+    
+    // Remove photo functionality
+    if (removePhotoBtn) {
+        removePhotoBtn.addEventListener('click', (e) => {
+            e.preventDefault();
+            e.stopPropagation();
+            removePhoto();
+        });
+    }
+    
+    function preventDefaults(e) {
+        e.preventDefault();
+        e.stopPropagation();
+    }
+    
+    function highlight(e) {
+        photoPreview.classList.add('dragover');
+        console.log('Drag highlight activated');
+    }
+    
+    function unhighlight(e) {
+        photoPreview.classList.remove('dragover');
+        console.log('Drag highlight removed');
+    }
+    
+    function handleDrop(e) {
+        const dt = e.dataTransfer;
+        const files = dt.files;
+        
+        console.log('Files dropped:', files.length);
+        
+        if (files.length > 0) {
+            handleFile(files[0]);
+        }
+    }
+    
+    function handleFileSelect(e) {
+        const file = e.target.files[0];
+        console.log('File selected:', file);
+        if (file) {
+            handleFile(file);
+        }
+    }
+    
+    function handleFile(file) {
+        console.log('Processing file:', file.name, file.type, file.size);
+        
+        // Store the file
+        currentFile = file;
+        
+        // Validate file type
+        if (!file.type.startsWith('image/')) {
+            showToast('Please select an image file', 'error');
+            return;
+        }
+        
+        // Validate file size (5MB max)
+        if (file.size > 5 * 1024 * 1024) {
+            showToast('File size must be less than 5MB', 'error');
+            return;
+        }
+        
+        // Create file reader
+        const reader = new FileReader();
+        reader.onload = function(e) {
+            console.log('File loaded successfully');
+            previewImage.src = e.target.result;
+            previewImage.style.display = 'block';
+            uploadPlaceholder.style.display = 'none';
+            removePhotoBtn.style.display = 'block';
+        };
+        reader.onerror = function(e) {
+            console.error('Error reading file:', e);
+            showToast('Error reading file', 'error');
+        };
+        reader.readAsDataURL(file);
+        
+        // Update the input element with the file
+        updateInputFile(file);
+        
+        showToast('Photo uploaded successfully', 'success');
+    }
+    
+    function updateInputFile(file) {
+        try {
+            // Modern approach using DataTransfer
+            if (typeof DataTransfer !== 'undefined') {
+                const dataTransfer = new DataTransfer();
+                dataTransfer.items.add(file);
+                avatarInput.files = dataTransfer.files;
+                console.log('File added to input via DataTransfer:', avatarInput.files.length);
+            } else {
+                throw new Error('DataTransfer not supported');
+            }
+        } catch (error) {
+            console.log('DataTransfer failed, using alternative method:', error);
+            
+            // Store file in a custom property for later retrieval
+            avatarInput._selectedFile = file;
+            
+            // Create a getter that returns our file
+            Object.defineProperty(avatarInput, 'files', {
+                get: function() {
+                    return this._selectedFile ? [this._selectedFile] : [];
+                },
+                configurable: true
+            });
+            
+            console.log('File stored in alternative method');
+        }
+    }
+    
+    function removePhoto() {
+        previewImage.src = '';
+        previewImage.style.display = 'none';
+        uploadPlaceholder.style.display = 'block';
+        removePhotoBtn.style.display = 'none';
+        avatarInput.value = '';
+        avatarInput._selectedFile = null;
+        currentFile = null;
+        console.log('Photo removed');
+    }
+    
+    // Expose current file for external access
+    photoPreview.getCurrentFile = () => currentFile;
+}
+
+function updateNavbarProfile(profile) {
+    // Update navbar profile display
+    const navbarUsername = document.querySelector('.profile-info .username');
+    const navbarEmail = document.querySelector('.profile-info .email');
+    
+    if (navbarUsername && profile.display_name) {
+        navbarUsername.textContent = profile.display_name;
+    }
+    
+    if (navbarEmail && profile.user && profile.user.email) {
+        navbarEmail.textContent = profile.user.email;
+    }
+}
+
+function addQuickAction() {
+    console.log('addQuickAction called');
+    
+    const title = document.getElementById('actionTitle').value;
+    const icon = document.getElementById('actionIcon').value;
+    const category = document.getElementById('actionCategory').value;
+    
+    console.log('Form values:', { title, icon, category });
+    
+    if (!title || !icon || !category) {
+        showToast('Please fill in all fields', 'error');
+        return;
+    }
+    
+    const newAction = { 
+        label: title,
+        icon: icon,
+        action_type: 'filter',
+        action_data: { category: category },
+        is_active: true
+    };
+    
+    console.log('Creating new action:', newAction);
+    
+    // Send to server
+    fetch('/api/quick-actions/', {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json',
+            'X-CSRFToken': getCookie('csrftoken')
+        },
+        body: JSON.stringify(newAction)
+    })
+    .then(response => response.json())
+    .then(data => {
+        console.log('Action created:', data);
+        loadQuickActions().then(() => {
+            renderQuickActions();
+            renderQuickActionsList();
+        });
+        
+        // Clear form
+        document.getElementById('actionTitle').value = '';
+        document.getElementById('actionIcon').selectedIndex = 0;
+        document.getElementById('actionCategory').selectedIndex = 0;
+        
+        showToast('Quick action added successfully!', 'success');
+    })
+    .catch(error => {
+        console.error('Error creating action:', error);
+        showToast('Error adding quick action', 'error');
+    });
+}
+
+function removeQuickAction(actionId) {
+    // Send delete request to server
+    fetch(`/api/quick-actions/${actionId}/`, {
+        method: 'DELETE',
+        headers: {
+            'X-CSRFToken': getCookie('csrftoken')
+        }
+    })
+    .then(() => {
+        loadQuickActions().then(() => {
+            renderQuickActions();
+            renderQuickActionsList();
+        });
+        showToast('Quick action removed', 'success');
+    })
+    .catch(error => {
+        console.error('Error removing action:', error);
+        showToast('Error removing quick action', 'error');
+    });
+}
+
+async function loadQuickActions() {
+    // Load quick actions from server
+    try {
+        const response = await fetch('/api/quick-actions/');
+        const data = await response.json();
+        quickActions = data;
+        console.log('Loaded quick actions from server:', quickActions);
+    } catch (error) {
+        console.error('Error loading quick actions:', error);
+        // Fallback to default actions if server fails
+        quickActions = [
+            { id: 1, icon: 'fas fa-plus', label: 'Add Task' },
+            { id: 2, icon: 'fas fa-clock', label: 'Due Today' },
+            { id: 3, icon: 'fas fa-star', label: 'High Priority' },
+            { id: 4, icon: 'fas fa-chart-bar', label: 'Report' }
+        ];
+    }
+}
+
+function getQuickActions() {
+    return quickActions;
+}
+
+function renderQuickActions() {
+    const quickActions = getQuickActions();
+    const container = document.getElementById('quickButtonsContainer');
+    
+    if (container) {
+        container.innerHTML = quickActions.map(action => {
+            // Get category from action_data or fallback to default categories
+            const category = action.action_data?.category || action.category || 'other';
+            const buttonId = `quick-btn-${action.label.replace(/\s+/g, '-').toLowerCase()}`;
+            return `
+                <button id="${buttonId}" class="quick-btn" onclick="addQuickTask('${action.label}', '${category}')">
+                    <i class="${action.icon}"></i> ${action.label}
+                </button>
+            `;
+        }).join('');
+    }
+}
+
+function renderQuickActionsList() {
+    const quickActions = getQuickActions();
+    const container = document.querySelector('.quick-actions-list');
+    
+    if (container) {
+        container.innerHTML = quickActions.map(action => `
+            <div class="quick-action-item">
+                <div class="action-info">
+                    <i class="${action.icon}"></i>
+                    <span>${action.label}</span>
+                </div>
+                <button class="remove-action-btn" onclick="removeQuickAction(${action.id})">
+                    <i class="fas fa-times"></i>
+                </button>
+            </div>
+        `).join('');
+    }
+}
+
+function handleQuickAction(actionType) {
+    switch(actionType) {
+        case 'Add Task':
+            toggleModal();
+            break;
+        case 'Due Today':
+            filterTasksByDueDate('today');
+            break;
+        case 'High Priority':
+            filterTasksByPriority('high');
+            break;
+        case 'Report':
+            generateReport();
+            break;
+        default:
+            showToast(`${actionType} action triggered`, 'info');
+    }
+}
+
+function filterTasksByDueDate(filter) {
+    showToast(`Filtering tasks: ${filter}`, 'info');
+    // TODO: Implement actual filtering
+}
+
+function filterTasksByPriority(priority) {
+    showToast(`Filtering by ${priority} priority`, 'info');
+    // TODO: Implement actual filtering
+}
+
+function generateReport() {
+    showToast('Generating productivity report...', 'info');
+    // TODO: Implement actual report generation
+}
+
+function saveQuickActions() {
+    // Save current quick actions configuration
+    showToast('Quick actions saved!', 'success');
+    closeModal('quickActionsModal');
+}
+
+// Initialize the application
+document.addEventListener('DOMContentLoaded', function() {
+    if (pageData) {
+        hydrateTasks(pageData);
+    } else {
+        fetchTasks();
+    }
+    
+    // Load the next page of tasks when the end of the list scrolls into view
+    const taskListSentinel = document.getElementById('taskListSentinel');
+    if (taskListSentinel && 'IntersectionObserver' in window) {
+        new IntersectionObserver(entries => {
+            if (entries.some(entry => entry.isIntersecting)) loadMoreTasks();
+        }, { rootMargin: '400px' }).observe(taskListSentinel);
+    }
+    
+    // Set minimum date for due date input to today
+    const dueDateInput = document.getElementById('due_date');
+    if (dueDateInput) {
+        const today = new Date().toISOString().split('T')[0];
+        dueDateInput.min = today;
+    }
+    
+    // Update overdue badges once the date changes
+    setInterval(refreshOverdueTasks, 60000);
+
+    // Add form event listeners
+    const editProfileForm = document.getElementById('editProfileForm');
+    if (editProfileForm) {
+        editProfileForm.addEventListener('submit', function(e) {
+            e.preventDefault();
+            saveProfile();
+        });
+    }
+
+    const changePasswordForm = document.getElementById('changePasswordForm');
+    if (changePasswordForm) {
+        changePasswordForm.addEventListener('submit', function(e) {
+            e.preventDefault();
+            changePassword();
+        });
+    }
+
+    const newQuickActionForm = document.getElementById('newQuickActionForm');
+    if (newQuickActionForm) {
+        newQuickActionForm.addEventListener('submit', function(e) {
+            e.preventDefault();
+            addQuickAction();
+        });
+    }
+
+    // Initialize on page load for profile features
+    async function initializeProfileFeatures() {
+        console.log('Initializing profile features...');
+        
+        try {
+            if (pageData) {
+                updateProfileDisplay(pageData.profile);
+                quickActions = pageData.quick_actions;
+            } else {
+                loadUserProfile();
+                await loadQuickActions();
+            }
+            renderQuickActions();
+            renderQuickActionsList();
+        } catch (error) {
+            console.error('Error initializing profile features:', error);
+        }
+        
+        // Close modal when clicking outside
+        window.onclick = function(event) {
+            const modals = document.querySelectorAll('.modal');
+            modals.forEach(modal => {
+                if (event.target === modal && modal.id) {
+                    closeModal(modal.id);
+                }
+            });
+        };
+
+        // Add keyboard support for confirmation modal
+        document.addEventListener('keydown', function(event) {
+            const confirmationModal = document.getElementById('confirmationModal');
+            if (confirmationModal && confirmationModal.style.display === 'flex') {
+                if (event.key === 'Escape') {
+                    event.preventDefault();
+                    cancelConfirmation();
+                } else if (event.key === 'Enter') {
+                    event.preventDefault();
+                    proceedConfirmation();
+                }
+            }
+        });
+    }
+
+    // Debug function to check what elements exist
+    function debugElements() {
+        console.log('=== Element Debug ===');
+        console.log('Quick actions container:', document.getElementById('quickButtonsContainer'));
+        console.log('Quick actions list:', document.querySelector('.quick-actions-list'));
+        console.log('Profile avatar:', document.getElementById('profileAvatar'));
+        console.log('Default avatar:', document.getElementById('defaultAvatar'));
+        console.log('Pending count:', document.getElementById('pendingCount'));
+        console.log('In progress count:', document.getElementById('inProgressCount'));
+        console.log('Completed count:', document.getElementById('completedCount'));
+        console.log('Productivity score:', document.getElementById('productivityScore'));
+    }
+
+    // Profile dropdown functionality
+    function toggleProfileDropdown() {
+        const dropdown = document.querySelector('.profile-dropdown');
+        if (dropdown) {
+            dropdown.style.display = dropdown.style.display === 'block' ? 'none' : 'block';
+        }
+    }
+
+    // Close dropdown when clicking outside
+    document.addEventListener('click', function(event) {
+        const dropdown = document.querySelector('.profile-dropdown');
+        const trigger = document.querySelector('.profile-trigger');
+        
+        if (dropdown && trigger && !trigger.contains(event.target) && !dropdown.contains(event.target)) {
+            dropdown.style.display = 'none';
+        }
+    });
+
+    // Initialize profile features after DOM is ready
+    setTimeout(() => {
+        debugElements();
+        initializeProfileFeatures();
+    }, 100);
+    
+    connectTaskEvents();
+
+    // Fall back to syncing while there is no live event stream
+    scheduleTaskPolling();
+});
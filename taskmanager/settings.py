@@ -47,12 +47,15 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'tasks.middleware.ServerTimingMiddleware',
+    'tasks.metrics.MetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
-    'whitenoise.middleware.WhiteNoiseMiddleware',
+    'tasks.middleware.AsyncWhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'tasks.middleware.ProfileMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -61,7 +64,8 @@ ROOT_URLCONF = 'taskmanager.urls'
 
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        # DjangoTemplates that reports rendering time to ServerTimingMiddleware
+        'BACKEND': 'tasks.instrumentation.TimedDjangoTemplates',
         'DIRS': [],
         'APP_DIRS': True,
         'OPTIONS': {
@@ -104,6 +108,46 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.0/topics/cache/
+# Per-process memory cache for development and tests; production uses a shared backend
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'taskflow',
+    }
+}
+
+# Broker carrying task events to the /api/events/ streams (see tasks/events.py).
+# In-process is enough for a single worker; production uses Redis when available.
+TASK_EVENTS = {
+    'BROKER': 'tasks.events.InProcessBroker',
+}
+
+# Threads per process that resize uploaded profile photos (see tasks/photos.py);
+# 0 processes them inline once the upload commits
+PROFILE_PHOTO_WORKERS = int(os.environ.get('PROFILE_PHOTO_WORKERS', '2'))
+
+REST_FRAMEWORK = {
+    'DEFAULT_RENDERER_CLASSES': [
+        'tasks.instrumentation.TimedJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+}
+
+# Requests slower than this are logged with their slowest queries
+SLOW_REQUEST_MS = int(os.environ.get('SLOW_REQUEST_MS', '500'))
+
+# Send the Server-Timing header to every client, not only in DEBUG and to staff
+SERVER_TIMING_PUBLIC = os.environ.get('SERVER_TIMING_PUBLIC', 'False') == 'True'
+
+# /metrics is open to staff users, to scrapers sending "Authorization: Bearer
+# <METRICS_TOKEN>", and to the comma-separated METRICS_ALLOWED_IPS
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN', '')
+METRICS_ALLOWED_IPS = [ip.strip() for ip in os.environ.get('METRICS_ALLOWED_IPS', '').split(',') if ip.strip()]
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
 
@@ -123,6 +167,18 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 
+# Sessions are read from the cache and written through to the database, so
+# an authenticated request normally costs one query: the user and profile
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+
+# Users sign in with their email (one indexed, case-insensitive lookup);
+# ModelBackend keeps username logins working for the admin
+AUTHENTICATION_BACKENDS = [
+    'tasks.backends.EmailBackend',
+    'django.contrib.auth.backends.ModelBackend',
+]
+
+
 # Internationalization
 # https://docs.djangoproject.com/en/5.0/topics/i18n/
 
@@ -158,4 +214,5 @@ LOGIN_URL = '/login/'
 LOGIN_REDIRECT_URL = '/'
 
 # Static file compression and caching
-STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
+# Minified, content-hashed and precompressed; see tasks/storage.py
+STATICFILES_STORAGE = 'tasks.storage.MinifiedStaticFilesStorage'
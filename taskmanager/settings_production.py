@@ -5,6 +5,8 @@ Production settings for Render deployment
 from .settings import *
 import os
 
+from django.core.exceptions import ImproperlyConfigured
+
 # SECURITY WARNING: don't run with debug turned on in production!
 # Enable DEBUG temporarily for troubleshooting 400 errors
 DEBUG = os.environ.get('DEBUG', 'False') == 'True'
@@ -38,6 +40,8 @@ SECURE_SSL_REDIRECT = os.environ.get('SECURE_SSL_REDIRECT', 'True') == 'True'
 SECURE_HSTS_SECONDS = 31536000 if SECURE_SSL_REDIRECT else 0
 SECURE_HSTS_INCLUDE_SUBDOMAINS = SECURE_SSL_REDIRECT
 SECURE_HSTS_PRELOAD = SECURE_SSL_REDIRECT
+# Let internal Prometheus scrapes use plain HTTP
+SECURE_REDIRECT_EXEMPT = [r'^metrics$']
 SECURE_CONTENT_TYPE_NOSNIFF = True
 SECURE_BROWSER_XSS_FILTER = True
 X_FRAME_OPTIONS = 'DENY'
@@ -80,6 +84,24 @@ if 'TIDB_SSL_CERT_B64' in os.environ:
             }
         }
 
+# Cache shared by all gunicorn workers. Besides cached data it holds the
+# per-user version counters behind the stats cache and the ETags
+# (tasks/cache.py), which rely on Redis's atomic INCR: with a database cache
+# concurrent bumps could be lost, and every version lookup would be a query.
+REDIS_URL = os.environ.get('REDIS_URL')
+if not REDIS_URL:
+    raise ImproperlyConfigured('REDIS_URL must be set in production')
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': REDIS_URL,
+    }
+}
+TASK_EVENTS = {
+    'BROKER': 'tasks.events.RedisBroker',
+    'OPTIONS': {'url': REDIS_URL},
+}
+
 # Media files
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
@@ -103,10 +125,27 @@ if not CORS_ALLOW_ALL_ORIGINS:
 LOGGING = {
     'version': 1,
     'disable_existing_loggers': False,
+    'formatters': {
+        'json': {
+            '()': 'tasks.instrumentation.JSONFormatter',
+        },
+    },
     'handlers': {
         'console': {
             'class': 'logging.StreamHandler',
         },
+        'structured': {
+            'class': 'logging.StreamHandler',
+            'formatter': 'json',
+        },
+    },
+    'loggers': {
+        # One JSON line per request from ServerTimingMiddleware
+        'taskflow.requests': {
+            'handlers': ['structured'],
+            'level': os.environ.get('REQUEST_LOG_LEVEL', 'INFO'),
+            'propagate': False,
+        },
     },
     'root': {
         'handlers': ['console'],
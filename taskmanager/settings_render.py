@@ -45,6 +45,7 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'tasks.middleware.ProfileMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -134,6 +135,12 @@ if not DEBUG:
     # SESSION_COOKIE_SECURE = True
     # CSRF_COOKIE_SECURE = True
 
+# Email login (tasks.backends.EmailBackend); ModelBackend for the admin
+AUTHENTICATION_BACKENDS = [
+    'tasks.backends.EmailBackend',
+    'django.contrib.auth.backends.ModelBackend',
+]
+
 # REST Framework settings
 REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
@@ -145,4 +152,5 @@ REST_FRAMEWORK = {
 }
 
 # Static files storage
-STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
+# Minified, content-hashed and precompressed; see tasks/storage.py
+STATICFILES_STORAGE = 'tasks.storage.MinifiedStaticFilesStorage'
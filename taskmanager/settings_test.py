@@ -0,0 +1,23 @@
+"""
+Test settings: run the suite against a local SQLite database
+"""
+
+from .settings import *
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / 'test_db.sqlite3',
+    }
+}
+
+# Hashing passwords at full strength dominates test run time
+PASSWORD_HASHERS = [
+    'django.contrib.auth.hashers.MD5PasswordHasher',
+]
+
+# The manifest storage needs collectstatic output, which tests don't produce
+STATICFILES_STORAGE = 'django.contrib.staticfiles.storage.StaticFilesStorage'
+
+# Process photo uploads inline so tests can check the result
+PROFILE_PHOTO_WORKERS = 0
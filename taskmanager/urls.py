@@ -18,6 +18,7 @@ from django.contrib import admin
 from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
+from tasks.metrics import metrics_view
 from tasks.views import task_list, login_view, signup_view, logout_view
 
 urlpatterns = [
@@ -27,6 +28,7 @@ urlpatterns = [
     path('login/', login_view, name='login'),
     path('signup/', signup_view, name='signup'),
     path('logout/', logout_view, name='logout'),
+    path('metrics', metrics_view, name='metrics'),
 ]
 
 # Serve media files during development
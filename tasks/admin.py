@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Task, UserProfile, QuickAction
+from .models import Task, TaskTombstone, UserProfile, QuickAction
 
 # Register your models here.
 
@@ -24,3 +24,9 @@ class QuickActionAdmin(admin.ModelAdmin):
     search_fields = ('user__username', 'label')
     readonly_fields = ('created_at',)
     ordering = ('user', 'order')
+
+@admin.register(TaskTombstone)
+class TaskTombstoneAdmin(admin.ModelAdmin):
+    list_display = ('user', 'task_id', 'deleted_at')
+    search_fields = ('user__username',)
+    readonly_fields = ('deleted_at',)
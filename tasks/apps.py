@@ -6,4 +6,5 @@ class TasksConfig(AppConfig):
     name = 'tasks'
     
     def ready(self):
+        import tasks.instrumentation
         import tasks.signals
@@ -0,0 +1,127 @@
+"""Async versions of the read-heavy API endpoints.
+
+DRF 3.14 views are synchronous, so these are plain Django async views that
+use the async ORM and cache APIs and render with the same serializers,
+paginator, renderer and ETags as their TaskViewSet / UserProfileViewSet /
+QuickActionViewSet counterparts. Under an ASGI server (SERVER_MODE=asgi in
+start.sh) a request waiting on them doesn't hold a worker thread.
+
+task_events is the Server-Sent Events stream, which only makes sense there.
+"""
+from functools import wraps
+
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponse, StreamingHttpResponse
+from rest_framework.exceptions import ValidationError
+from rest_framework.request import Request
+
+from .cache import PROFILE, QUICK_ACTIONS, TASKS
+from .etags import async_versioned_etag
+from .events import format_event, get_broker
+from .instrumentation import TimedJSONRenderer
+from .metrics import EVENT_STREAMS
+from .models import QuickAction, Task
+from .pagination import TaskCursorPagination
+from .representation import task_representations, task_values
+from .serializers import QuickActionSerializer, UserProfileSerializer, requested_task_fields
+from .stats import aget_dashboard_stats, parse_breakdowns
+
+_renderer = TimedJSONRenderer()
+
+# Seconds of silence after which a stream sends a comment line, so proxies
+# and load balancers don't close it as idle
+HEARTBEAT_SECONDS = 25
+# How long EventSource waits before reconnecting a dropped stream
+RETRY_MS = 5000
+
+
+def render_json(data, status=200):
+    return HttpResponse(_renderer.render(data), content_type=_renderer.media_type, status=status)
+
+
+def async_api_view(view_func):
+    """Allow GET from logged-in users only, answering like DRF's IsAuthenticated"""
+    @wraps(view_func)
+    async def wrapper(request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD'):
+            response = render_json({'detail': f'Method "{request.method}" not allowed.'}, status=405)
+            response['Allow'] = 'GET, HEAD'
+            return response
+        user = await request.auser()
+        if not user.is_authenticated:
+            return render_json({'detail': 'Authentication credentials were not provided.'}, status=403)
+        request.user = user
+        return await view_func(request, *args, **kwargs)
+    return wrapper
+
+
+@async_api_view
+@async_versioned_etag(TASKS)
+async def task_list(request):
+    """Cursor-paginated task list, as GET /api/tasks/"""
+    try:
+        fields = requested_task_fields(request.GET.get('fields'))
+    except ValidationError as exc:
+        return render_json(exc.detail, status=400)
+    queryset = task_values(Task.objects.filter(user=request.user), fields)
+
+    paginator = TaskCursorPagination()
+    page = await paginator.apaginate_queryset(queryset, Request(request))
+    return render_json(paginator.get_paginated_response(task_representations(page, fields)).data)
+
+
+@async_api_view
+@async_versioned_etag(TASKS, daily=True)
+async def dashboard_stats(request):
+    """Dashboard statistics, as GET /api/tasks/dashboard_stats/"""
+    try:
+        breakdowns = parse_breakdowns(request.GET.get('breakdown'))
+    except ValueError as exc:
+        return render_json({'error': str(exc)}, status=400)
+    return render_json(await aget_dashboard_stats(request.user, breakdowns))
+
+
+@async_api_view
+@async_versioned_etag(PROFILE)
+async def profile_me(request):
+    """The current user's profile, as GET /api/profile/me/"""
+    profile = await request.aprofile()
+    return render_json(UserProfileSerializer(profile, context={'request': request}).data)
+
+
+@async_api_view
+@async_versioned_etag(QUICK_ACTIONS)
+async def quick_action_list(request):
+    """Active quick actions, as GET /api/quick-actions/"""
+    actions = [action async for action in QuickAction.objects.filter(user=request.user, is_active=True)]
+    return render_json(QuickActionSerializer(actions, many=True).data)
+
+
+async def _event_stream(user_id):
+    async with get_broker().subscribe(user_id) as subscription:
+        EVENT_STREAMS.inc()
+        try:
+            yield f'retry: {RETRY_MS}\n\n'
+            while True:
+                message = await subscription.get(HEARTBEAT_SECONDS)
+                yield ': keepalive\n\n' if message is None else format_event(message)
+        finally:
+            EVENT_STREAMS.dec()
+
+
+@async_api_view
+async def task_events(request):
+    """Server-Sent Events stream of the user's task changes.
+
+    Sends task.saved, task.deleted, tasks.sync and stats.changed events as
+    they are committed. An open stream is a coroutine waiting on a queue, so
+    a worker can hold thousands of them under ASGI.
+    """
+    if not isinstance(request, ASGIRequest):
+        # Under WSGI each open stream would hold a worker thread for good.
+        # 204 tells EventSource not to reconnect; the page keeps polling.
+        return HttpResponse(status=204)
+    response = StreamingHttpResponse(_event_stream(request.user.pk), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
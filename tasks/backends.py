@@ -0,0 +1,59 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.db.models import CharField, Func
+
+
+class NormalizedEmail(Func):
+    """NULLIF(LOWER(email), ''), the expression auth_user's unique email index is built on.
+
+    The empty string is written into the SQL rather than passed as a
+    parameter because databases only use an expression index when the query
+    spells out the same expression. Blank emails become NULL, so they are
+    neither unique nor found.
+    """
+    template = "NULLIF(LOWER(%(expressions)s), '')"
+    output_field = CharField()
+
+
+def normalize_email(email):
+    return (email or '').strip().lower()
+
+
+def users_with_email(email):
+    """Users whose email matches case-insensitively, found through the email index"""
+    UserModel = get_user_model()
+    return UserModel._default_manager.alias(email_key=NormalizedEmail('email')).filter(
+        email_key=normalize_email(email),
+    )
+
+
+class EmailBackend(ModelBackend):
+    """Authenticate with an email address and password.
+
+    Called as authenticate(request, email=..., password=...). Username
+    logins (the admin) are left to ModelBackend. Users of sessions started
+    through this backend are loaded together with their profile.
+    """
+
+    def authenticate(self, request, email=None, password=None, **kwargs):
+        if not email or password is None:
+            return None
+        UserModel = get_user_model()
+        try:
+            user = users_with_email(email).get()
+        except UserModel.DoesNotExist:
+            # Hash anyway so a missing account takes as long as a wrong password
+            UserModel().set_password(password)
+            return None
+        if user.check_password(password) and self.user_can_authenticate(user):
+            return user
+        return None
+
+    def get_user(self, user_id):
+        # The session's user, with the profile joined in so request.profile is free
+        UserModel = get_user_model()
+        try:
+            user = UserModel._default_manager.select_related('profile').get(pk=user_id)
+        except UserModel.DoesNotExist:
+            return None
+        return user if self.user_can_authenticate(user) else None
@@ -0,0 +1,47 @@
+"""Data embedded in the task page, so it renders without waiting on the API.
+
+The page used to load empty and then call /api/tasks/, dashboard_stats,
+profile/me and quick-actions. task_page_data() builds the same payloads on
+the server: the first page of tasks and the quick actions take one query
+each, the stats come from their cache (or one aggregate query) and the
+profile was already loaded with the user. The client only calls the APIs
+for what changes afterwards.
+"""
+import copy
+
+from django.http import QueryDict
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.request import Request
+
+from .models import QuickAction, Task
+from .pagination import TaskCursorPagination
+from .representation import task_representations, task_values
+from .serializers import QuickActionSerializer, UserProfileSerializer
+from .stats import get_dashboard_stats
+from .sync import make_sync_token
+
+
+def task_page_data(request):
+    """The responses of the page's first API calls, keyed by what they hold"""
+    user = request.user
+    # Taken before the tasks are read, like a client calling /changes/ first
+    sync_token = make_sync_token(timezone.now())
+
+    # Paginate as a bare GET /api/tasks/: the page's own query string must not
+    # pick the cursor or the page size
+    page_request = copy.copy(request)
+    page_request.GET = QueryDict()
+    paginator = TaskCursorPagination()
+    page = paginator.paginate_queryset(task_values(Task.objects.filter(user=user)), Request(page_request))
+    # Links must point at the API rather than at this page
+    paginator.base_url = request.build_absolute_uri(reverse('task-list'))
+    tasks = paginator.get_paginated_response(task_representations(page)).data
+
+    return {
+        'tasks': tasks,
+        'sync_token': sync_token,
+        'stats': get_dashboard_stats(user),
+        'profile': UserProfileSerializer(request.profile, context={'request': request}).data,
+        'quick_actions': QuickActionSerializer(QuickAction.objects.filter(user=user, is_active=True), many=True).data,
+    }
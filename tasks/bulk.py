@@ -0,0 +1,155 @@
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import Task
+from .serializers import TaskSerializer
+from .signals import batched_task_changes, tasks_changed
+
+BULK_OPERATIONS = ('create', 'update', 'delete', 'status')
+MAX_BULK_OPERATIONS = 1000
+
+STATUS_VALUES = [value for value, _label in Task.STATUS_CHOICES]
+
+
+class BulkTaskOperations:
+    """Validate and apply a list of task operations as one all-or-nothing batch.
+
+    Each operation is a dict with an ``op`` of create, update, delete or
+    status. Validation touches the database once to load every referenced
+    task. Writes are grouped by kind: one bulk_create, one bulk_update, one
+    DELETE and one UPDATE per target status, all inside a single transaction.
+    """
+
+    def __init__(self, user, operations, context=None):
+        self.user = user
+        self.operations = operations
+        self.context = context or {}
+        self.errors = {}
+
+    def _error(self, index, errors):
+        self.errors[index] = errors
+
+    def _task_id(self, index, operation, seen_ids):
+        task_id = operation.get('id')
+        if isinstance(task_id, bool) or not isinstance(task_id, int):
+            self._error(index, {'id': ['A valid integer task id is required.']})
+            return None
+        if task_id in seen_ids:
+            self._error(index, {'id': ['Each task may only appear in one operation.']})
+            return None
+        seen_ids.add(task_id)
+        return task_id
+
+    def is_valid(self):
+        if not isinstance(self.operations, list) or not self.operations:
+            self.errors['operations'] = ['Expected a non-empty list of operations.']
+            return False
+        if len(self.operations) > MAX_BULK_OPERATIONS:
+            self.errors['operations'] = [f'At most {MAX_BULK_OPERATIONS} operations are allowed per request.']
+            return False
+
+        self.creates, self.updates, self.deletes, self.status_changes = [], [], [], []
+        seen_ids = set()
+        for index, operation in enumerate(self.operations):
+            op = operation.get('op') if isinstance(operation, dict) else None
+            if op not in BULK_OPERATIONS:
+                self._error(index, {'op': [f"Expected one of: {', '.join(BULK_OPERATIONS)}."]})
+            elif op == 'create':
+                self.creates.append((index, operation.get('data') or {}))
+            else:
+                task_id = self._task_id(index, operation, seen_ids)
+                if task_id is None:
+                    continue
+                if op == 'update':
+                    self.updates.append((index, task_id, operation.get('data') or {}))
+                elif op == 'delete':
+                    self.deletes.append((index, task_id))
+                elif operation.get('status') not in STATUS_VALUES:
+                    self._error(index, {'status': [f"Expected one of: {', '.join(STATUS_VALUES)}."]})
+                else:
+                    self.status_changes.append((index, task_id, operation['status']))
+
+        if self.creates:
+            serializer = TaskSerializer(data=[data for _index, data in self.creates], many=True, context=self.context)
+            if serializer.is_valid():
+                self.create_data = serializer.validated_data
+            else:
+                for (index, _data), errors in zip(self.creates, serializer.errors):
+                    if errors:
+                        self._error(index, errors)
+
+        task_ids = [item[1] for item in self.updates + self.deletes + self.status_changes]
+        self.tasks = Task.objects.filter(user=self.user).in_bulk(task_ids) if task_ids else {}
+        for index, task_id, *_rest in self.updates + self.deletes + self.status_changes:
+            if task_id not in self.tasks:
+                self._error(index, {'id': ['Task not found.']})
+
+        self.update_data = []
+        for index, task_id, data in self.updates:
+            task = self.tasks.get(task_id)
+            if task is None:
+                continue
+            serializer = TaskSerializer(task, data=data, partial=True, context=self.context)
+            if serializer.is_valid():
+                self.update_data.append((index, task, serializer.validated_data))
+            else:
+                self._error(index, serializer.errors)
+
+        return not self.errors
+
+    @property
+    def error_response(self):
+        """Errors keyed the way the bulk endpoint reports them"""
+        if 'operations' in self.errors:
+            return {'operations': self.errors['operations']}
+        return {'results': [
+            {'index': index, 'status': 'error', 'errors': errors}
+            for index, errors in sorted(self.errors.items())
+        ]}
+
+    def save(self):
+        """Apply the validated operations and return one result per operation, in order"""
+        results = {}
+        now = timezone.now()
+        with transaction.atomic(), batched_task_changes():
+            if self.creates:
+                new_tasks = [Task(user=self.user, **data) for data in self.create_data]
+                if connection.features.can_return_rows_from_bulk_insert:
+                    Task.objects.bulk_create(new_tasks)
+                else:
+                    # MySQL can't report the ids of a multi-row INSERT, and
+                    # every created task is returned with its id
+                    for task in new_tasks:
+                        task.save()
+                for (index, _data), task in zip(self.creates, new_tasks):
+                    results[index] = {'index': index, 'status': 'created', 'task': TaskSerializer(task, context=self.context).data}
+
+            if self.update_data:
+                changed_fields = {'updated_at'}
+                for _index, task, data in self.update_data:
+                    for field, value in data.items():
+                        setattr(task, field, value)
+                    changed_fields.update(data)
+                    # bulk_update doesn't apply auto_now
+                    task.updated_at = now
+                Task.objects.bulk_update([task for _index, task, _data in self.update_data], sorted(changed_fields))
+                for index, task, _data in self.update_data:
+                    results[index] = {'index': index, 'status': 'updated', 'task': TaskSerializer(task, context=self.context).data}
+
+            if self.deletes:
+                Task.objects.filter(user=self.user, id__in=[task_id for _index, task_id in self.deletes]).delete()
+                for index, task_id in self.deletes:
+                    results[index] = {'index': index, 'status': 'deleted', 'id': task_id}
+
+            if self.status_changes:
+                ids_by_status = {}
+                for index, task_id, new_status in self.status_changes:
+                    ids_by_status.setdefault(new_status, []).append(task_id)
+                    results[index] = {'index': index, 'status': 'updated', 'id': task_id, 'task_status': new_status}
+                for new_status, task_ids in ids_by_status.items():
+                    Task.objects.filter(user=self.user, id__in=task_ids).update(status=new_status, updated_at=now)
+
+            # bulk_create, bulk_update and update() send no model signals
+            tasks_changed(self.user.id)
+
+        return [results[index] for index in range(len(self.operations))]
@@ -0,0 +1,56 @@
+import time
+from datetime import datetime, timedelta
+from datetime import time as dt_time
+
+from django.core.cache import cache
+from django.utils import timezone
+
+# Version counter scopes; each one is bumped when that kind of user data changes
+TASKS = 'tasks'
+PROFILE = 'profile'
+QUICK_ACTIONS = 'quick_actions'
+
+
+def _version_key(scope, user_id):
+    return f'taskflow:{scope}:version:{user_id}'
+
+
+def _seed():
+    # Counters start from the clock so one lost to eviction never repeats a value
+    return int(time.time() * 1000)
+
+
+def get_version(scope, user_id):
+    """Return the current version counter for a user's data in the given scope"""
+    key = _version_key(scope, user_id)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, _seed(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+async def aget_version(scope, user_id):
+    """Async variant of get_version()"""
+    key = _version_key(scope, user_id)
+    version = await cache.aget(key)
+    if version is None:
+        await cache.aadd(key, _seed(), timeout=None)
+        version = await cache.aget(key)
+    return version
+
+
+def bump_version(scope, user_id):
+    """Advance a user's version counter so entries keyed on the old one go stale"""
+    key = _version_key(scope, user_id)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, _seed(), timeout=None)
+
+
+def seconds_until_midnight():
+    """Seconds left in the current day, used as TTL for date-dependent entries"""
+    now = timezone.localtime()
+    midnight = timezone.make_aware(datetime.combine(now.date() + timedelta(days=1), dt_time.min))
+    return max(1, int((midnight - now).total_seconds()))
@@ -0,0 +1,168 @@
+"""Per-user event stream behind /api/events/.
+
+Signal handlers publish small JSON messages once their transaction commits;
+the SSE view subscribes to the current user's messages. The broker is chosen
+by the TASK_EVENTS setting, in the style of CACHES:
+
+    TASK_EVENTS = {'BROKER': 'tasks.events.RedisBroker', 'OPTIONS': {'url': REDIS_URL}}
+
+InProcessBroker only reaches subscribers in the publishing process, so any
+deployment with more than one worker process needs RedisBroker.
+"""
+import asyncio
+import json
+import logging
+import threading
+from collections import defaultdict
+from contextlib import asynccontextmanager
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+# Messages queued for one slow connection before it is told to resync instead
+SUBSCRIPTION_BUFFER = 100
+
+RESYNC = {'event': 'tasks.sync', 'data': {}}
+
+
+class Subscription:
+    """A bounded queue of messages for one open stream, fed from any thread"""
+
+    def __init__(self, loop):
+        self.loop = loop
+        self.queue = asyncio.Queue(SUBSCRIPTION_BUFFER)
+
+    def put(self, message):
+        self.loop.call_soon_threadsafe(self._put, message)
+
+    def _put(self, message):
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            # Replace the backlog of a stream that can't keep up with a single
+            # resync; the client catches up through /api/tasks/changes/
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(RESYNC)
+
+    async def get(self, timeout):
+        """Return the next message, or None if nothing arrived within `timeout` seconds"""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class InProcessBroker:
+    """Deliver messages to the subscribers in this process"""
+
+    def __init__(self, **options):
+        self._subscribers = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def publish(self, user_id, message):
+        self._deliver(user_id, message)
+
+    def _deliver(self, user_id, message):
+        with self._lock:
+            subscriptions = list(self._subscribers.get(user_id, ()))
+        for subscription in subscriptions:
+            subscription.put(message)
+
+    @asynccontextmanager
+    async def subscribe(self, user_id):
+        subscription = Subscription(asyncio.get_running_loop())
+        with self._lock:
+            self._subscribers[user_id].add(subscription)
+        try:
+            yield subscription
+        finally:
+            with self._lock:
+                self._subscribers[user_id].discard(subscription)
+                if not self._subscribers[user_id]:
+                    del self._subscribers[user_id]
+
+
+class RedisBroker(InProcessBroker):
+    """Fan messages out across processes through Redis pub/sub.
+
+    Each process holds a single pattern subscription and hands incoming
+    messages to its local subscribers, so open streams cost no Redis
+    connections of their own.
+    """
+    CHANNEL_PREFIX = 'taskflow:events:'
+
+    def __init__(self, url, **options):
+        import redis
+
+        super().__init__(**options)
+        self.url = url
+        self._client = redis.Redis.from_url(url)
+        self._listener = None
+
+    def publish(self, user_id, message):
+        import redis
+
+        try:
+            self._client.publish(f'{self.CHANNEL_PREFIX}{user_id}', json.dumps(message))
+        except redis.RedisError:
+            logger.warning('Could not publish task event for user %s', user_id, exc_info=True)
+
+    @asynccontextmanager
+    async def subscribe(self, user_id):
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(self._listen())
+        async with super().subscribe(user_id) as subscription:
+            yield subscription
+
+    async def _listen(self):
+        import redis
+        import redis.asyncio
+
+        while True:
+            client = redis.asyncio.Redis.from_url(self.url)
+            try:
+                async with client.pubsub() as pubsub:
+                    await pubsub.psubscribe(f'{self.CHANNEL_PREFIX}*')
+                    async for item in pubsub.listen():
+                        if item['type'] != 'pmessage':
+                            continue
+                        user_id = int(item['channel'][len(self.CHANNEL_PREFIX):])
+                        self._deliver(user_id, json.loads(item['data']))
+            except redis.RedisError:
+                logger.warning('Lost the task event subscription; reconnecting', exc_info=True)
+                # Streams may have missed messages while disconnected
+                with self._lock:
+                    user_ids = list(self._subscribers)
+                for user_id in user_ids:
+                    self._deliver(user_id, RESYNC)
+                await asyncio.sleep(1)
+            finally:
+                await client.aclose()
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                config = getattr(settings, 'TASK_EVENTS', {})
+                broker_class = import_string(config.get('BROKER', 'tasks.events.InProcessBroker'))
+                _broker = broker_class(**config.get('OPTIONS', {}))
+    return _broker
+
+
+def publish(user_id, event, data=None):
+    """Send an event to every open stream of the user"""
+    get_broker().publish(user_id, {'event': event, 'data': data or {}})
+
+
+def format_event(message):
+    """Encode a message as a Server-Sent Events frame"""
+    return f"event: {message['event']}\ndata: {json.dumps(message['data'], separators=(',', ':'))}\n\n"
@@ -0,0 +1,128 @@
+"""Streaming task export, shared by GET /api/tasks/export/ and `manage.py export_tasks`.
+
+Rows are read in primary-key order in batches of EXPORT_CHUNK_SIZE, each
+batch being a separate `id > last_id` query. Unlike queryset.iterator(),
+this keeps memory bounded on MySQL too, whose driver buffers the whole
+result of a query on the client.
+
+Under ASGI, StreamingHttpResponse reads a sync iterator into a list before
+sending anything, so the API streams aexport_tasks() there instead. It
+fetches each batch with sync_to_async and yields its rows as they are
+encoded.
+"""
+import csv
+import datetime
+import json
+
+from asgiref.sync import sync_to_async
+
+EXPORT_FIELDS = ['id', 'title', 'description', 'status', 'priority', 'category', 'due_date', 'created_at', 'updated_at']
+EXPORT_CHUNK_SIZE = 5000
+# Rows encoded into each chunk of the response
+ROWS_PER_WRITE = 500
+
+
+def _task_rows(queryset):
+    return queryset.order_by('id').values_list(*EXPORT_FIELDS)
+
+
+def _fetch_batch(rows, last_id, chunk_size):
+    return list((rows if last_id is None else rows.filter(id__gt=last_id))[:chunk_size])
+
+
+def iter_task_batches(queryset, chunk_size=EXPORT_CHUNK_SIZE):
+    """Yield lists of EXPORT_FIELDS value tuples for every task in the queryset, by id.
+
+    The last list is shorter than chunk_size, and may be empty.
+    """
+    rows = _task_rows(queryset)
+    last_id = None
+    while True:
+        batch = _fetch_batch(rows, last_id, chunk_size)
+        yield batch
+        if len(batch) < chunk_size:
+            return
+        last_id = batch[-1][0]
+
+
+async def aiter_task_batches(queryset, chunk_size=EXPORT_CHUNK_SIZE):
+    """iter_task_batches() for async code, running each query in a thread"""
+    rows = _task_rows(queryset)
+    last_id = None
+    while True:
+        batch = await sync_to_async(_fetch_batch)(rows, last_id, chunk_size)
+        yield batch
+        if len(batch) < chunk_size:
+            return
+        last_id = batch[-1][0]
+
+
+def iter_task_rows(queryset, chunk_size=EXPORT_CHUNK_SIZE):
+    """Yield value tuples of EXPORT_FIELDS for every task in the queryset, by id"""
+    for batch in iter_task_batches(queryset, chunk_size):
+        yield from batch
+
+
+def _format_value(value):
+    # Same representation as the API's serializers
+    if isinstance(value, datetime.datetime):
+        value = value.isoformat()
+        return value[:-6] + 'Z' if value.endswith('+00:00') else value
+    if isinstance(value, datetime.date):
+        return value.isoformat()
+    return value
+
+
+class _Echo:
+    """File-like object whose write() returns what it was given, for csv.writer"""
+
+    def write(self, value):
+        return value
+
+
+def _csv_lines(rows, header=True):
+    writer = csv.writer(_Echo())
+    if header:
+        yield writer.writerow(EXPORT_FIELDS)
+    for row in rows:
+        yield writer.writerow(['' if value is None else _format_value(value) for value in row])
+
+
+def _ndjson_lines(rows, header=True):
+    # NDJSON has no header line
+    for row in rows:
+        yield json.dumps(dict(zip(EXPORT_FIELDS, map(_format_value, row))), separators=(',', ':')) + '\n'
+
+
+EXPORT_FORMATS = {
+    'csv': ('text/csv', _csv_lines),
+    'ndjson': ('application/x-ndjson', _ndjson_lines),
+}
+
+
+def _writes(lines):
+    """Join lines into text chunks of ROWS_PER_WRITE rows"""
+    buffer = []
+    for line in lines:
+        buffer.append(line)
+        if len(buffer) >= ROWS_PER_WRITE:
+            yield ''.join(buffer)
+            buffer.clear()
+    if buffer:
+        yield ''.join(buffer)
+
+
+def export_tasks(queryset, export_format, chunk_size=EXPORT_CHUNK_SIZE):
+    """Yield the export of a task queryset as text chunks of ROWS_PER_WRITE rows"""
+    _, encode = EXPORT_FORMATS[export_format]
+    yield from _writes(encode(iter_task_rows(queryset, chunk_size)))
+
+
+async def aexport_tasks(queryset, export_format, chunk_size=EXPORT_CHUNK_SIZE):
+    """export_tasks() as an async iterator, holding one batch of rows at a time"""
+    _, encode = EXPORT_FORMATS[export_format]
+    header = True
+    async for batch in aiter_task_batches(queryset, chunk_size):
+        for chunk in _writes(encode(batch, header)):
+            yield chunk
+        header = False
@@ -0,0 +1,27 @@
+from datetime import timedelta
+
+from django.utils import timezone
+
+
+def apply_task_filter(queryset, filter_type, filter_value):
+    """Narrow a task queryset using the filter_type/filter_value vocabulary of filter_tasks"""
+    if filter_type == 'due_date':
+        today = timezone.now().date()
+        if filter_value == 'today':
+            queryset = queryset.filter(due_date=today)
+        elif filter_value == 'overdue':
+            queryset = queryset.filter(due_date__lt=today, status__in=['pending', 'in_progress'])
+        elif filter_value == 'this_week':
+            week_end = today + timedelta(days=7)
+            queryset = queryset.filter(due_date__range=[today, week_end])
+
+    elif filter_type == 'priority':
+        queryset = queryset.filter(priority=filter_value)
+
+    elif filter_type == 'status':
+        queryset = queryset.filter(status=filter_value)
+
+    elif filter_type == 'category':
+        queryset = queryset.filter(category=filter_value)
+
+    return queryset
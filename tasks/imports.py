@@ -0,0 +1,126 @@
+"""Streaming task import, shared by POST /api/tasks/import/ and `manage.py import_tasks`.
+
+Input is read a line at a time and validated against TaskSerializer rules
+in chunks of IMPORT_CHUNK_SIZE rows. The valid rows of each chunk are
+inserted with one bulk_create in a transaction of their own, so memory and
+lock time stay bounded however large the file is. Invalid rows are skipped
+and reported by line number. Chunks are committed as they go, so an import
+that stops half way keeps the rows before it.
+"""
+import codecs
+import csv
+import json
+from itertools import islice
+
+from django.db import transaction
+from rest_framework.exceptions import ValidationError
+
+from .models import Task
+from .serializers import TaskSerializer
+from .signals import tasks_changed
+
+IMPORT_CHUNK_SIZE = 1000
+# Row errors listed in the result; further failures are only counted
+MAX_REPORTED_ERRORS = 100
+READ_SIZE = 64 * 1024
+
+
+class TaskImportError(ValueError):
+    """The input can't be read any further, e.g. it isn't UTF-8"""
+
+    def __init__(self, message, result):
+        super().__init__(message)
+        self.result = result
+
+
+class ImportResult:
+    def __init__(self):
+        self.created = 0
+        self.failed = 0
+        self.errors = []
+
+    def add_error(self, line, errors):
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({'line': line, 'errors': errors})
+
+    def as_dict(self):
+        return {
+            'created': self.created,
+            'failed': self.failed,
+            'errors': self.errors,
+            'errors_truncated': self.failed > len(self.errors),
+        }
+
+
+def iter_lines(stream, encoding='utf-8-sig'):
+    """Decode a binary stream into lines, keeping their line endings"""
+    decoder = codecs.getincrementaldecoder(encoding)()
+    pending = ''
+    for block in iter(lambda: stream.read(READ_SIZE), b''):
+        # The last piece may be an incomplete line, or the \r of a \r\n
+        *lines, pending = (pending + decoder.decode(block)).split('\n')
+        for line in lines:
+            yield line + '\n'
+    pending += decoder.decode(b'', final=True)
+    if pending:
+        yield pending
+
+
+def _csv_rows(lines):
+    reader = csv.DictReader(lines)
+    for row in reader:
+        # Empty cells take the field's default, as if the column were missing
+        yield reader.line_num, {key: value for key, value in row.items() if key is not None and value}, None
+
+
+def _ndjson_rows(lines):
+    for line_number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            yield line_number, json.loads(line), None
+        except ValueError:
+            yield line_number, None, {'non_field_errors': ['Invalid JSON.']}
+
+
+IMPORT_FORMATS = {
+    'csv': ('text/csv', _csv_rows),
+    'ndjson': ('application/x-ndjson', _ndjson_rows),
+}
+
+
+def _import_chunk(user, rows, serializer, result):
+    new_tasks = []
+    for line, data, errors in rows:
+        if errors is None:
+            try:
+                new_tasks.append(Task(user=user, **serializer.run_validation(data)))
+                continue
+            except ValidationError as exc:
+                errors = exc.detail
+        result.add_error(line, errors)
+
+    if new_tasks:
+        with transaction.atomic():
+            Task.objects.bulk_create(new_tasks)
+        result.created += len(new_tasks)
+
+
+def import_tasks(user, lines, import_format, chunk_size=IMPORT_CHUNK_SIZE, context=None):
+    """Create tasks for a user from lines of CSV or NDJSON and return an ImportResult"""
+    _, parse = IMPORT_FORMATS[import_format]
+    rows = parse(lines)
+    # One serializer validates every row, so its fields are only built once
+    serializer = TaskSerializer(context=context or {})
+    result = ImportResult()
+    try:
+        while chunk := list(islice(rows, chunk_size)):
+            _import_chunk(user, chunk, serializer, result)
+    except (UnicodeDecodeError, csv.Error) as exc:
+        raise TaskImportError(f'Import stopped after {result.created} tasks: {exc}', result) from exc
+    finally:
+        if result.created:
+            # bulk_create sends no model signals
+            tasks_changed(user.id)
+    return result
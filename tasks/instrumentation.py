@@ -0,0 +1,153 @@
+import heapq
+import json
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+from django.template.backends.django import DjangoTemplates
+
+from .renderers import FastJSONRenderer
+
+# Metrics of the request being handled, set by ServerTimingMiddleware
+_current = ContextVar('taskflow_request_metrics', default=None)
+
+TOP_QUERIES = 5
+
+
+class RequestMetrics:
+    """Time spent per phase of a request, plus the database work it did"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases = {}
+        self.active = set()
+        self.query_count = 0
+        self.db_time = 0.0
+        self.slowest = []  # min-heap of (seconds, order, sql)
+
+    def add_query(self, sql, elapsed):
+        self.query_count += 1
+        self.db_time += elapsed
+        entry = (elapsed, self.query_count, sql)
+        if len(self.slowest) < TOP_QUERIES:
+            heapq.heappush(self.slowest, entry)
+        else:
+            heapq.heappushpop(self.slowest, entry)
+
+    def top_queries(self):
+        return [{'ms': round(elapsed * 1000, 2), 'sql': sql[:500]}
+                for elapsed, _, sql in sorted(self.slowest, reverse=True)]
+
+
+def current_metrics():
+    return _current.get()
+
+
+@contextmanager
+def collect_metrics():
+    metrics = RequestMetrics()
+    token = _current.set(metrics)
+    try:
+        yield metrics
+    finally:
+        _current.reset(token)
+
+
+def record_query(execute, sql, params, many, context):
+    """Execute wrapper that charges each query to the current request, if any"""
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.add_query(sql, time.perf_counter() - start)
+
+
+@receiver(connection_created)
+def install_query_recorder(sender, connection, **kwargs):
+    # Installed once per connection rather than per request, so queries the
+    # async ORM runs in its worker thread are counted too; execute_wrappers
+    # survives reconnects, hence the check
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, record_query)
+
+
+@contextmanager
+def timed(phase):
+    """Add the time spent in the block to `phase` of the current request.
+
+    Nested blocks for the same phase (a serializer inside a serializer) are
+    only counted once.
+    """
+    metrics = _current.get()
+    if metrics is None or phase in metrics.active:
+        yield
+        return
+    metrics.active.add(phase)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.phases[phase] = metrics.phases.get(phase, 0.0) + time.perf_counter() - start
+        metrics.active.discard(phase)
+
+
+class TimedSerializerMixin:
+    """Count a serializer's to_representation() as serialization time"""
+
+    def to_representation(self, instance):
+        with timed('serialize'):
+            return super().to_representation(instance)
+
+
+class TimedJSONRenderer(FastJSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        with timed('render'):
+            return super().render(data, accepted_media_type, renderer_context)
+
+
+class TimedTemplate:
+    def __init__(self, template):
+        self.template = template
+
+    def __getattr__(self, name):
+        return getattr(self.template, name)
+
+    def render(self, context=None, request=None):
+        with timed('template'):
+            return self.template.render(context, request)
+
+
+class TimedDjangoTemplates(DjangoTemplates):
+    """Django template backend that reports rendering time to Server-Timing"""
+
+    def from_string(self, template_code):
+        return TimedTemplate(super().from_string(template_code))
+
+    def get_template(self, template_name):
+        return TimedTemplate(super().get_template(template_name))
+
+
+# Attributes every LogRecord has; anything else was passed through `extra`
+_RECORD_ATTRS = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per line, including any `extra` fields"""
+
+    def format(self, record):
+        payload = {
+            'time': self.formatTime(record),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        payload.update((key, value) for key, value in vars(record).items() if key not in _RECORD_ATTRS)
+        if record.exc_info:
+            payload['exc_info'] = self.formatException(record.exc_info)
+        return json.dumps(payload, default=str)
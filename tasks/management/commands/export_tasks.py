@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from tasks.backends import users_with_email
+from tasks.export import EXPORT_CHUNK_SIZE, EXPORT_FORMATS, export_tasks
+from tasks.filters import apply_task_filter
+from tasks.models import Task
+
+
+class Command(BaseCommand):
+    help = "Stream a user's tasks as CSV or NDJSON to stdout or a file"
+
+    def add_arguments(self, parser):
+        parser.add_argument('email', help='email of the account to export')
+        parser.add_argument('--format', dest='export_format', choices=list(EXPORT_FORMATS), default='csv')
+        parser.add_argument('--filter-type', help='filter_tasks filter type: due_date, priority, status or category')
+        parser.add_argument('--filter-value', help='value for --filter-type, e.g. overdue or high')
+        parser.add_argument('--output', help='file to write instead of stdout')
+        parser.add_argument('--chunk-size', type=int, default=EXPORT_CHUNK_SIZE, help='rows read per query')
+
+    def handle(self, *args, **options):
+        user = users_with_email(options['email']).first()
+        if user is None:
+            raise CommandError(f"No user with email {options['email']}")
+
+        queryset = apply_task_filter(Task.objects.filter(user=user), options['filter_type'], options['filter_value'])
+        chunks = export_tasks(queryset, options['export_format'], options['chunk_size'])
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8', newline='') as output:
+                output.writelines(chunks)
+            self.stderr.write(self.style.SUCCESS(f"Exported tasks of {user.email} to {options['output']}"))
+        else:
+            for chunk in chunks:
+                self.stdout.write(chunk, ending='')
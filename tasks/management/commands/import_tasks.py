@@ -0,0 +1,44 @@
+import sys
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from tasks.backends import users_with_email
+from tasks.imports import IMPORT_CHUNK_SIZE, IMPORT_FORMATS, TaskImportError, import_tasks
+
+
+class Command(BaseCommand):
+    help = "Create tasks for a user from a CSV or NDJSON file, such as one written by export_tasks"
+
+    def add_arguments(self, parser):
+        parser.add_argument('email', help='email of the account to import into')
+        parser.add_argument('file', help='file to read, or - for stdin')
+        parser.add_argument('--format', dest='import_format', choices=list(IMPORT_FORMATS),
+                            help='defaults to the file extension, else csv')
+        parser.add_argument('--chunk-size', type=int, default=IMPORT_CHUNK_SIZE, help='rows inserted per transaction')
+
+    def handle(self, *args, **options):
+        user = users_with_email(options['email']).first()
+        if user is None:
+            raise CommandError(f"No user with email {options['email']}")
+
+        path = options['file']
+        import_format = options['import_format'] or (Path(path).suffix[1:].lower() if path != '-' else '')
+        if import_format not in IMPORT_FORMATS:
+            import_format = 'csv'
+
+        try:
+            if path == '-':
+                result = import_tasks(user, sys.stdin, import_format, options['chunk_size'])
+            else:
+                with open(path, encoding='utf-8-sig', newline='') as lines:
+                    result = import_tasks(user, lines, import_format, options['chunk_size'])
+        except (OSError, TaskImportError) as exc:
+            raise CommandError(exc) from exc
+
+        for error in result.errors:
+            self.stderr.write(f"line {error['line']}: {error['errors']}")
+        if result.failed > len(result.errors):
+            self.stderr.write(f'... and {result.failed - len(result.errors)} more invalid rows')
+        style = self.style.SUCCESS if not result.failed else self.style.WARNING
+        self.stderr.write(style(f'Imported {result.created} tasks for {user.email}, skipped {result.failed} invalid rows'))
@@ -0,0 +1,169 @@
+import http.cookiejar
+import json
+import random
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+
+from tasks.models import QuickAction
+
+ENDPOINTS = {
+    'tasks': ('GET', '/api/tasks/'),
+    'dashboard_stats': ('GET', '/api/tasks/dashboard_stats/'),
+    'filter_tasks': ('GET', '/api/tasks/filter_tasks/?filter_type=priority&filter_value=high'),
+    'reorder': ('POST', '/api/quick-actions/reorder/'),
+}
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, int(round(pct / 100 * len(sorted_values))) - 1))
+    return sorted_values[rank]
+
+
+class TestClientSession:
+    """Drives the URL routes in-process through Django's test client."""
+
+    def __init__(self, user):
+        # 'localhost' passes ALLOWED_HOSTS in every settings module, 'testserver' does not
+        self.client = Client(raise_request_exception=False, HTTP_HOST='localhost')
+        self.client.force_login(user)
+
+    def request(self, method, path, payload=None):
+        if method == 'GET':
+            response = self.client.get(path)
+        else:
+            response = self.client.post(path, json.dumps(payload), content_type='application/json')
+        return response.status_code
+
+    def close(self):
+        connection.close()
+
+
+class HttpSession:
+    """Drives a running server over HTTP, logged in through the /login/ form."""
+
+    def __init__(self, base_url, email, password):
+        self.base_url = base_url.rstrip('/')
+        self.cookies = http.cookiejar.CookieJar()
+        self.opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(self.cookies))
+        self.opener.open(self.base_url + '/login/')
+        body = urllib.parse.urlencode({
+            'email': email, 'password': password, 'csrfmiddlewaretoken': self.csrf_token(),
+        }).encode()
+        request = urllib.request.Request(self.base_url + '/login/', data=body, headers={'Referer': self.base_url + '/login/'})
+        self.opener.open(request)
+        if not any(cookie.name == 'sessionid' for cookie in self.cookies):
+            raise CommandError(f'Could not log in as {email}')
+
+    def csrf_token(self):
+        return next((cookie.value for cookie in self.cookies if cookie.name == 'csrftoken'), '')
+
+    def request(self, method, path, payload=None):
+        headers = {'X-CSRFToken': self.csrf_token(), 'Referer': self.base_url + '/'}
+        data = None
+        if method != 'GET':
+            data = json.dumps(payload).encode()
+            headers['Content-Type'] = 'application/json'
+        request = urllib.request.Request(self.base_url + path, data=data, headers=headers, method=method)
+        try:
+            with self.opener.open(request) as response:
+                response.read()
+                return response.status
+        except urllib.error.HTTPError as exc:
+            return exc.code
+
+    def close(self):
+        pass
+
+
+class Command(BaseCommand):
+    help = 'Drive the task API concurrently and report throughput and latency percentiles per endpoint'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--endpoints', default=','.join(ENDPOINTS),
+                            help=f'Comma-separated endpoints to exercise ({", ".join(ENDPOINTS)})')
+        parser.add_argument('--requests', type=int, default=200, help='Requests per endpoint')
+        parser.add_argument('--concurrency', type=int, default=8, help='Concurrent workers')
+        parser.add_argument('--prefix', default='perf', help='Username prefix of the users created by seed_perf_data')
+        parser.add_argument('--users', type=int, default=10, help='How many of the seeded users to spread load over')
+        parser.add_argument('--base-url', help='Load a running server at this URL instead of using the test client')
+        parser.add_argument('--password', default='perf-password', help='Password of the seeded users (with --base-url)')
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        endpoints = [name.strip() for name in options['endpoints'].split(',') if name.strip()]
+        unknown = set(endpoints) - set(ENDPOINTS)
+        if unknown:
+            raise CommandError(f'Unknown endpoints: {", ".join(sorted(unknown))}')
+
+        users = list(User.objects.filter(username__startswith=f"{options['prefix']}_user_").order_by('id')[:options['users']])
+        if not users:
+            raise CommandError('No seeded users found; run `manage.py seed_perf_data` first')
+        reorder_payloads = {
+            user.id: [{'id': action_id, 'order': order}
+                      for order, action_id in enumerate(QuickAction.objects.filter(user=user).values_list('id', flat=True))]
+            for user in users
+        }
+
+        rng = random.Random(options['seed'])
+        local = threading.local()
+
+        def session_for(user):
+            sessions = getattr(local, 'sessions', None)
+            if sessions is None:
+                sessions = local.sessions = {}
+            if user.id not in sessions:
+                if options['base_url']:
+                    sessions[user.id] = HttpSession(options['base_url'], user.email, options['password'])
+                else:
+                    sessions[user.id] = TestClientSession(user)
+            return sessions[user.id]
+
+        def run_one(job):
+            name, user = job
+            method, path = ENDPOINTS[name]
+            payload = {'actions': list(reversed(reorder_payloads[user.id]))} if name == 'reorder' else None
+            session = session_for(user)
+            start = time.perf_counter()
+            status_code = session.request(method, path, payload)
+            return name, time.perf_counter() - start, status_code
+
+        jobs = [(name, rng.choice(users)) for name in endpoints for _ in range(options['requests'])]
+        rng.shuffle(jobs)
+
+        self.stdout.write(
+            f'{len(jobs)} requests over {len(users)} users, concurrency {options["concurrency"]}, '
+            f'{"HTTP " + options["base_url"] if options["base_url"] else "in-process test client"}'
+        )
+        timings = {name: [] for name in endpoints}
+        errors = {name: 0 for name in endpoints}
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options['concurrency']) as pool:
+            for name, elapsed, status_code in pool.map(run_one, jobs):
+                timings[name].append(elapsed)
+                if status_code >= 400:
+                    errors[name] += 1
+        wall = time.perf_counter() - started
+
+        self.stdout.write(f'\n{"endpoint":<18}{"reqs":>7}{"errors":>8}{"req/s":>10}{"p50 ms":>10}{"p95 ms":>10}{"p99 ms":>10}')
+        for name in endpoints:
+            values = sorted(timings[name])
+            busy = sum(values)
+            throughput = len(values) / busy * options['concurrency'] if busy else 0.0
+            self.stdout.write(
+                f'{name:<18}{len(values):>7}{errors[name]:>8}{throughput:>10.1f}'
+                f'{percentile(values, 50) * 1000:>10.1f}{percentile(values, 95) * 1000:>10.1f}'
+                f'{percentile(values, 99) * 1000:>10.1f}'
+            )
+        self.stdout.write(self.style.SUCCESS(f'\nTotal: {len(jobs)} requests in {wall:.2f}s ({len(jobs) / wall:.1f} req/s)'))
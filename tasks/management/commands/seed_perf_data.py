@@ -0,0 +1,121 @@
+import random
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from tasks.models import QuickAction, Task, UserProfile
+from tasks.signals import DEFAULT_QUICK_ACTIONS
+
+STATUS_WEIGHTS = [('pending', 30), ('in_progress', 20), ('completed', 50)]
+PRIORITY_WEIGHTS = [('low', 25), ('medium', 55), ('high', 20)]
+CATEGORY_WEIGHTS = [('work', 35), ('personal', 25), ('health', 10), ('education', 10), ('shopping', 10), ('other', 10)]
+
+WORDS = (
+    'review report meeting budget plan draft email call client invoice design deploy '
+    'fix bug test write update prepare schedule book order buy groceries gym run read '
+    'course lecture homework renew insurance doctor dentist clean garage garden pay bills '
+    'quarterly weekly daily roadmap backlog sprint release notes slides presentation'
+).split()
+
+
+def weighted(rng, choices):
+    values, weights = zip(*choices)
+    return rng.choices(values, weights=weights)[0]
+
+
+@contextmanager
+def explicit_timestamps(model, *field_names):
+    """Let bulk_create keep the created_at/updated_at values we assign"""
+    fields = [model._meta.get_field(name) for name in field_names]
+    saved = [(field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, (auto_now, auto_now_add) in zip(fields, saved):
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+class Command(BaseCommand):
+    help = 'Generate users, profiles, quick actions and a long tail of tasks for performance testing'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=100, help='Number of users to create')
+        parser.add_argument('--max-tasks', type=int, default=50000,
+                            help='Tasks owned by the heaviest user; the rest follow a power-law tail')
+        parser.add_argument('--prefix', default='perf', help='Username prefix for generated users')
+        parser.add_argument('--password', default='perf-password', help='Password for every generated user')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Rows per bulk INSERT')
+        parser.add_argument('--seed', type=int, default=42, help='Random seed for reproducible data')
+        parser.add_argument('--clear', action='store_true', help='Delete previously generated users first')
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        prefix = options['prefix']
+        existing = User.objects.filter(username__startswith=f'{prefix}_user_')
+        if existing.exists():
+            if not options['clear']:
+                raise CommandError(f"Users with prefix '{prefix}' already exist; pass --clear to replace them")
+            deleted, _ = existing.delete()
+            self.stdout.write(f'Deleted {deleted} previously generated rows')
+
+        password = make_password(options['password'])
+        with transaction.atomic():
+            User.objects.bulk_create([
+                User(username=f'{prefix}_user_{i}', email=f'{prefix}_user_{i}@example.com', password=password)
+                for i in range(options['users'])
+            ], batch_size=options['batch_size'])
+            users = list(User.objects.filter(username__startswith=f'{prefix}_user_').order_by('id'))
+            UserProfile.objects.bulk_create(
+                [UserProfile(user=user, display_name=f'Perf User {i}') for i, user in enumerate(users)],
+                batch_size=options['batch_size'],
+            )
+            QuickAction.objects.bulk_create(
+                [QuickAction(user=user, **action) for user in users for action in DEFAULT_QUICK_ACTIONS],
+                batch_size=options['batch_size'],
+            )
+
+        total = 0
+        for rank, user in enumerate(users, start=1):
+            # Zipf-like tail: a few huge accounts, most with a few hundred tasks or less
+            count = int(options['max_tasks'] / rank ** 1.1 * rng.uniform(0.8, 1.2))
+            count = min(count, options['max_tasks'])
+            self.create_tasks(rng, user, count, options['batch_size'])
+            total += count
+            if rank <= 5 or rank % 25 == 0:
+                self.stdout.write(f'  {user.username}: {count} tasks')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Created {len(users)} users and {total} tasks (password: {options["password"]})'
+        ))
+
+    def create_tasks(self, rng, user, count, batch_size):
+        now = timezone.now()
+        today = now.date()
+        with explicit_timestamps(Task, 'created_at', 'updated_at'), transaction.atomic():
+            batch = []
+            for _ in range(count):
+                created_at = now - timedelta(seconds=rng.randint(0, 365 * 24 * 3600))
+                updated_at = min(now, created_at + timedelta(seconds=rng.randint(0, 30 * 24 * 3600)))
+                batch.append(Task(
+                    user=user,
+                    title=' '.join(rng.choices(WORDS, k=rng.randint(2, 6))).capitalize(),
+                    description=' '.join(rng.choices(WORDS, k=rng.randint(0, 40))),
+                    status=weighted(rng, STATUS_WEIGHTS),
+                    priority=weighted(rng, PRIORITY_WEIGHTS),
+                    category=weighted(rng, CATEGORY_WEIGHTS),
+                    due_date=today + timedelta(days=rng.randint(-60, 60)) if rng.random() < 0.7 else None,
+                    created_at=created_at,
+                    updated_at=updated_at,
+                ))
+                if len(batch) >= batch_size:
+                    Task.objects.bulk_create(batch)
+                    batch = []
+            if batch:
+                Task.objects.bulk_create(batch)
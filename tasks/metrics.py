@@ -0,0 +1,128 @@
+"""Prometheus metrics for the task service.
+
+Under gunicorn every worker is its own process, so when
+PROMETHEUS_MULTIPROC_DIR is set (see start.sh and gunicorn.conf.py) the
+metrics are kept in per-process files in that directory and /metrics merges
+them on each scrape. Without it they live in the process's default registry.
+The gunicorn worker metrics are recorded by the master in gunicorn.conf.py.
+"""
+import hmac
+import os
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, generate_latest, multiprocess,
+)
+
+from .instrumentation import current_metrics
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89, 144)
+
+REQUESTS = Counter(
+    'taskflow_http_requests_total', 'HTTP requests by route, method and status',
+    ['route', 'method', 'status'],
+)
+REQUEST_LATENCY = Histogram(
+    'taskflow_http_request_duration_seconds', 'Time to produce a response, by route and method',
+    ['route', 'method'], buckets=LATENCY_BUCKETS,
+)
+REQUEST_QUERIES = Histogram(
+    'taskflow_db_queries_per_request', 'Database queries made by one request, by route',
+    ['route'], buckets=QUERY_BUCKETS,
+)
+REQUEST_DB_TIME = Histogram(
+    'taskflow_db_duration_seconds', 'Database time spent by one request, by route',
+    ['route'], buckets=LATENCY_BUCKETS,
+)
+CACHE_LOOKUPS = Counter(
+    'taskflow_cache_lookups_total', 'Cache lookups by cache and result (hit or miss)',
+    ['cache', 'result'],
+)
+IN_PROGRESS = Gauge(
+    'taskflow_http_requests_in_progress', 'Requests currently being handled',
+    multiprocess_mode='livesum',
+)
+EVENT_STREAMS = Gauge(
+    'taskflow_event_streams_open', 'Server-Sent Events connections currently open',
+    multiprocess_mode='livesum',
+)
+
+
+def record_cache_lookup(cache_name, hit):
+    CACHE_LOOKUPS.labels(cache_name, 'hit' if hit else 'miss').inc()
+
+
+class MetricsMiddleware:
+    """Record rate, latency and query counts per resolved route.
+
+    Routes are labelled with their URL name (`task-dashboard-stats`,
+    `quickaction-reorder`, ...) to keep label cardinality bounded. Placed
+    inside ServerTimingMiddleware so the query counter covers the request.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        IN_PROGRESS.inc()
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            IN_PROGRESS.dec()
+        return self.record(request, response, time.perf_counter() - start)
+
+    async def __acall__(self, request):
+        IN_PROGRESS.inc()
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            IN_PROGRESS.dec()
+        return self.record(request, response, time.perf_counter() - start)
+
+    def record(self, request, response, elapsed):
+        match = request.resolver_match
+        route = (match.view_name or match.url_name or 'unnamed') if match else 'unmatched'
+        REQUESTS.labels(route, request.method, str(response.status_code)).inc()
+        REQUEST_LATENCY.labels(route, request.method).observe(elapsed)
+        metrics = current_metrics()
+        if metrics is not None:
+            REQUEST_QUERIES.labels(route).observe(metrics.query_count)
+            REQUEST_DB_TIME.labels(route).observe(metrics.db_time)
+        return response
+
+
+def _is_allowed(request):
+    """Staff users, scrapers presenting METRICS_TOKEN, or hosts in METRICS_ALLOWED_IPS"""
+    if request.user.is_authenticated and request.user.is_staff:
+        return True
+    token = getattr(settings, 'METRICS_TOKEN', '')
+    auth = request.META.get('HTTP_AUTHORIZATION', '')
+    if token and auth.startswith('Bearer ') and hmac.compare_digest(auth[len('Bearer '):], token):
+        return True
+    return request.META.get('REMOTE_ADDR') in getattr(settings, 'METRICS_ALLOWED_IPS', ())
+
+
+def metrics_view(request):
+    """Prometheus text exposition of this service's metrics"""
+    if not _is_allowed(request):
+        return HttpResponseForbidden('Forbidden')
+
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return HttpResponse(generate_latest(registry), content_type=CONTENT_TYPE_LATEST)
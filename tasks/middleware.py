@@ -0,0 +1,166 @@
+import logging
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.utils.deprecation import MiddlewareMixin
+from django.utils.functional import SimpleLazyObject
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+from .instrumentation import collect_metrics
+from .models import UserProfile
+
+logger = logging.getLogger('taskflow.requests')
+
+PHASES = ('serialize', 'render', 'template')
+
+
+def _loaded_user(request):
+    """The request's user if it was already loaded; never queries for it"""
+    user = vars(request).get('user')
+    if isinstance(user, SimpleLazyObject):
+        user = vars(request).get('_cached_user')
+    return user
+
+
+def _user_id(request):
+    return getattr(_loaded_user(request), 'pk', None)
+
+
+def _shows_server_timing(request):
+    # The breakdown reveals how each request is served, so by default only
+    # developers and staff see it
+    return (settings.DEBUG or getattr(settings, 'SERVER_TIMING_PUBLIC', False)
+            or getattr(_loaded_user(request), 'is_staff', False))
+
+
+class ServerTimingMiddleware:
+    """Measure each request's database, serialization and rendering time.
+
+    Queries are counted by the execute wrapper that instrumentation.py puts on
+    every database connection, which reports to the metrics of the request
+    being served (also from the ORM's worker thread under ASGI). The breakdown
+    goes out in a structured `taskflow.requests` log line for every request,
+    and in a Server-Timing header (visible in the browser's network panel)
+    when DEBUG is on, the user is staff or SERVER_TIMING_PUBLIC is set.
+    Requests slower than SLOW_REQUEST_MS are logged as warnings with their
+    slowest queries.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with collect_metrics() as metrics:
+            response = self.get_response(request)
+        return self.finish(request, response, metrics)
+
+    async def __acall__(self, request):
+        with collect_metrics() as metrics:
+            response = await self.get_response(request)
+        return self.finish(request, response, metrics)
+
+    def finish(self, request, response, metrics):
+        total = time.perf_counter() - metrics.started
+        timings = {'db': metrics.db_time, **{phase: metrics.phases.get(phase, 0.0) for phase in PHASES}}
+        timings['app'] = max(total - sum(timings.values()), 0.0)
+        if _shows_server_timing(request):
+            response['Server-Timing'] = ', '.join(
+                [f'db;dur={timings["db"] * 1000:.1f};desc="{metrics.query_count} queries"']
+                + [f'{phase};dur={timings[phase] * 1000:.1f}' for phase in (*PHASES, 'app')]
+                + [f'total;dur={total * 1000:.1f}']
+            )
+
+        fields = {
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'user_id': _user_id(request),
+            'queries': metrics.query_count,
+            'total_ms': round(total * 1000, 2),
+            **{f'{name}_ms': round(seconds * 1000, 2) for name, seconds in timings.items()},
+        }
+        if total * 1000 >= getattr(settings, 'SLOW_REQUEST_MS', 500):
+            logger.warning('slow request %s %s', request.method, request.path,
+                           extra={**fields, 'top_queries': metrics.top_queries()})
+        else:
+            logger.info('%s %s', request.method, request.path, extra=fields)
+        return response
+
+
+class AsyncWhiteNoiseMiddleware(WhiteNoiseMiddleware):
+    """WhiteNoise that also runs natively in an async middleware chain.
+
+    whitenoise 6.5 is sync-only, which would make Django run every request
+    under ASGI through a thread. Looking up a static file is an in-memory dict
+    access (unless autorefresh is on in DEBUG), so it is safe in the event loop.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response=None, *args, **kwargs):
+        super().__init__(get_response, *args, **kwargs)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        if self.autorefresh:
+            static_file = self.find_file(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is not None:
+            return self.serve(static_file, request)
+        return await self.get_response(request)
+
+
+def _cached_profile(user):
+    if User.profile.is_cached(user):
+        # None when the join found no profile
+        return getattr(user, 'profile', None)
+    return None
+
+
+def get_profile(user):
+    """The user's profile, creating it only if the user has none"""
+    profile = _cached_profile(user)
+    if profile is None:
+        profile, _ = UserProfile.objects.select_related('user').get_or_create(user=user)
+    return profile
+
+
+async def aget_profile(user):
+    profile = _cached_profile(user)
+    if profile is None:
+        profile, _ = await UserProfile.objects.select_related('user').aget_or_create(user=user)
+    return profile
+
+
+class ProfileMiddleware(MiddlewareMixin):
+    """Provide request.profile (and await request.aprofile()) for logged-in users.
+
+    EmailBackend loads the session's user with its profile in one query, so
+    this normally costs nothing. The profile is resolved once per request.
+    Place after AuthenticationMiddleware.
+    """
+
+    def process_request(self, request):
+        request.profile = SimpleLazyObject(lambda: get_profile(request.user))
+
+        async def aprofile():
+            if '_aprofile' not in vars(request):
+                request._aprofile = await aget_profile(await request.auser())
+            return request._aprofile
+
+        request.aprofile = aprofile
@@ -0,0 +1,61 @@
+from django.db import DatabaseError, migrations
+
+INDEX_NAME = 'auth_user_email_ci_uniq'
+# Must match tasks.backends.NormalizedEmail for queries to use the index
+EXPRESSION = "NULLIF(LOWER(email), '')"
+
+
+def check_duplicates(schema_editor):
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(
+            f'SELECT {EXPRESSION} FROM auth_user WHERE {EXPRESSION} IS NOT NULL '
+            f'GROUP BY {EXPRESSION} HAVING COUNT(*) > 1'
+        )
+        duplicates = [row[0] for row in cursor.fetchall()]
+    if duplicates:
+        raise RuntimeError(
+            'These emails belong to more than one user (ignoring case); change or clear '
+            f'them before migrating: {", ".join(duplicates[:20])}'
+        )
+
+
+def create_email_index(apps, schema_editor):
+    check_duplicates(schema_editor)
+    connection = schema_editor.connection
+    if connection.vendor == 'mysql':
+        try:
+            # Functional key parts need MySQL 8.0.13+
+            schema_editor.execute(f'CREATE UNIQUE INDEX {INDEX_NAME} ON auth_user (({EXPRESSION}))')
+        except DatabaseError:
+            # TiDB only allows a few functions in expression indexes; index a
+            # virtual column instead, which its optimizer matches the same way
+            schema_editor.execute(f'ALTER TABLE auth_user ADD COLUMN email_ci VARCHAR(254) AS ({EXPRESSION}) VIRTUAL')
+            schema_editor.execute(f'CREATE UNIQUE INDEX {INDEX_NAME} ON auth_user (email_ci)')
+    else:
+        # Note: SQLite drops this index if Django ever rebuilds auth_user to
+        # alter it, so such a migration must recreate it
+        schema_editor.execute(f'CREATE UNIQUE INDEX {INDEX_NAME} ON auth_user (({EXPRESSION}))')
+
+
+def drop_email_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor == 'mysql':
+        schema_editor.execute(f'DROP INDEX {INDEX_NAME} ON auth_user')
+        with connection.cursor() as cursor:
+            columns = [column.name for column in connection.introspection.get_table_description(cursor, 'auth_user')]
+        if 'email_ci' in columns:
+            schema_editor.execute('ALTER TABLE auth_user DROP COLUMN email_ci')
+    else:
+        schema_editor.execute(f'DROP INDEX {INDEX_NAME}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('tasks', '0005_userprofile_photo_variants'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_email_index, drop_email_index),
+    ]
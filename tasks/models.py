@@ -13,11 +13,38 @@ class UserProfile(models.Model):
     display_name = models.CharField(max_length=100, blank=True)
     bio = models.TextField(max_length=500, blank=True)
     profile_photo = models.ImageField(upload_to=user_profile_photo_path, null=True, blank=True)
+    # Processed copies of profile_photo by size and format, see tasks/photos.py
+    photo_variants = models.JSONField(default=dict, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return f"{self.user.username}'s Profile"
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._saved_values = instance._field_values()
+        return instance
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self._saved_values = self._field_values()
+
+    def _field_values(self):
+        values = {}
+        for field in self._meta.concrete_fields:
+            if field.attname not in self.__dict__:
+                continue  # deferred, so it can't have been changed
+            value = getattr(self, field.attname)
+            values[field.attname] = value.name if isinstance(field, models.FileField) else value
+        return values
+
+    def has_unsaved_changes(self):
+        """Whether any field differs from the values last loaded or saved"""
+        if self._state.adding:
+            return True
+        return self._field_values() != getattr(self, '_saved_values', None)
     
     @property
     def name(self):
@@ -77,3 +104,28 @@ class Task(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        # Composite indexes lead with user because every query is scoped to one
+        # user's tasks; the trailing columns follow the dashboard counts and the
+        # filter_tasks branches so those lookups are answered from the index.
+        indexes = [
+            models.Index(fields=['user', '-created_at', '-id'], name='task_user_created_idx'),
+            models.Index(fields=['user', 'status', 'updated_at'], name='task_user_status_idx'),
+            models.Index(fields=['user', 'priority', 'status'], name='task_user_priority_idx'),
+            models.Index(fields=['user', 'category', '-created_at', '-id'], name='task_user_category_idx'),
+            models.Index(fields=['user', 'due_date', 'status'], name='task_user_due_date_idx'),
+            models.Index(fields=['user', 'updated_at'], name='task_user_updated_idx'),
+        ]
+
+class TaskTombstone(models.Model):
+    """Marker left behind when a task is deleted, so sync clients can drop it."""
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='task_tombstones')
+    task_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'deleted_at'], name='tombstone_user_deleted_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.user.username} - task {self.task_id}"
@@ -0,0 +1,181 @@
+"""Profile photo processing.
+
+An upload is stored as-is by the request that receives it. Once that
+transaction commits, a background thread decodes it and writes the variants
+below as JPEG and WebP, with EXIF and other metadata dropped. Each variant
+is named after a hash of its content, so photo_view can serve it with
+far-future cache headers. The worker then points the profile at the new
+files and removes the raw upload and the previous photo's variants. An
+upload that can't be processed is recorded under FAILED in photo_variants
+and isn't queued again.
+"""
+import hashlib
+import io
+import logging
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import close_old_connections
+from django.http import FileResponse, Http404
+from PIL import Image, ImageOps
+
+from .cache import PROFILE, bump_version
+from .models import UserProfile
+
+logger = logging.getLogger(__name__)
+
+# Longest side of the stored photo; profile_photo points at this variant
+LARGE = 1024
+# Square thumbnails for avatars (navbar, profile card)
+THUMBNAILS = (256, 64)
+
+FORMATS = {
+    'jpeg': ('jpg', {'quality': 85, 'optimize': True, 'progressive': True}),
+    'webp': ('webp', {'quality': 80, 'method': 4}),
+}
+
+# Uploads larger than this many pixels are rejected rather than decoded
+MAX_PIXELS = 40_000_000
+
+# photo_variants key naming an upload that could not be processed
+FAILED = 'failed'
+
+VARIANT_NAME = re.compile(r'^profile_photos/\d+/[0-9a-f]{16}-\d+\.(?:jpg|webp)$')
+CACHE_FOREVER = 'public, max-age=31536000, immutable'
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _encode(image, fmt):
+    extension, options = FORMATS[fmt]
+    if fmt == 'jpeg' and image.mode != 'RGB':
+        # JPEG has no alpha; flatten transparent areas onto white
+        background = Image.new('RGB', image.size, 'white')
+        background.paste(image, mask=image.getchannel('A') if 'A' in image.getbands() else None)
+        image = background
+    buffer = io.BytesIO()
+    # Nothing from the upload's info (exif, icc_profile, xmp) is passed on
+    image.save(buffer, fmt.upper(), **options)
+    return extension, buffer.getvalue()
+
+
+def _store(user_id, size, extension, data):
+    digest = hashlib.sha256(data).hexdigest()[:16]
+    name = f'profile_photos/{user_id}/{digest}-{size}.{extension}'
+    if not default_storage.exists(name):
+        default_storage.save(name, ContentFile(data))
+    return name
+
+
+def render_variants(user_id, source):
+    """Decode an uploaded image and store all of its variants.
+
+    Returns {size: {format: storage name}}, with sizes as strings so the
+    mapping survives a round trip through the JSON column.
+    """
+    with Image.open(source) as upload:
+        if upload.width * upload.height > MAX_PIXELS:
+            raise ValueError(f'{upload.width}x{upload.height} image is too large')
+        upload.draft('RGB', (LARGE, LARGE))  # JPEG: decode at a reduced scale when possible
+        image = ImageOps.exif_transpose(upload)
+        image = image.convert('RGBA' if 'A' in image.getbands() or 'transparency' in upload.info else 'RGB')
+
+    large = image.copy()
+    large.thumbnail((LARGE, LARGE), Image.LANCZOS)
+    renditions = {LARGE: large}
+    for size in THUMBNAILS:
+        renditions[size] = ImageOps.fit(large, (size, size), Image.LANCZOS)
+
+    variants = {}
+    for size, rendition in renditions.items():
+        variants[str(size)] = {fmt: _store(user_id, size, *_encode(rendition, fmt)) for fmt in FORMATS}
+    return variants
+
+
+def variant_names(variants):
+    return {name for size, formats in (variants or {}).items() if size != FAILED for name in formats.values()}
+
+
+def process_profile_photo(profile_id, upload_name, previous_variants=None):
+    """Replace a profile's raw upload with its processed variants"""
+    profile = UserProfile.objects.filter(pk=profile_id, profile_photo=upload_name).only('user_id').first()
+    if profile is None:
+        # Already processed, or replaced by a newer upload in the meantime
+        default_storage.delete(upload_name)
+        return
+    try:
+        with default_storage.open(upload_name) as source:
+            variants = render_variants(profile.user_id, source)
+    except Exception:
+        logger.warning('Could not process profile photo %s', upload_name, exc_info=True)
+        # Recorded so that later saves of the profile don't queue it again
+        failed = UserProfile.objects.filter(pk=profile_id, profile_photo=upload_name).update(
+            photo_variants={FAILED: upload_name},
+        )
+        if failed:
+            for name in variant_names(previous_variants):
+                default_storage.delete(name)
+        return
+
+    updated = UserProfile.objects.filter(pk=profile_id, profile_photo=upload_name).update(
+        profile_photo=variants[str(LARGE)]['jpeg'], photo_variants=variants,
+    )
+    if updated:
+        bump_version(PROFILE, profile.user_id)
+        stale = {upload_name} | (variant_names(previous_variants) - variant_names(variants))
+    else:
+        current = UserProfile.objects.filter(pk=profile_id).values_list('photo_variants', flat=True).first()
+        stale = {upload_name} | (variant_names(variants) - variant_names(current))
+    for name in stale:
+        default_storage.delete(name)
+
+
+def _run(profile_id, upload_name, previous_variants):
+    try:
+        process_profile_photo(profile_id, upload_name, previous_variants)
+    finally:
+        close_old_connections()
+
+
+def schedule_photo_processing(profile, upload_name):
+    """Process an upload on the photo worker pool.
+
+    With PROFILE_PHOTO_WORKERS = 0 the work runs in the calling thread.
+    """
+    global _executor
+    args = (profile.pk, upload_name, profile.photo_variants)
+    workers = getattr(settings, 'PROFILE_PHOTO_WORKERS', 2)
+    if workers == 0:
+        process_profile_photo(*args)
+        return
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(workers, thread_name_prefix='profile-photo')
+    _executor.submit(_run, *args)
+
+
+def is_processed(profile):
+    return profile.profile_photo.name in variant_names(profile.photo_variants)
+
+
+def processing_failed(profile):
+    return (profile.photo_variants or {}).get(FAILED) == profile.profile_photo.name
+
+
+def photo_view(request, name):
+    """Serve a processed variant; its name changes whenever its content does.
+
+    Photos are public on purpose, like avatars elsewhere: a name can't be
+    guessed without the 64-bit hash of the image, and serving without a
+    session lets browsers and shared caches keep the files as immutable.
+    """
+    if not VARIANT_NAME.match(name) or not default_storage.exists(name):
+        raise Http404
+    response = FileResponse(default_storage.open(name))
+    response['Cache-Control'] = CACHE_FOREVER
+    return response
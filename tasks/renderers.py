@@ -0,0 +1,48 @@
+"""JSON rendering through orjson, when it is installed.
+
+orjson encodes a page of tasks several times faster than the json module.
+FastJSONRenderer only uses it where the bytes come out the same as from
+DRF's JSONRenderer: compact UTF-8 output (DRF's defaults), no indent asked
+for by the client, and data orjson can encode natively or through DRF's
+encoder (datetimes, lazy strings and the like are handed to the latter, so
+they keep DRF's formatting). Everything else, and every deployment without
+orjson, takes DRF's own path.
+
+What still differs is floats: orjson writes 1e16 where json writes 1e+16,
+and NaN as null where DRF refuses it. The API has no float fields.
+"""
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:  # optional, see requirements.txt
+    orjson = None
+
+# DRF escapes these two, which are valid JSON but not valid JavaScript
+_LINE_SEPARATORS = ((b'\xe2\x80\xa8', b'\\u2028'), (b'\xe2\x80\xa9', b'\\u2029'))
+
+
+class FastJSONRenderer(JSONRenderer):
+    def use_orjson(self, accepted_media_type, renderer_context):
+        return (
+            orjson is not None
+            and self.compact
+            and not self.ensure_ascii
+            and self.get_indent(accepted_media_type, renderer_context) is None
+        )
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None or not self.use_orjson(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(
+                data,
+                default=self.encoder_class().default,
+                option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS,
+            )
+        except orjson.JSONEncodeError:
+            # e.g. integers beyond 64 bits, which json handles
+            return super().render(data, accepted_media_type, renderer_context)
+        for raw, escaped in _LINE_SEPARATORS:
+            ret = ret.replace(raw, escaped)
+        return ret
@@ -0,0 +1,66 @@
+import re
+
+from django.db import connection
+from django.db.models import FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+
+FULLTEXT_INDEX_NAME = 'task_fulltext_idx'
+FTS_TABLE_NAME = 'tasks_task_fts'
+
+_TERM_RE = re.compile(r'\w+', re.UNICODE)
+
+# Whether the MySQL FULLTEXT index exists, looked up once per process
+_fulltext_available = None
+
+
+def search_terms(query):
+    """Split a free-text query into the word terms every backend matches on"""
+    return _TERM_RE.findall(query)
+
+
+def _has_fulltext_index():
+    global _fulltext_available
+    if _fulltext_available is None:
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(cursor, 'tasks_task')
+        _fulltext_available = FULLTEXT_INDEX_NAME in constraints
+    return _fulltext_available
+
+
+def search_tasks(queryset, query):
+    """Restrict a task queryset to full-text matches for query, best matches first.
+
+    Every term must match, and each one matches as a word prefix. MySQL uses
+    the FULLTEXT index on title/description in boolean mode, and SQLite uses
+    the FTS5 table kept in sync by triggers; both rank by relevance. Other
+    databases, or MySQL servers without FULLTEXT support, fall back to
+    substring matching ordered by recency.
+    """
+    terms = search_terms(query)
+    if not terms:
+        return queryset.none()
+
+    if connection.vendor == 'mysql' and _has_fulltext_index():
+        against = ' '.join(f'+{term}*' for term in terms)
+        rank = RawSQL(
+            'MATCH (tasks_task.title, tasks_task.description) AGAINST (%s IN BOOLEAN MODE)',
+            (against,),
+            output_field=FloatField(),
+        )
+        return queryset.annotate(rank=rank).filter(rank__gt=0).order_by('-rank', '-created_at', '-id')
+
+    if connection.vendor == 'sqlite':
+        match = ' '.join('"{}"*'.format(term.replace('"', '""')) for term in terms)
+        matching_ids = RawSQL(f'SELECT rowid FROM {FTS_TABLE_NAME} WHERE {FTS_TABLE_NAME} MATCH %s', (match,))
+        # bm25() is lower for better matches, so negate it to sort descending
+        rank = RawSQL(
+            f'SELECT -bm25({FTS_TABLE_NAME}) FROM {FTS_TABLE_NAME} '
+            f'WHERE {FTS_TABLE_NAME} MATCH %s AND rowid = tasks_task.id',
+            (match,),
+            output_field=FloatField(),
+        )
+        return queryset.filter(id__in=matching_ids).annotate(rank=rank).order_by('-rank', '-created_at', '-id')
+
+    for term in terms:
+        queryset = queryset.filter(Q(title__icontains=term) | Q(description__icontains=term))
+    return queryset.annotate(rank=Value(0.0, output_field=FloatField())).order_by('-created_at', '-id')
@@ -1,30 +1,75 @@
 from rest_framework import serializers
 from django.contrib.auth.models import User
+from django.urls import reverse
+from .instrumentation import TimedSerializerMixin
 from .models import Task, UserProfile, QuickAction
+from .photos import is_processed
 
-class UserProfileSerializer(serializers.ModelSerializer):
+class UserProfileSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     name = serializers.ReadOnlyField()
     profile_photo_url = serializers.SerializerMethodField()
+    profile_photo_variants = serializers.SerializerMethodField()
     
     class Meta:
         model = UserProfile
-        fields = ['id', 'display_name', 'bio', 'profile_photo', 'profile_photo_url', 'name', 'created_at', 'updated_at']
+        fields = ['id', 'display_name', 'bio', 'profile_photo', 'profile_photo_url', 'profile_photo_variants', 'name', 'created_at', 'updated_at']
         read_only_fields = ['created_at', 'updated_at']
     
     def get_profile_photo_url(self, obj):
         if obj.profile_photo:
             request = self.context.get('request')
             if request:
+                if is_processed(obj):
+                    return request.build_absolute_uri(reverse('profile-photo', args=[obj.profile_photo.name]))
                 return request.build_absolute_uri(obj.profile_photo.url)
         return None
 
-class QuickActionSerializer(serializers.ModelSerializer):
+    def get_profile_photo_variants(self, obj):
+        """URLs of the processed photo by size and format; empty until processing finishes"""
+        request = self.context.get('request')
+        if not obj.profile_photo or not is_processed(obj) or not request:
+            return {}
+        return {
+            size: {fmt: request.build_absolute_uri(reverse('profile-photo', args=[name])) for fmt, name in formats.items()}
+            for size, formats in obj.photo_variants.items()
+        }
+
+class QuickActionSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = QuickAction
         fields = ['id', 'label', 'icon', 'action_type', 'action_data', 'order', 'is_active', 'created_at']
         read_only_fields = ['created_at']
 
-class TaskSerializer(serializers.ModelSerializer):
+class QuickActionOrderSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    order = serializers.IntegerField(min_value=0)
+
+def requested_task_fields(value):
+    """Return the task fields selected by a ?fields= value, or None for all of them.
+
+    Raises ValidationError for names that aren't task fields, so a typo
+    doesn't silently return empty objects.
+    """
+    if not value:
+        return None
+    requested = {name.strip() for name in value.split(',')} - {''}
+    unknown = requested - set(TaskSerializer.Meta.fields)
+    if unknown:
+        raise serializers.ValidationError({'fields': [
+            f"Unknown fields: {', '.join(sorted(unknown))}. "
+            f"Allowed fields: {', '.join(TaskSerializer.Meta.fields)}."
+        ]})
+    return [name for name in TaskSerializer.Meta.fields if name in requested]
+
+class TaskSerializer(TimedSerializerMixin, serializers.ModelSerializer):
+    def __init__(self, *args, **kwargs):
+        # Optional subset of Meta.fields to include in the representation
+        fields = kwargs.pop('fields', None)
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for field_name in set(self.fields) - set(fields):
+                self.fields.pop(field_name)
+
     class Meta:
         model = Task
         fields = ['id', 'title', 'description', 'status', 'priority', 'category', 'due_date', 'created_at', 'updated_at', 'user']
@@ -1,7 +1,15 @@
-from django.db.models.signals import post_save
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 from django.contrib.auth.models import User
-from .models import UserProfile, QuickAction
+from . import events
+from .cache import TASKS, PROFILE, QUICK_ACTIONS, bump_version
+from .models import UserProfile, QuickAction, Task, TaskTombstone
+from .photos import is_processed, processing_failed, schedule_photo_processing
+from .serializers import TaskSerializer
 
 @receiver(post_save, sender=User)
 def create_user_profile(sender, instance, created, **kwargs):
@@ -11,45 +19,137 @@ def create_user_profile(sender, instance, created, **kwargs):
 
 @receiver(post_save, sender=User)
 def save_user_profile(sender, instance, **kwargs):
-    """Save the UserProfile when the User is saved."""
-    if hasattr(instance, 'profile'):
-        instance.profile.save()
+    """Save the UserProfile when the User is saved, if it was loaded and edited."""
+    # Only look at an already-loaded profile: fetching one here would cost a
+    # query on every User.save(), including each login's last_login update
+    profile = getattr(instance, 'profile', None) if User.profile.is_cached(instance) else None
+    if profile is not None and profile.has_unsaved_changes():
+        profile.save()
+
+DEFAULT_QUICK_ACTIONS = [
+    {
+        'label': 'Add Task',
+        'icon': 'fas fa-plus',
+        'action_type': 'modal',
+        'order': 1
+    },
+    {
+        'label': 'Due Today',
+        'icon': 'fas fa-clock',
+        'action_type': 'filter',
+        'action_data': {'filter_type': 'due_date', 'filter_value': 'today'},
+        'order': 2
+    },
+    {
+        'label': 'High Priority',
+        'icon': 'fas fa-star',
+        'action_type': 'filter',
+        'action_data': {'filter_type': 'priority', 'filter_value': 'high'},
+        'order': 3
+    },
+    {
+        'label': 'Report',
+        'icon': 'fas fa-chart-bar',
+        'action_type': 'modal',
+        'order': 4
+    }
+]
+
+@receiver(post_save, sender=UserProfile)
+def process_profile_photo_upload(sender, instance, **kwargs):
+    """Resize and re-encode a newly uploaded photo once the upload is committed."""
+    if instance.profile_photo and not is_processed(instance) and not processing_failed(instance):
+        upload_name = instance.profile_photo.name
+        transaction.on_commit(lambda: schedule_photo_processing(instance, upload_name))
 
 @receiver(post_save, sender=UserProfile)
 def create_default_quick_actions(sender, instance, created, **kwargs):
     """Create default quick actions for new user profiles."""
     if created:
-        default_actions = [
-            {
-                'label': 'Add Task',
-                'icon': 'fas fa-plus',
-                'action_type': 'modal',
-                'order': 1
-            },
-            {
-                'label': 'Due Today',
-                'icon': 'fas fa-clock',
-                'action_type': 'filter',
-                'action_data': {'filter_type': 'due_date', 'filter_value': 'today'},
-                'order': 2
-            },
-            {
-                'label': 'High Priority',
-                'icon': 'fas fa-star',
-                'action_type': 'filter',
-                'action_data': {'filter_type': 'priority', 'filter_value': 'high'},
-                'order': 3
-            },
-            {
-                'label': 'Report',
-                'icon': 'fas fa-chart-bar',
-                'action_type': 'modal',
-                'order': 4
-            }
-        ]
-        
-        for action_data in default_actions:
-            QuickAction.objects.create(
-                user=instance.user,
-                **action_data
-            )
+        QuickAction.objects.bulk_create([
+            QuickAction(user=instance.user, **action_data)
+            for action_data in DEFAULT_QUICK_ACTIONS
+        ])
+
+# Set while batched_task_changes() is active; collects per-task side effects
+_task_batch = ContextVar('task_batch', default=None)
+
+@contextmanager
+def batched_task_changes():
+    """Defer the per-task signal work inside the block and apply it in bulk.
+
+    Tombstones are inserted with one bulk_create and each affected user's task
+    version is bumped once, instead of once per row.
+    """
+    batch = {'user_ids': set(), 'tombstones': []}
+    token = _task_batch.set(batch)
+    try:
+        yield
+    finally:
+        _task_batch.reset(token)
+    if batch['tombstones']:
+        TaskTombstone.objects.bulk_create(batch['tombstones'])
+    for user_id in batch['user_ids']:
+        tasks_changed(user_id)
+
+def tasks_changed(user_id, event=('tasks.sync', None)):
+    """Invalidate a user's task caches, including after writes that bypass signals.
+
+    Once committed, `event` is pushed to the user's open event streams;
+    the default tells them to resync through /api/tasks/changes/.
+    """
+    batch = _task_batch.get()
+    if batch is not None:
+        batch['user_ids'].add(user_id)
+        return
+
+    def committed():
+        bump_version(TASKS, user_id)
+        events.publish(user_id, *event)
+        events.publish(user_id, 'stats.changed')
+    transaction.on_commit(committed)
+
+@receiver([post_save, post_delete], sender=Task)
+def invalidate_task_caches(sender, instance, signal, **kwargs):
+    """Bump the owner's task version and push the change once it is committed."""
+    if not instance.user_id:
+        return
+    if _task_batch.get() is not None:
+        tasks_changed(instance.user_id)  # the batch sends one tasks.sync per user
+    elif signal is post_delete:
+        tasks_changed(instance.user_id, ('task.deleted', {'id': instance.id}))
+    else:
+        tasks_changed(instance.user_id, ('task.saved', {'task': TaskSerializer(instance).data}))
+
+@receiver(post_delete, sender=Task)
+def record_task_tombstone(sender, instance, **kwargs):
+    """Remember deleted tasks so incremental sync can report them."""
+    # Nobody is left to sync when the owner's account is being deleted
+    origin = kwargs.get('origin')
+    if isinstance(origin, User) or getattr(origin, 'model', None) is User:
+        return
+    if instance.user_id:
+        tombstone = TaskTombstone(user_id=instance.user_id, task_id=instance.id)
+        batch = _task_batch.get()
+        if batch is not None:
+            batch['tombstones'].append(tombstone)
+        else:
+            tombstone.save()
+
+@receiver(post_save, sender=User)
+@receiver([post_save, post_delete], sender=UserProfile)
+def invalidate_profile_caches(sender, instance, update_fields=None, **kwargs):
+    """Bump the profile version; the profile shows the user's name fields too."""
+    if update_fields is not None and set(update_fields) <= {'last_login'}:
+        return  # login bookkeeping doesn't change anything the profile shows
+    user_id = instance.pk if sender is User else instance.user_id
+    transaction.on_commit(lambda: bump_version(PROFILE, user_id))
+
+def quick_actions_changed(user_id):
+    """Invalidate a user's quick action caches, including after bulk writes."""
+    transaction.on_commit(lambda: bump_version(QUICK_ACTIONS, user_id))
+
+@receiver([post_save, post_delete], sender=QuickAction)
+def invalidate_quick_action_caches(sender, instance, **kwargs):
+    """Bump the owner's quick actions version once the change is committed."""
+    quick_actions_changed(instance.user_id)
@@ -0,0 +1,119 @@
+from datetime import datetime, time, timedelta
+
+from django.core.cache import cache
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from .cache import TASKS, aget_version, get_version, seconds_until_midnight
+from .metrics import record_cache_lookup
+from .models import Task
+
+OPEN_STATUSES = ['pending', 'in_progress']
+
+# Optional per-value breakdowns the dashboard can request alongside the totals
+BREAKDOWN_CHOICES = {
+    'category': Task.CATEGORY_CHOICES,
+    'priority': Task.PRIORITY_CHOICES,
+    'status': Task.STATUS_CHOICES,
+}
+
+
+def compute_dashboard_stats(user, breakdowns=()):
+    """Compute the dashboard statistics for a user in a single aggregate query.
+
+    Every metric is a conditional COUNT over the user's tasks, so the totals
+    and any requested breakdowns cost one round trip to the database.
+    """
+    aggregates, breakdown_columns = _dashboard_aggregates(breakdowns)
+    counts = Task.objects.filter(user=user).aggregate(**aggregates)
+    return _dashboard_stats(counts, breakdown_columns)
+
+
+async def acompute_dashboard_stats(user, breakdowns=()):
+    """Async variant of compute_dashboard_stats()"""
+    aggregates, breakdown_columns = _dashboard_aggregates(breakdowns)
+    counts = await Task.objects.filter(user=user).aaggregate(**aggregates)
+    return _dashboard_stats(counts, breakdown_columns)
+
+
+def _dashboard_aggregates(breakdowns):
+    today = timezone.localdate()
+    # Compare against the start of the day instead of casting updated_at to a
+    # date, so the condition stays usable by the (user, status, updated_at) index
+    week_ago = timezone.make_aware(datetime.combine(today - timedelta(days=7), time.min))
+
+    aggregates = {
+        'total_tasks': Count('id'),
+        'completed_tasks': Count('id', filter=Q(status='completed')),
+        'in_progress_tasks': Count('id', filter=Q(status='in_progress')),
+        'overdue_tasks': Count('id', filter=Q(due_date__lt=today, status__in=OPEN_STATUSES)),
+        'high_priority_tasks': Count('id', filter=Q(priority='high', status__in=OPEN_STATUSES)),
+        'recent_completed': Count('id', filter=Q(status='completed', updated_at__gte=week_ago)),
+    }
+    breakdown_columns = []
+    for breakdown in breakdowns:
+        for value, _label in BREAKDOWN_CHOICES[breakdown]:
+            alias = f'breakdown_{len(breakdown_columns)}'
+            aggregates[alias] = Count('id', filter=Q(**{breakdown: value}))
+            breakdown_columns.append((alias, breakdown, value))
+    return aggregates, breakdown_columns
+
+
+def _dashboard_stats(counts, breakdown_columns):
+    total_tasks = counts['total_tasks']
+    stats = {
+        'total_tasks': total_tasks,
+        'completed_tasks': counts['completed_tasks'],
+        'in_progress_tasks': counts['in_progress_tasks'],
+        'overdue_tasks': counts['overdue_tasks'],
+        'productivity': round((counts['completed_tasks'] / total_tasks * 100) if total_tasks > 0 else 0),
+        'high_priority_tasks': counts['high_priority_tasks'],
+        'recent_completed': counts['recent_completed'],
+    }
+    for alias, breakdown, value in breakdown_columns:
+        stats.setdefault(f'by_{breakdown}', {})[value] = counts[alias]
+    return stats
+
+
+def _stats_cache_key(user_id, version, breakdowns):
+    return f'taskflow:dashboard_stats:{user_id}:{version}:{timezone.localdate().isoformat()}:{",".join(breakdowns)}'
+
+
+def get_dashboard_stats(user, breakdowns=()):
+    """Return the user's dashboard statistics, served from the cache when possible.
+
+    Entries are keyed on the user's task version, which the Task signals bump
+    on every change, and on today's date. They expire at midnight because
+    overdue_tasks and recent_completed depend on the current day.
+    """
+    key = _stats_cache_key(user.id, get_version(TASKS, user.id), breakdowns)
+    stats = cache.get(key)
+    record_cache_lookup('dashboard_stats', stats is not None)
+    if stats is None:
+        stats = compute_dashboard_stats(user, breakdowns)
+        cache.set(key, stats, seconds_until_midnight())
+    return stats
+
+
+async def aget_dashboard_stats(user, breakdowns=()):
+    """Async variant of get_dashboard_stats(), sharing its cache entries"""
+    key = _stats_cache_key(user.id, await aget_version(TASKS, user.id), breakdowns)
+    stats = await cache.aget(key)
+    record_cache_lookup('dashboard_stats', stats is not None)
+    if stats is None:
+        stats = await acompute_dashboard_stats(user, breakdowns)
+        await cache.aset(key, stats, seconds_until_midnight())
+    return stats
+
+
+def parse_breakdowns(value):
+    """Parse a comma-separated ?breakdown= value, raising ValueError on unknown names"""
+    breakdowns = []
+    for name in (value or '').split(','):
+        name = name.strip()
+        if not name or name in breakdowns:
+            continue
+        if name not in BREAKDOWN_CHOICES:
+            raise ValueError(f"Unknown breakdown '{name}'. Choose from: {', '.join(BREAKDOWN_CHOICES)}")
+        breakdowns.append(name)
+    return breakdowns
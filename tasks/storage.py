@@ -0,0 +1,38 @@
+import os
+import re
+
+import rcssmin
+import rjsmin
+from django.core.files.base import ContentFile
+from whitenoise.storage import CompressedManifestStaticFilesStorage
+
+MINIFIERS = {
+    '.css': rcssmin.cssmin,
+    '.js': rjsmin.jsmin,
+}
+# Already minified files, e.g. vendor.min.js
+MINIFIED_NAME = re.compile(r'\.min\.(css|js)$')
+
+
+class MinifiedStaticFilesStorage(CompressedManifestStaticFilesStorage):
+    """WhiteNoise's hashed, gzip/brotli compressed storage that also minifies CSS and JS.
+
+    Files are minified before they are hashed, so a hashed name always
+    identifies the bytes served under it and can be cached as immutable.
+    """
+
+    def _minified(self, name, content):
+        minify = MINIFIERS.get(os.path.splitext(name)[1])
+        if minify is None or MINIFIED_NAME.search(name):
+            return content
+        content.seek(0)
+        return ContentFile(minify(content.read().decode('utf-8')).encode('utf-8'))
+
+    def file_hash(self, name, content=None):
+        # name is None when hashing the manifest
+        if name is not None and content is not None:
+            content = self._minified(name, content)
+        return super().file_hash(name, content)
+
+    def _save(self, name, content):
+        return super()._save(name, self._minified(name, content))
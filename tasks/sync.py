@@ -0,0 +1,25 @@
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+
+# Re-deliver changes this close to the previous token, so rows committed by
+# transactions that were still in flight when the token was issued aren't missed
+SYNC_OVERLAP = timedelta(seconds=5)
+
+# Tombstones older than this may be pruned; older tokens require a full reload
+TOMBSTONE_RETENTION = timedelta(days=30)
+
+# Past this many changed rows a full reload is cheaper than an incremental patch
+SYNC_MAX_CHANGES = 500
+
+
+def make_sync_token(moment):
+    """Encode a point in time as an opaque sync token"""
+    return str(int(moment.timestamp() * 1_000_000))
+
+
+def parse_sync_token(token):
+    """Decode a sync token, raising ValueError if it is malformed"""
+    micros = int(token)
+    if micros < 0:
+        raise ValueError('Sync token must not be negative')
+    return datetime.fromtimestamp(micros / 1_000_000, tz=dt_timezone.utc)
@@ -0,0 +1,1052 @@
+import csv
+import hashlib
+import io
+import json
+import os
+import shutil
+import tempfile
+from contextlib import aclosing
+from datetime import timedelta
+from unittest import mock
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.contrib.auth import authenticate
+from django.db import IntegrityError, connection, transaction
+from django.test import TestCase, override_settings
+from django.test.client import BOUNDARY, MULTIPART_CONTENT, encode_multipart
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from PIL import Image
+from prometheus_client import REGISTRY
+from rest_framework.renderers import JSONRenderer
+
+from tasks.async_views import _event_stream
+from tasks.backends import users_with_email
+from tasks import export, views
+from tasks.export import EXPORT_FIELDS, export_tasks
+from tasks.imports import import_tasks, iter_lines
+from tasks.events import RESYNC, SUBSCRIPTION_BUFFER, get_broker
+from tasks.models import QuickAction, Task, TaskTombstone, UserProfile
+from tasks.renderers import FastJSONRenderer
+from tasks.representation import task_representations, task_values
+from tasks.serializers import TaskSerializer
+from tasks.signals import batched_task_changes
+from tasks.views import TaskViewSet
+
+
+class TaskIndexUsageTests(TestCase):
+    """The task queries behind the dashboard and filters must not scan the table."""
+
+    FILTERS = [
+        ('due_date', 'today'),
+        ('due_date', 'overdue'),
+        ('due_date', 'this_week'),
+        ('priority', 'high'),
+        ('status', 'completed'),
+        ('category', 'work'),
+    ]
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('indexer', 'indexer@example.com', 'password')
+        other = User.objects.create_user('other', 'other@example.com', 'password')
+        today = timezone.now().date()
+        tasks = []
+        for owner in (cls.user, other):
+            for i in range(30):
+                tasks.append(Task(
+                    user=owner,
+                    title=f'Task {i}',
+                    status=['pending', 'in_progress', 'completed'][i % 3],
+                    priority=['low', 'medium', 'high'][i % 3],
+                    category=['work', 'personal', 'health'][i % 3],
+                    due_date=today + timedelta(days=i - 15),
+                ))
+        Task.objects.bulk_create(tasks)
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.user)
+
+    def explain(self, sql):
+        with connection.cursor() as cursor:
+            if connection.vendor == 'sqlite':
+                cursor.execute('EXPLAIN QUERY PLAN ' + sql)
+                return [row[-1] for row in cursor.fetchall()]
+            cursor.execute('EXPLAIN ' + sql)
+            columns = [col[0] for col in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    def assertUsesIndex(self, sql):
+        plan = self.explain(sql)
+        if connection.vendor == 'sqlite':
+            for step in plan:
+                if 'tasks_task' in step:
+                    self.assertTrue(
+                        step.startswith('SEARCH') and 'INDEX' in step,
+                        f'Full scan of tasks_task:\n{sql}\n{plan}',
+                    )
+        elif connection.vendor == 'mysql':
+            for step in plan:
+                if step.get('table') == 'tasks_task':
+                    self.assertNotEqual(step['type'], 'ALL', f'Full scan of tasks_task:\n{sql}\n{plan}')
+                    self.assertIsNotNone(step['key'], f'No index used:\n{sql}\n{plan}')
+        else:
+            self.skipTest(f'No EXPLAIN check for {connection.vendor}')
+
+    def capture_task_queries(self, url):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        queries = [q['sql'] for q in ctx.captured_queries if 'tasks_task' in q['sql']]
+        self.assertTrue(queries)
+        return queries
+
+    def test_task_list_uses_index(self):
+        for sql in self.capture_task_queries('/api/tasks/'):
+            self.assertUsesIndex(sql)
+
+    def test_filter_tasks_branches_use_index(self):
+        for filter_type, filter_value in self.FILTERS:
+            with self.subTest(filter_type=filter_type, filter_value=filter_value):
+                url = f'/api/tasks/filter_tasks/?filter_type={filter_type}&filter_value={filter_value}'
+                for sql in self.capture_task_queries(url):
+                    self.assertUsesIndex(sql)
+
+    def test_dashboard_stats_counts_use_index(self):
+        for sql in self.capture_task_queries('/api/tasks/dashboard_stats/'):
+            self.assertUsesIndex(sql)
+
+
+class DashboardStatsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('stats', 'stats@example.com', 'password')
+        yesterday = timezone.now().date() - timedelta(days=1)
+        Task.objects.bulk_create([
+            Task(user=cls.user, title='Done', status='completed', category='work'),
+            Task(user=cls.user, title='Late', status='pending', priority='high', due_date=yesterday),
+            Task(user=cls.user, title='Busy', status='in_progress', category='work'),
+        ])
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.user)
+
+    def test_all_metrics_and_breakdowns_in_one_query(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get('/api/tasks/dashboard_stats/?breakdown=category,status')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len([q for q in ctx.captured_queries if 'tasks_task' in q['sql']]), 1)
+        stats = response.json()
+        self.assertEqual(stats['total_tasks'], 3)
+        self.assertEqual(stats['completed_tasks'], 1)
+        self.assertEqual(stats['in_progress_tasks'], 1)
+        self.assertEqual(stats['overdue_tasks'], 1)
+        self.assertEqual(stats['high_priority_tasks'], 1)
+        self.assertEqual(stats['recent_completed'], 1)
+        self.assertEqual(stats['productivity'], 33)
+        self.assertEqual(stats['by_category']['work'], 2)
+        self.assertEqual(stats['by_category']['other'], 1)
+        self.assertEqual(stats['by_status'], {'pending': 1, 'in_progress': 1, 'completed': 1})
+        self.assertNotIn('by_priority', stats)
+
+    def test_unknown_breakdown_is_rejected(self):
+        response = self.client.get('/api/tasks/dashboard_stats/?breakdown=colour')
+        self.assertEqual(response.status_code, 400)
+
+    def test_stats_are_cached_until_a_task_changes(self):
+        self.client.get('/api/tasks/dashboard_stats/')
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get('/api/tasks/dashboard_stats/')
+        self.assertFalse([q for q in ctx.captured_queries if 'tasks_task' in q['sql']])
+        self.assertEqual(response.json()['total_tasks'], 3)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post('/api/tasks/', {'title': 'New'}, content_type='application/json')
+        response = self.client.get('/api/tasks/dashboard_stats/')
+        self.assertEqual(response.json()['total_tasks'], 4)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Task.objects.filter(user=self.user, title='New').get().delete()
+        response = self.client.get('/api/tasks/dashboard_stats/')
+        self.assertEqual(response.json()['total_tasks'], 3)
+
+
+class TaskChangesTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('syncer', 'syncer@example.com', 'password')
+        self.client.force_login(self.user)
+
+    def test_changes_since_token(self):
+        kept = Task.objects.create(user=self.user, title='Kept')
+        doomed = Task.objects.create(user=self.user, title='Doomed')
+        initial = self.client.get('/api/tasks/changes/').json()
+        self.assertTrue(initial['reset'])
+
+        kept.title = 'Kept and renamed'
+        kept.save()
+        doomed_id = doomed.id
+        doomed.delete()
+
+        data = self.client.get('/api/tasks/changes/', {'since': initial['token']}).json()
+        self.assertFalse(data['reset'])
+        self.assertIn('Kept and renamed', [task['title'] for task in data['changed']])
+        self.assertEqual(data['deleted'], [doomed_id])
+        self.assertNotEqual(data['token'], initial['token'])
+
+    def test_invalid_token_is_rejected(self):
+        response = self.client.get('/api/tasks/changes/', {'since': 'yesterday'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_deleting_the_user_leaves_no_tombstones(self):
+        Task.objects.create(user=self.user, title='Gone with the account')
+        self.user.delete()
+        self.assertFalse(TaskTombstone.objects.exists())
+
+
+class ConditionalGetTests(TestCase):
+    URLS = [
+        '/api/tasks/',
+        '/api/tasks/dashboard_stats/',
+        '/api/profile/me/',
+        '/api/quick-actions/',
+    ]
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user('etag', 'etag@example.com', 'password')
+        Task.objects.create(user=self.user, title='Cached')
+        self.client.force_login(self.user)
+
+    def test_unchanged_resources_return_304(self):
+        for url in self.URLS:
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, 200)
+                etag = response['ETag']
+                with CaptureQueriesContext(connection) as ctx:
+                    response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, 304)
+                self.assertEqual(response.content, b'')
+                # Only the user is loaded (joined with its profile)
+                self.assertEqual(len(ctx.captured_queries), 1)
+                self.assertIn('FROM "auth_user"', ctx.captured_queries[0]['sql'])
+
+    def test_task_change_invalidates_etag(self):
+        etag = self.client.get('/api/tasks/')['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            Task.objects.create(user=self.user, title='Another')
+        response = self.client.get('/api/tasks/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()['results']), 2)
+
+
+class TaskSearchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('searcher', 'searcher@example.com', 'password')
+        other = User.objects.create_user('nosy', 'nosy@example.com', 'password')
+        Task.objects.create(user=cls.user, title='Quarterly report', description='Finance numbers', category='work')
+        Task.objects.create(user=cls.user, title='Buy groceries', description='Report card for school', category='shopping')
+        Task.objects.create(user=cls.user, title='Gym', description='Leg day')
+        Task.objects.create(user=other, title='Report someone else wrote')
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def search(self, **params):
+        response = self.client.get('/api/tasks/search/', params)
+        self.assertEqual(response.status_code, 200)
+        return [task['title'] for task in response.json()['results']]
+
+    def test_prefix_matching_scoped_to_user(self):
+        self.assertCountEqual(self.search(q='repo'), ['Quarterly report', 'Buy groceries'])
+
+    def test_title_matches_rank_first(self):
+        self.assertEqual(self.search(q='quarterly report')[0], 'Quarterly report')
+
+    def test_combines_with_filters(self):
+        self.assertEqual(self.search(q='report', filter_type='category', filter_value='shopping'), ['Buy groceries'])
+
+    def test_search_sees_updates_and_deletes(self):
+        task = Task.objects.get(title='Gym')
+        task.description = 'Cardio and reporting'
+        task.save()
+        self.assertIn('Gym', self.search(q='reporting'))
+        task.delete()
+        self.assertEqual(self.search(q='cardio'), [])
+
+    def test_query_is_required(self):
+        self.assertEqual(self.client.get('/api/tasks/search/').status_code, 400)
+
+
+class BulkTaskOperationsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user('bulker', 'bulker@example.com', 'password')
+        self.client.force_login(self.user)
+
+    def post(self, operations):
+        return self.client.post('/api/tasks/bulk/', {'operations': operations}, content_type='application/json')
+
+    def test_mixed_operations(self):
+        edit, drop, finish = Task.objects.bulk_create(
+            [Task(user=self.user, title=title) for title in ('Edit me', 'Drop me', 'Finish me')]
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.post([
+                {'op': 'create', 'data': {'title': 'Brand new', 'priority': 'high'}},
+                {'op': 'update', 'id': edit.id, 'data': {'title': 'Edited'}},
+                {'op': 'delete', 'id': drop.id},
+                {'op': 'status', 'id': finish.id, 'status': 'completed'},
+            ])
+        self.assertEqual(response.status_code, 200)
+        results = response.json()['results']
+        self.assertEqual([r['status'] for r in results], ['created', 'updated', 'deleted', 'updated'])
+        self.assertEqual(results[0]['task']['title'], 'Brand new')
+        self.assertEqual(Task.objects.get(id=edit.id).title, 'Edited')
+        self.assertFalse(Task.objects.filter(id=drop.id).exists())
+        self.assertEqual(Task.objects.get(id=finish.id).status, 'completed')
+        self.assertTrue(TaskTombstone.objects.filter(task_id=drop.id).exists())
+        self.assertEqual(self.client.get('/api/tasks/dashboard_stats/').json()['completed_tasks'], 1)
+
+    def test_completing_many_tasks_is_a_handful_of_queries(self):
+        tasks = Task.objects.bulk_create([Task(user=self.user, title=f'Task {i}') for i in range(200)])
+        operations = [{'op': 'status', 'id': task.id, 'status': 'completed'} for task in tasks]
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.post(operations)
+        self.assertEqual(response.status_code, 200)
+        self.assertLessEqual(len([q for q in ctx.captured_queries if 'tasks_task' in q['sql']]), 2)
+        self.assertEqual(Task.objects.filter(user=self.user, status='completed').count(), 200)
+
+    def test_body_must_be_an_object(self):
+        for body in ([{'op': 'delete', 'id': 1}], 'operations', 3, None):
+            with self.subTest(body=body):
+                response = self.client.post('/api/tasks/bulk/', json.dumps(body), content_type='application/json')
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(response.json()['operations'], ['Expected a non-empty list of operations.'])
+
+    def test_any_invalid_operation_rejects_the_batch(self):
+        task = Task.objects.create(user=self.user, title='Untouched')
+        response = self.post([
+            {'op': 'status', 'id': task.id, 'status': 'completed'},
+            {'op': 'create', 'data': {'title': ''}},
+            {'op': 'delete', 'id': 999999},
+        ])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual([r['index'] for r in response.json()['results']], [1, 2])
+        self.assertEqual(Task.objects.get(id=task.id).status, 'pending')
+
+
+class QuickActionBulkTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('quick', 'quick@example.com', 'password')
+        self.client.force_login(self.user)
+
+    def post(self, url, actions):
+        return self.client.post(url, {'actions': actions}, content_type='application/json')
+
+    def create_payload(self, count):
+        return [{'label': f'Action {i}', 'icon': 'fas fa-star', 'action_type': 'filter'} for i in range(count)]
+
+    def test_reorder_query_count_is_constant(self):
+        for size in (3, 40):
+            with self.subTest(size=size):
+                QuickAction.objects.filter(user=self.user).delete()
+                actions = QuickAction.objects.bulk_create(
+                    [QuickAction(user=self.user, label=f'Action {i}', icon='fas fa-star', action_type='filter')
+                     for i in range(size)]
+                )
+                payload = [{'id': action.id, 'order': size - i} for i, action in enumerate(actions)]
+                # User, SAVEPOINT, SELECT ... FOR UPDATE, UPDATE ... CASE, RELEASE (the session is cached)
+                with self.assertNumQueries(5):
+                    response = self.post('/api/quick-actions/reorder/', payload)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(QuickAction.objects.get(id=actions[0].id).order, size)
+
+    def test_reorder_rejects_unknown_ids(self):
+        action = QuickAction.objects.create(user=self.user, label='Mine', icon='fas fa-star', action_type='filter')
+        response = self.post('/api/quick-actions/reorder/', [{'id': action.id, 'order': 9}, {'id': 999999, 'order': 1}])
+        self.assertEqual(response.status_code, 400)
+        action.refresh_from_db()
+        self.assertEqual(action.order, 0)
+
+    def test_bulk_create_query_count_is_constant(self):
+        for size in (3, 40):
+            with self.subTest(size=size):
+                QuickAction.objects.filter(user=self.user).delete()
+                # User, existing labels, SAVEPOINT, INSERT, RELEASE (the session is cached)
+                with self.assertNumQueries(5):
+                    response = self.post('/api/quick-actions/bulk_create/', self.create_payload(size))
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.json()['count'], size)
+                self.assertTrue(all(action['id'] for action in response.json()['actions']))
+
+    def test_bulk_create_is_all_or_nothing(self):
+        QuickAction.objects.filter(user=self.user).delete()
+        payload = self.create_payload(2) + [{'label': 'Action 0', 'icon': 'fas fa-star', 'action_type': 'filter'}]
+        self.assertEqual(self.post('/api/quick-actions/bulk_create/', payload).status_code, 400)
+        payload = self.create_payload(2) + [{'label': 'No icon', 'action_type': 'filter'}]
+        self.assertEqual(self.post('/api/quick-actions/bulk_create/', payload).status_code, 400)
+        self.assertFalse(QuickAction.objects.filter(user=self.user).exists())
+
+
+    def test_bulk_create_reports_labels_taken_by_a_concurrent_request(self):
+        real_check = views._duplicate_labels
+        calls = []
+
+        def duplicate_labels(user, labels):
+            calls.append(labels)
+            if len(calls) == 1:
+                # Another request inserts 'Action 1' right after this one's check
+                QuickAction.objects.create(user=user, label='Action 1', icon='fas fa-star', action_type='filter')
+                return set()
+            return real_check(user, labels)
+
+        with mock.patch('tasks.views._duplicate_labels', side_effect=duplicate_labels):
+            response = self.post('/api/quick-actions/bulk_create/', self.create_payload(3))
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {'error': "Quick actions already exist: ['Action 1']"})
+        created = QuickAction.objects.filter(user=self.user, label__startswith='Action').values_list('label', flat=True)
+        self.assertEqual(list(created), ['Action 1'])
+
+class OnboardingSignalTests(TestCase):
+    def test_new_user_gets_profile_and_default_quick_actions(self):
+        user = User.objects.create_user('newbie', 'newbie@example.com', 'password')
+        self.assertTrue(UserProfile.objects.filter(user=user).exists())
+        self.assertEqual(
+            list(QuickAction.objects.filter(user=user).values_list('label', flat=True)),
+            ['Add Task', 'Due Today', 'High Priority', 'Report'],
+        )
+
+    def test_user_save_skips_untouched_profile(self):
+        user = User.objects.get(pk=User.objects.create_user('saver', 'saver@example.com', 'password').pk)
+        with self.assertNumQueries(1):
+            user.save(update_fields=['last_login'])
+        user.profile  # load it, unchanged
+        with self.assertNumQueries(1):
+            user.save()
+
+    def test_user_save_persists_edited_profile(self):
+        user = User.objects.get(pk=User.objects.create_user('editor', 'editor@example.com', 'password').pk)
+        user.profile.display_name = 'Ed'
+        user.save()
+        self.assertEqual(UserProfile.objects.get(user=user).display_name, 'Ed')
+
+
+class ServerTimingTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('timer', 'timer@example.com', 'password', is_staff=True)
+        Task.objects.create(user=self.user, title='Timed')
+        self.client.force_login(self.user)
+
+    def timings(self, response):
+        entries = {}
+        for entry in response['Server-Timing'].split(', '):
+            name, *params = entry.split(';')
+            entries[name] = dict(param.split('=', 1) for param in params)
+        return entries
+
+    def test_api_request_reports_db_and_serialization(self):
+        # A full page, so serializing and rendering take a measurable 0.1ms
+        Task.objects.bulk_create([Task(user=self.user, title=f'Timed {i}') for i in range(49)])
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get('/api/tasks/')
+        timings = self.timings(response)
+        self.assertEqual(timings['db']['desc'], f'"{len(ctx.captured_queries)} queries"')
+        self.assertGreater(float(timings['serialize']['dur']) + float(timings['render']['dur']), 0)
+        self.assertEqual(float(timings['template']['dur']), 0)
+
+    def test_page_request_reports_template_time(self):
+        timings = self.timings(self.client.get('/tasks/'))
+        self.assertGreater(float(timings['template']['dur']), 0)
+
+    def test_header_is_only_sent_to_staff(self):
+        self.user.is_staff = False
+        self.user.save()
+        with self.assertLogs('taskflow.requests', 'INFO') as logs:
+            response = self.client.get('/api/tasks/')
+        self.assertNotIn('Server-Timing', response)
+        self.assertEqual(logs.records[0].queries, 2)
+        self.client.logout()
+        self.assertNotIn('Server-Timing', self.client.get('/login/'))
+        with override_settings(SERVER_TIMING_PUBLIC=True):
+            self.assertIn('Server-Timing', self.client.get('/login/'))
+
+    @override_settings(SLOW_REQUEST_MS=0)
+    def test_slow_requests_are_logged_with_top_queries(self):
+        with self.assertLogs('taskflow.requests', 'WARNING') as logs:
+            self.client.get('/api/tasks/')
+        record = logs.records[0]
+        self.assertEqual(record.path, '/api/tasks/')
+        self.assertEqual(record.status, 200)
+        self.assertTrue(any('tasks_task' in query['sql'] for query in record.top_queries))
+
+
+class MetricsEndpointTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user('ops', 'ops@example.com', 'password')
+
+    def sample(self, name, **labels):
+        return REGISTRY.get_sample_value(name, labels) or 0
+
+    def test_requires_staff_or_token(self):
+        self.assertEqual(self.client.get('/metrics').status_code, 403)
+        self.client.force_login(self.user)
+        self.assertEqual(self.client.get('/metrics').status_code, 403)
+        with override_settings(METRICS_TOKEN='scrape-me'):
+            self.assertEqual(self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer wrong').status_code, 403)
+            self.assertEqual(self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer scrape-me').status_code, 200)
+        self.user.is_staff = True
+        self.user.save()
+        self.assertEqual(self.client.get('/metrics').status_code, 200)
+
+    def test_records_routes_queries_and_cache_lookups(self):
+        self.client.force_login(self.user)
+        route = {'route': 'task-dashboard-stats', 'method': 'GET'}
+        requests = self.sample('taskflow_http_requests_total', status='200', **route)
+        queries = self.sample('taskflow_db_queries_per_request_count', route='task-dashboard-stats')
+        hits = self.sample('taskflow_cache_lookups_total', cache='dashboard_stats', result='hit')
+        misses = self.sample('taskflow_cache_lookups_total', cache='dashboard_stats', result='miss')
+
+        self.client.get('/api/tasks/dashboard_stats/')
+        self.client.get('/api/tasks/dashboard_stats/')
+
+        self.assertEqual(self.sample('taskflow_http_requests_total', status='200', **route), requests + 2)
+        self.assertEqual(self.sample('taskflow_db_queries_per_request_count', route='task-dashboard-stats'), queries + 2)
+        self.assertEqual(self.sample('taskflow_cache_lookups_total', cache='dashboard_stats', result='miss'), misses + 1)
+        self.assertEqual(self.sample('taskflow_cache_lookups_total', cache='dashboard_stats', result='hit'), hits + 1)
+
+        self.user.is_staff = True
+        self.user.save()
+        body = self.client.get('/metrics').content.decode()
+        self.assertIn('taskflow_http_request_duration_seconds_bucket{le="0.005",method="GET",route="task-dashboard-stats"}', body)
+
+
+class AsyncReadViewTests(TestCase):
+    PAIRS = [
+        ('/api/tasks/?page_size=2', '/api/async/tasks/?page_size=2'),
+        ('/api/tasks/?fields=id,title', '/api/async/tasks/?fields=id,title'),
+        ('/api/tasks/dashboard_stats/?breakdown=status', '/api/async/tasks/dashboard_stats/?breakdown=status'),
+        ('/api/profile/me/', '/api/async/profile/me/'),
+        ('/api/quick-actions/', '/api/async/quick-actions/'),
+    ]
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user('async', 'async@example.com', 'password')
+        Task.objects.bulk_create([Task(user=self.user, title=f'Task {i}', priority='high') for i in range(5)])
+
+    async def test_matches_sync_views(self):
+        await self.async_client.aforce_login(self.user)
+        for sync_url, async_url in self.PAIRS:
+            with self.subTest(url=async_url):
+                expected = await self.async_client.get(sync_url, headers={'Accept': 'application/json'})
+                response = await self.async_client.get(async_url)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.content.replace(b'/api/async/', b'/api/'), expected.content)
+                self.assertEqual(response['ETag'], expected['ETag'])
+                not_modified = await self.async_client.get(async_url, headers={'If-None-Match': expected['ETag']})
+                self.assertEqual(not_modified.status_code, 304)
+
+    @override_settings(SERVER_TIMING_PUBLIC=True)
+    async def test_queries_are_counted_in_server_timing(self):
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.get('/api/async/tasks/')
+        # User (the session is cached) and the page of tasks
+        self.assertIn('db;dur=', response['Server-Timing'])
+        self.assertIn('desc="2 queries"', response['Server-Timing'])
+
+    async def test_cursor_pages_through_all_tasks(self):
+        await self.async_client.aforce_login(self.user)
+        url, titles = '/api/async/tasks/?page_size=2', []
+        while url:
+            page = (await self.async_client.get(url)).json()
+            titles += [task['title'] for task in page['results']]
+            url = page['next']
+        self.assertEqual(sorted(titles), [f'Task {i}' for i in range(5)])
+
+    async def test_requires_login_and_get(self):
+        self.assertEqual((await self.async_client.get('/api/async/tasks/')).status_code, 403)
+        await self.async_client.aforce_login(self.user)
+        self.assertEqual((await self.async_client.post('/api/async/tasks/')).status_code, 405)
+
+
+class TaskEventsTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('events', 'events@example.com', 'password')
+
+    def write(self, func):
+        with self.captureOnCommitCallbacks(execute=True):
+            func()
+
+    async def drain(self, subscription):
+        messages = []
+        while (message := await subscription.get(0.05)) is not None:
+            messages.append(message)
+        return messages
+
+    def test_wsgi_gets_no_content(self):
+        self.client.force_login(self.user)
+        self.assertEqual(self.client.get('/api/events/').status_code, 204)
+
+    async def test_requires_login(self):
+        self.assertEqual((await self.async_client.get('/api/events/')).status_code, 403)
+
+    async def test_stream_response(self):
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.get('/api/events/')
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        self.assertEqual(response['Cache-Control'], 'no-cache')
+
+    async def test_stream_pushes_committed_changes(self):
+        # Iterated directly so the stream can be closed before the test's event loop goes away
+        async with aclosing(_event_stream(self.user.pk)) as stream:
+            self.assertEqual(await anext(stream), 'retry: 5000\n\n')
+
+            task = await sync_to_async(Task.objects.create)(user=self.user, title='Pushed')
+            await sync_to_async(self.write)(lambda: task.save())
+            saved = await anext(stream)
+            self.assertTrue(saved.startswith('event: task.saved\ndata: {"task":{"id":%d,"title":"Pushed"' % task.id))
+            self.assertEqual(await anext(stream), 'event: stats.changed\ndata: {}\n\n')
+
+            task_id = task.id
+            await sync_to_async(self.write)(lambda: task.delete())
+            self.assertEqual(await anext(stream), 'event: task.deleted\ndata: {"id":%d}\n\n' % task_id)
+
+    async def test_batched_changes_send_one_resync(self):
+        def bulk_write():
+            with batched_task_changes():
+                for i in range(3):
+                    Task.objects.create(user=self.user, title=f'Batch {i}')
+
+        async with get_broker().subscribe(self.user.pk) as subscription:
+            await sync_to_async(self.write)(bulk_write)
+            events = [message['event'] for message in await self.drain(subscription)]
+        self.assertEqual(events, ['tasks.sync', 'stats.changed'])
+
+    async def test_slow_subscriber_is_told_to_resync(self):
+        async with get_broker().subscribe(self.user.pk) as subscription:
+            for i in range(SUBSCRIPTION_BUFFER + 1):
+                get_broker().publish(self.user.pk, {'event': 'task.deleted', 'data': {'id': i}})
+            self.assertEqual(await self.drain(subscription), [RESYNC])
+
+
+class ProfilePhotoTests(TestCase):
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        self.enterContext(override_settings(MEDIA_ROOT=media_root))
+        self.user = User.objects.create_user('photo', 'photo@example.com', 'password')
+        self.client.force_login(self.user)
+
+    def upload(self, size=(2000, 1500), color='red', orientation=None):
+        exif = Image.Exif()
+        exif[0x010F] = 'Camera maker'
+        if orientation:
+            exif[0x0112] = orientation
+        buffer = io.BytesIO()
+        Image.new('RGB', size, color).save(buffer, 'JPEG', exif=exif)
+        photo = SimpleUploadedFile('holiday.jpg', buffer.getvalue(), content_type='image/jpeg')
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch('/api/profile/update_profile/', encode_multipart(BOUNDARY, {'profile_photo': photo}),
+                                         content_type=MULTIPART_CONTENT)
+        self.assertEqual(response.status_code, 200)
+        return UserProfile.objects.get(user=self.user)
+
+    def test_upload_is_replaced_by_processed_variants(self):
+        profile = self.upload(orientation=6)  # rotated 90 degrees
+        self.assertEqual(set(profile.photo_variants), {'1024', '256', '64'})
+        self.assertEqual(profile.profile_photo.name, profile.photo_variants['1024']['jpeg'])
+        self.assertFalse(default_storage.exists(f'profile_photos/{self.user.id}/holiday.jpg'))
+
+        expected_sizes = {'1024': (768, 1024), '256': (256, 256), '64': (64, 64)}
+        for size, formats in profile.photo_variants.items():
+            for fmt, name in formats.items():
+                with default_storage.open(name) as stored, Image.open(stored) as image:
+                    self.assertEqual(image.format, fmt.upper())
+                    self.assertEqual(image.size, expected_sizes[size])
+                    self.assertEqual(len(image.getexif()), 0)
+
+    def test_replacing_photo_removes_previous_variants(self):
+        previous = self.upload().photo_variants
+        current = self.upload(color='blue').photo_variants
+        for formats in previous.values():
+            for name in formats.values():
+                self.assertFalse(default_storage.exists(name))
+        self.assertTrue(default_storage.exists(current['64']['webp']))
+
+    def test_failed_upload_is_not_queued_again(self):
+        previous = self.upload().photo_variants
+        with mock.patch('tasks.photos.MAX_PIXELS', 100), self.assertLogs('tasks.photos', 'WARNING'):
+            profile = self.upload()
+        self.assertEqual(profile.photo_variants, {'failed': profile.profile_photo.name})
+        self.assertFalse(any(default_storage.exists(name) for formats in previous.values() for name in formats.values()))
+        self.assertEqual(self.client.get('/api/profile/me/').json()['profile_photo_variants'], {})
+
+        with mock.patch('tasks.signals.schedule_photo_processing') as schedule, \
+                self.captureOnCommitCallbacks(execute=True):
+            profile.bio = 'Saved again'
+            profile.save()
+        schedule.assert_not_called()
+
+    def test_variants_are_served_with_far_future_caching(self):
+        self.upload()
+        profile = self.client.get('/api/profile/me/').json()
+        self.assertEqual(profile['profile_photo_url'], profile['profile_photo_variants']['1024']['jpeg'])
+
+        response = self.client.get(profile['profile_photo_variants']['64']['webp'])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'image/webp')
+        self.assertEqual(response['Cache-Control'], 'public, max-age=31536000, immutable')
+        self.assertTrue(b''.join(response.streaming_content))
+        response.close()
+        self.assertEqual(self.client.get(f'/photos/profile_photos/{self.user.id}/holiday.jpg').status_code, 404)
+
+
+class EmailBackendTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('mixed', 'Mixed.Case@Example.com', 'password')
+
+    def test_login_ignores_email_case(self):
+        response = self.client.post('/login/', {'email': ' mixed.case@example.COM ', 'password': 'password'})
+        self.assertRedirects(response, '/', fetch_redirect_response=False)
+        self.assertEqual(int(self.client.session['_auth_user_id']), self.user.pk)
+
+    def test_wrong_password_is_rejected(self):
+        response = self.client.post('/login/', {'email': 'mixed.case@example.com', 'password': 'wrong'})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('_auth_user_id', self.client.session)
+
+    def test_authenticate_is_a_single_indexed_lookup(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(authenticate(None, email='MIXED.CASE@example.com', password='password'), self.user)
+        if connection.vendor != 'sqlite':
+            self.skipTest(f'No EXPLAIN check for {connection.vendor}')
+        sql, params = users_with_email('mixed.case@example.com').query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute('EXPLAIN QUERY PLAN ' + sql, params)
+            plan = [row[-1] for row in cursor.fetchall()]
+        self.assertEqual(plan, ['SEARCH auth_user USING INDEX auth_user_email_ci_uniq (<expr>=?)'])
+
+    def test_emails_are_unique_ignoring_case(self):
+        response = self.client.post('/signup/', {
+            'username': 'copycat', 'email': 'MIXED.case@example.com', 'password': 'pw', 'password2': 'pw',
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(User.objects.filter(username='copycat').exists())
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            User.objects.create_user('racer', 'mixed.CASE@example.com', 'password')
+        # Blank emails don't collide
+        User.objects.create_user('blank1', '', 'password')
+        User.objects.create_user('blank2', '', 'password')
+
+    def test_update_user_rejects_taken_email(self):
+        other = User.objects.create_user('other', 'other@example.com', 'password')
+        self.client.force_login(other)
+        response = self.client.patch('/api/auth/update_user/', {'email': 'MIXED.CASE@example.com'},
+                                     content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        other.refresh_from_db()
+        self.assertEqual(other.email, 'other@example.com')
+
+
+    def test_update_user_normalizes_email(self):
+        self.client.force_login(self.user)
+        for email in ('   ', 42, ['x@example.com']):
+            with self.subTest(email=email):
+                response = self.client.patch('/api/auth/update_user/', {'email': email}, content_type='application/json')
+                self.assertEqual(response.status_code, 400)
+        response = self.client.patch('/api/auth/update_user/', {'email': ' mixed.case@EXAMPLE.com '},
+                                     content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.email, 'Mixed.Case@example.com')
+        response = self.client.patch('/api/auth/update_user/', {'email': ' new@example.com '},
+                                     content_type='application/json')
+        self.assertEqual(response.json()['user']['email'], 'new@example.com')
+
+class ProfileLoadingTests(TestCase):
+    def setUp(self):
+        # Like accounts created before profiles existed: no profile, no quick actions
+        self.user = User.objects.create_user('loader', 'loader@example.com', 'password')
+        UserProfile.objects.filter(user=self.user).delete()
+        QuickAction.objects.filter(user=self.user).delete()
+
+    def test_missing_profile_is_created_on_demand(self):
+        self.client.force_login(self.user)
+        response = self.client.patch('/api/auth/update_user/', {'first_name': 'Lou'}, content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(UserProfile.objects.filter(user=self.user).exists())
+        self.assertEqual(self.client.get('/api/profile/me/').json()['name'], 'Lou')
+        self.assertTrue(UserProfile.objects.filter(user=self.user).exists())
+
+    async def test_async_profile_is_created_on_demand(self):
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.get('/api/async/profile/me/')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(await UserProfile.objects.filter(user=self.user).aexists())
+
+
+class TaskExportTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('exporter', 'exporter@example.com', 'password')
+        Task.objects.bulk_create([
+            Task(user=self.user, title=f'Task {i}', description='line one\nline "two", three',
+                 priority='high' if i % 2 else 'low', due_date=timezone.localdate() if i == 0 else None)
+            for i in range(5)
+        ])
+        User.objects.create_user('neighbour', 'neighbour@example.com', 'password').tasks.create(title='Not mine')
+        self.client.force_login(self.user)
+
+    def download(self, **params):
+        response = self.client.get('/api/tasks/export/', params)
+        self.assertEqual(response.status_code, 200)
+        return response, b''.join(response.streaming_content).decode()
+
+    def test_csv_export(self):
+        response, body = self.download()
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+        self.assertIn('attachment; filename="tasks-', response['Content-Disposition'])
+        rows = list(csv.DictReader(io.StringIO(body)))
+        self.assertEqual([row['title'] for row in rows], [f'Task {i}' for i in range(5)])
+        self.assertEqual(rows[0]['description'], 'line one\nline "two", three')
+        self.assertEqual(rows[0]['due_date'], timezone.localdate().isoformat())
+        self.assertEqual(rows[1]['due_date'], '')
+
+    def test_ndjson_export_matches_api_representation(self):
+        response, body = self.download(output='ndjson', filter_type='priority', filter_value='high')
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson; charset=utf-8')
+        exported = [json.loads(line) for line in body.splitlines()]
+        self.assertEqual([task['title'] for task in exported], ['Task 1', 'Task 3'])
+        api_task = self.client.get(f"/api/tasks/{exported[0]['id']}/", HTTP_ACCEPT='application/json').json()
+        self.assertEqual(exported[0], {field: api_task[field] for field in EXPORT_FIELDS})
+
+    def test_rejects_unknown_output(self):
+        self.assertEqual(self.client.get('/api/tasks/export/', {'output': 'xml'}).status_code, 400)
+
+    async def test_streams_batches_under_asgi(self):
+        await self.async_client.aforce_login(self.user)
+        expected = await sync_to_async(self.download)(output='ndjson')
+        with mock.patch.object(TaskViewSet, 'export_chunk_size', 2), \
+                mock.patch('tasks.export._fetch_batch', wraps=export._fetch_batch) as fetch_batch:
+            response = await self.async_client.get('/api/tasks/export/', {'output': 'ndjson'})
+            self.assertTrue(response.is_async)
+            chunks, fetched = [], []
+            async for chunk in response.streaming_content:
+                chunks.append(chunk)
+                fetched.append(fetch_batch.call_count)
+        self.assertEqual(b''.join(chunks).decode(), expected[1])
+        # 2 + 2 + 1 rows, each batch sent before the next one is read
+        self.assertEqual(fetched, [1, 2, 3])
+
+    def test_reads_in_bounded_batches(self):
+        # 2 + 2 + 1 rows
+        with self.assertNumQueries(3):
+            lines = ''.join(export_tasks(Task.objects.filter(user=self.user), 'ndjson', chunk_size=2)).splitlines()
+        self.assertEqual([json.loads(line)['title'] for line in lines], [f'Task {i}' for i in range(5)])
+
+    def test_export_command(self):
+        stdout = io.StringIO()
+        call_command('export_tasks', 'EXPORTER@example.com', '--format', 'ndjson', '--filter-type', 'priority',
+                     '--filter-value', 'low', stdout=stdout)
+        self.assertEqual([json.loads(line)['title'] for line in stdout.getvalue().splitlines()],
+                         ['Task 0', 'Task 2', 'Task 4'])
+
+
+class FastTaskListTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('reader', 'reader@example.com', 'password')
+        Task.objects.bulk_create([
+            Task(user=self.user, title=f'Tâche {i} 📋', description='line\u2028separated\x01 "quoted" </script>',
+                 category='work', due_date=timezone.localdate() if i % 2 else None)
+            for i in range(4)
+        ])
+        self.client.force_login(self.user)
+
+    def serializer_bytes(self, fields=None):
+        tasks = Task.objects.filter(user=self.user).order_by('-created_at', '-id')
+        data = {'next': None, 'previous': None, 'results': TaskSerializer(tasks, many=True, fields=fields).data}
+        return JSONRenderer().render(data)
+
+    def test_list_is_byte_identical_to_serializer_output(self):
+        for query, fields in (('', None), ('?fields=title,due_date,updated_at', ['title', 'due_date', 'updated_at'])):
+            with self.subTest(query=query):
+                response = self.client.get(f'/api/tasks/{query}', HTTP_ACCEPT='application/json')
+                self.assertEqual(response.content, self.serializer_bytes(fields))
+
+    def test_unknown_fields_are_rejected(self):
+        for url in ('/api/tasks/', '/api/async/tasks/'):
+            with self.subTest(url=url):
+                response = self.client.get(url, {'fields': 'id,titel'}, HTTP_ACCEPT='application/json')
+                self.assertEqual(response.status_code, 400)
+                self.assertNotIn('ETag', response)
+                self.assertEqual(response.json()['fields'], [
+                    'Unknown fields: titel. Allowed fields: id, title, description, status, priority, '
+                    'category, due_date, created_at, updated_at, user.'
+                ])
+
+    def test_representation_follows_current_time_zone(self):
+        tasks = Task.objects.filter(user=self.user)
+        with timezone.override('America/New_York'):
+            self.assertEqual(task_representations(task_values(tasks)), TaskSerializer(tasks, many=True).data)
+
+    def test_renderer_matches_drf(self):
+        data = {
+            'text': 'é\u2028\u2029\x00\x7f/"\\', 1: None, 'when': timezone.now(), 'day': timezone.localdate(),
+            'big': 2 ** 70, 'nested': [{'ok': True}, ()],
+        }
+        for accept in (None, 'application/json; indent=2'):
+            with self.subTest(accept=accept):
+                self.assertEqual(FastJSONRenderer().render(data, accept), JSONRenderer().render(data, accept))
+
+
+class TaskImportTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('importer', 'importer@example.com', 'password')
+        self.client.force_login(self.user)
+
+    def upload(self, body, content_type):
+        response = self.client.post('/api/tasks/import/', body, content_type=content_type)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+
+    def test_csv_import_reports_invalid_rows(self):
+        body = ('title,description,priority,due_date\r\n'
+                'First,"spans\r\ntwo lines",high,2030-01-01\r\n'
+                ',no title,low,\r\n'
+                'Third,,urgent,\r\n'
+                'Fourth,,,\r\n')
+        result = self.upload(body.encode('utf-8-sig'), 'text/csv; charset=utf-8')
+        self.assertEqual((result['created'], result['failed']), (2, 2))
+        self.assertEqual([error['line'] for error in result['errors']], [4, 5])
+        self.assertIn('title', result['errors'][0]['errors'])
+        self.assertIn('priority', result['errors'][1]['errors'])
+
+        first, fourth = Task.objects.filter(user=self.user).order_by('id')
+        self.assertEqual((first.title, first.description, first.due_date.isoformat()),
+                         ('First', 'spans\r\ntwo lines', '2030-01-01'))
+        self.assertEqual((fourth.priority, fourth.due_date), ('medium', None))
+
+    def test_ndjson_import(self):
+        body = '{"title": "One", "status": "completed"}\n\nnot json\n[1, 2]\n{"title": "Two"}'
+        result = self.upload(body, 'application/x-ndjson')
+        self.assertEqual((result['created'], result['failed']), (2, 2))
+        self.assertEqual([error['line'] for error in result['errors']], [3, 4])
+        self.assertEqual(list(Task.objects.filter(user=self.user).order_by('id').values_list('title', 'status')),
+                         [('One', 'completed'), ('Two', 'pending')])
+
+    def test_rejects_other_content_types(self):
+        response = self.client.post('/api/tasks/import/', {'title': 'x'}, content_type='application/json')
+        self.assertEqual(response.status_code, 415)
+
+    def test_invalid_encoding_stops_the_import(self):
+        response = self.client.post('/api/tasks/import/', b'title\nKept\n\xff\n', content_type='text/csv')
+        self.assertEqual(response.status_code, 400)
+
+    def test_inserts_in_chunks_and_invalidates_once(self):
+        lines = [json.dumps({'title': f'Task {i}'}) + '\n' for i in range(5)]
+        with CaptureQueriesContext(connection) as ctx, self.captureOnCommitCallbacks(execute=True) as callbacks:
+            result = import_tasks(self.user, lines, 'ndjson', chunk_size=2)
+        self.assertEqual(result.created, 5)
+        inserts = [query['sql'] for query in ctx.captured_queries if query['sql'].startswith('INSERT')]
+        self.assertEqual(len(inserts), 3)
+        self.assertEqual(len(callbacks), 1)
+
+    def test_line_reader_handles_split_blocks(self):
+        data = 'a,b\r\nc,\u00e9\r\nend'.encode()
+        stream = io.BytesIO(data)
+        stream.read = lambda size, read=stream.read: read(3)
+        self.assertEqual(list(iter_lines(stream)), ['a,b\r\n', 'c,\u00e9\r\n', 'end'])
+
+    def test_export_round_trip_command(self):
+        Task.objects.create(user=self.user, title='Exported', priority='high', category='work')
+        with tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False) as output:
+            path = output.name
+        self.addCleanup(os.remove, path)
+        call_command('export_tasks', 'importer@example.com', '--output', path, stderr=io.StringIO())
+        stderr = io.StringIO()
+        call_command('import_tasks', 'IMPORTER@example.com', path, stderr=stderr)
+        self.assertIn('Imported 1 tasks', stderr.getvalue())
+        self.assertEqual(list(Task.objects.filter(title='Exported').values_list('priority', 'category')),
+                         [('high', 'work')] * 2)
+
+
+class TaskPageDataTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('page', 'page@example.com', 'password')
+        Task.objects.bulk_create([Task(user=self.user, title=f'Task {i}') for i in range(60)])
+        self.client.force_login(self.user)
+
+    def page_data(self, params=None):
+        response = self.client.get('/', params)
+        return response.context['page_data'], response.content.decode()
+
+    def api(self, url):
+        return self.client.get(url, HTTP_ACCEPT='application/json').json()
+
+    def test_embeds_the_first_api_responses(self):
+        data, html = self.page_data()
+        self.assertIn('<script id="task-page-data" type="application/json">', html)
+        embedded = json.loads(html.split('type="application/json">')[1].split('</script>')[0])
+        self.assertEqual(embedded['tasks'], self.api('/api/tasks/'))
+        self.assertEqual(embedded['stats'], self.api('/api/tasks/dashboard_stats/'))
+        self.assertEqual(embedded['profile'], self.api('/api/profile/me/'))
+        self.assertEqual(embedded['quick_actions'], self.api('/api/quick-actions/'))
+        self.assertTrue(data['tasks']['next'].startswith('http://testserver/api/tasks/?cursor='))
+        self.assertTrue(data['sync_token'])
+
+    def test_ignores_the_page_query_string(self):
+        first_page = self.api('/api/tasks/')
+        cursor = first_page['next'].split('cursor=')[1]
+        for params in ({'page_size': 5000}, {'page_size': 2}, {'cursor': cursor}):
+            with self.subTest(params=params):
+                data, _ = self.page_data(params)
+                self.assertEqual(data['tasks'], first_page)
+
+    def test_query_count(self):
+        cache.clear()
+        self.client.session.load()
+        # user and profile, first page of tasks, stats and quick actions
+        with self.assertNumQueries(4):
+            self.page_data()
+        # the stats are cached now
+        with self.assertNumQueries(3):
+            self.page_data()
+
+
+class StaticAssetsTests(TestCase):
+    def test_task_page_is_a_shell(self):
+        user = User.objects.create_user('shell', 'shell@example.com', 'password')
+        self.client.force_login(user)
+        html = self.client.get('/').content.decode()
+        self.assertNotIn('<style>', html)
+        self.assertIn('/static/css/task_list.css', html)
+        self.assertIn(f'src="/static/js/task_list.js" data-user-id="{user.id}" data-user-email="shell@example.com"', html)
+
+    def test_collectstatic_minifies_before_hashing(self):
+        static_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, static_root)
+        storages = {**settings.STORAGES, 'staticfiles': {'BACKEND': 'tasks.storage.MinifiedStaticFilesStorage'}}
+        # Only the project's own static files, not those of installed apps
+        finders = ['django.contrib.staticfiles.finders.FileSystemFinder']
+        with override_settings(STATIC_ROOT=static_root, STORAGES=storages, STATICFILES_FINDERS=finders):
+            call_command('collectstatic', interactive=False, verbosity=0)
+
+        with open(os.path.join(static_root, 'staticfiles.json')) as manifest:
+            hashed_name = json.load(manifest)['paths']['js/task_list.js']
+        with open(os.path.join(static_root, hashed_name), 'rb') as hashed:
+            content = hashed.read()
+        with open(settings.BASE_DIR / 'static/js/task_list.js', 'rb') as source:
+            self.assertLess(len(content), len(source.read()) * 0.8)
+        self.assertIn(hashlib.md5(content).hexdigest()[:12], hashed_name)
+        for suffix in ('.gz', '.br'):
+            self.assertTrue(os.path.exists(os.path.join(static_root, hashed_name + suffix)))
@@ -0,0 +1,242 @@
+"""Query-count and latency regression tests for every route in tasks/urls.py.
+
+Query counts are pinned per route and must be identical for a small and a
+large dataset. Latencies are compared against perf_baseline.json; refresh it
+after an intentional change with
+
+    TASKFLOW_PERF_UPDATE_BASELINE=1 python manage.py test tasks.tests.test_performance --settings=taskmanager.settings_test
+"""
+import json
+import os
+import statistics
+import time
+from collections import namedtuple
+from datetime import timedelta
+from pathlib import Path
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from tasks.models import QuickAction, Task, TaskTombstone
+from tasks.sync import make_sync_token
+from tasks.urls import router, urlpatterns
+
+BASELINE_FILE = Path(__file__).with_name('perf_baseline.json')
+
+# An endpoint fails when its median time exceeds baseline * factor + slack
+LATENCY_FACTOR = float(os.environ.get('TASKFLOW_PERF_FACTOR', '2.5'))
+LATENCY_SLACK_MS = float(os.environ.get('TASKFLOW_PERF_SLACK_MS', '10'))
+LATENCY_RUNS = 5
+
+SMALL, LARGE = 5, 2000
+
+Route = namedtuple('Route', 'url_name method kwargs data queries content_type', defaults=['application/json'])
+
+
+def task_id(case):
+    return {'pk': case.task.pk}
+
+
+def profile_id(case):
+    return {'pk': case.user.profile.pk}
+
+
+def quick_action_id(case):
+    return {'pk': case.quick_action.pk}
+
+
+def bulk_payload(case):
+    return {'operations': [{'op': 'status', 'id': pk, 'status': 'completed'} for pk in case.task_ids]}
+
+
+def reorder_payload(case):
+    return {'actions': [{'id': pk, 'order': order} for order, pk in enumerate(reversed(case.quick_action_ids))]}
+
+
+def bulk_create_payload(case):
+    # Capped so SQLite's 999 parameter limit doesn't split the INSERT
+    return {'actions': [{'label': f'New {i}', 'icon': 'fas fa-star', 'action_type': 'filter'}
+                        for i in range(min(case.batch, 50))]}
+
+
+def new_task(case):
+    return {'title': 'Benchmark task', 'priority': 'high', 'category': 'work'}
+
+
+def updated_task(case):
+    return {'title': 'Renamed', 'description': '', 'status': 'completed', 'priority': 'low', 'category': 'other'}
+
+
+def changes_params(case):
+    return {'since': make_sync_token(timezone.now() - timedelta(minutes=1))}
+
+
+def export_params(case):
+    return {'output': 'ndjson', 'filter_type': 'status', 'filter_value': 'pending'}
+
+
+def import_payload(case):
+    # Capped so SQLite's 999 parameter limit doesn't split the INSERT
+    return ''.join(json.dumps({'title': f'Imported {i}', 'priority': 'high', 'due_date': '2030-01-01'}) + '\n'
+                   for i in range(min(case.batch, 50)))
+
+
+# Every request pays 1 query for the user and profile; the session comes from the cache
+ROUTES = [
+    Route('api-root', 'get', None, None, 1),
+    Route('task-list', 'get', None, None, 2),
+    Route('task-list', 'post', None, new_task, 2),
+    Route('task-detail', 'get', task_id, None, 2),
+    Route('task-detail', 'put', task_id, updated_task, 3),
+    Route('task-detail', 'patch', task_id, lambda case: {'status': 'in_progress'}, 3),
+    Route('task-detail', 'delete', task_id, None, 4),
+    Route('task-dashboard-stats', 'get', None, lambda case: {'breakdown': 'priority,category'}, 2),
+    Route('task-filter-tasks', 'get', None, lambda case: {'filter_type': 'due_date', 'filter_value': 'overdue'}, 2),
+    Route('task-search', 'get', None, lambda case: {'q': 'report'}, 3),
+    Route('task-bulk', 'post', None, bulk_payload, 5),
+    Route('task-changes', 'get', None, changes_params, 3),
+    Route('task-export', 'get', None, export_params, 2),
+    Route('task-import', 'post', None, import_payload, 4, 'application/x-ndjson'),
+    Route('userprofile-list', 'get', None, None, 3),
+    Route('userprofile-detail', 'get', profile_id, None, 1),
+    Route('userprofile-detail', 'patch', profile_id, lambda case: {'bio': 'Benchmarks'}, 2),
+    Route('userprofile-me', 'get', None, None, 1),
+    Route('userprofile-update-profile', 'patch', None, lambda case: {'display_name': 'Bench'}, 2),
+    Route('userprofile-change-password', 'post', None,
+          lambda case: {'current_password': 'password', 'new_password': 'new-password'}, 2),
+    Route('quickaction-list', 'get', None, None, 2),
+    Route('quickaction-list', 'post', None,
+          lambda case: {'label': 'Single', 'icon': 'fas fa-star', 'action_type': 'filter'}, 2),
+    Route('quickaction-detail', 'get', quick_action_id, None, 2),
+    Route('quickaction-detail', 'patch', quick_action_id, lambda case: {'label': 'Renamed'}, 3),
+    Route('quickaction-detail', 'delete', quick_action_id, None, 3),
+    Route('quickaction-reorder', 'post', None, reorder_payload, 5),
+    Route('quickaction-bulk-create', 'post', None, bulk_create_payload, 5),
+    Route('update_user', 'patch', None, lambda case: {'first_name': 'Bench'}, 2),
+    Route('task_list', 'get', None, None, 4),
+    Route('async-task-list', 'get', None, None, 2),
+    Route('async-task-dashboard-stats', 'get', None, lambda case: {'breakdown': 'priority,category'}, 2),
+    Route('async-userprofile-me', 'get', None, None, 1),
+    Route('async-quickaction-list', 'get', None, None, 2),
+    # The WSGI test client gets the 204 fallback rather than a stream
+    Route('task-events', 'get', None, None, 1),
+]
+
+
+class RouteFixture:
+    """A user with `size` tasks, quick actions and tombstones, plus a noisy neighbour"""
+
+    size = LARGE
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.batch = min(cls.size, 200)
+        cls.user = User.objects.create_user('perf', 'perf@example.com', 'password')
+        neighbour = User.objects.create_user('neighbour', 'neighbour@example.com', 'password')
+        now = timezone.now()
+        tasks = []
+        for owner in (cls.user, neighbour):
+            for i in range(cls.size):
+                tasks.append(Task(
+                    user=owner,
+                    title=f'Quarterly report {i}' if i % 10 == 0 else f'Task {i}',
+                    description='Numbers for the board' if i % 7 == 0 else '',
+                    status=['pending', 'in_progress', 'completed'][i % 3],
+                    priority=['low', 'medium', 'high'][i % 3],
+                    category=['work', 'personal', 'health', 'shopping'][i % 4],
+                    due_date=(now + timedelta(days=i % 30 - 15)).date(),
+                ))
+        Task.objects.bulk_create(tasks)
+        # Only a bounded slice has changed recently, so /changes/ returns a patch rather than a reset
+        Task.objects.update(updated_at=now - timedelta(days=1))
+        TaskTombstone.objects.bulk_create(
+            [TaskTombstone(user=cls.user, task_id=10_000_000 + i) for i in range(cls.batch)]
+        )
+        QuickAction.objects.bulk_create(
+            [QuickAction(user=cls.user, label=f'Action {i}', icon='fas fa-star', action_type='filter', order=i)
+             for i in range(cls.batch)]
+        )
+
+        own_tasks = Task.objects.filter(user=cls.user).order_by('id')
+        cls.task = own_tasks.first()
+        cls.task_ids = list(own_tasks.values_list('id', flat=True)[:cls.batch])
+        Task.objects.filter(id__in=cls.task_ids).update(updated_at=now)
+        cls.quick_action_ids = list(QuickAction.objects.filter(user=cls.user).values_list('id', flat=True))
+        cls.quick_action = QuickAction.objects.get(pk=cls.quick_action_ids[0])
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def call(self, route):
+        url = reverse(route.url_name, kwargs=route.kwargs(self) if route.kwargs else None)
+        data = route.data(self) if route.data else None
+        if route.method == 'get':
+            return self.client.get(url, data)
+        return getattr(self.client, route.method)(url, data, content_type=route.content_type)
+
+    def measure(self, route):
+        """Call a route on a cold cache, roll back whatever it wrote and return (seconds, queries)"""
+        cache.clear()
+        self.client.session.load()  # a logged-in user's session is normally cached
+        with transaction.atomic():
+            with CaptureQueriesContext(connection) as ctx:
+                start = time.perf_counter()
+                response = self.call(route)
+                body = b''.join(response.streaming_content) if response.streaming else response.content
+                elapsed = time.perf_counter() - start
+            transaction.set_rollback(True)
+        self.assertLess(response.status_code, 400, f'{route.method.upper()} {route.url_name}: {body[:200]}')
+        return elapsed, [query['sql'] for query in ctx.captured_queries]
+
+
+# Files served from media storage without touching the database (see ProfilePhotoTests)
+UNMEASURED = {'profile-photo'}
+
+
+class RouteCoverageTests(TestCase):
+    def test_every_route_is_covered(self):
+        names = {pattern.name for pattern in [*router.urls, *urlpatterns] if getattr(pattern, 'name', None)}
+        self.assertEqual(names - UNMEASURED - {route.url_name for route in ROUTES}, set())
+
+
+class QueryCountTests(RouteFixture):
+    def test_query_counts(self):
+        for route in ROUTES:
+            with self.subTest(route=f'{route.method.upper()} {route.url_name}', size=self.size):
+                _, queries = self.measure(route)
+                self.assertEqual(len(queries), route.queries, '\n'.join(queries))
+
+
+class SmallDatasetQueryCountTests(QueryCountTests, TestCase):
+    size = SMALL
+
+
+class LargeDatasetQueryCountTests(QueryCountTests, TestCase):
+    size = LARGE
+
+
+class LatencyRegressionTests(RouteFixture, TestCase):
+    def test_latency_against_baseline(self):
+        timings = {}
+        for route in ROUTES:
+            key = f'{route.method.upper()} {route.url_name}'
+            self.measure(route)  # warm up imports, templates and prepared statements
+            runs = [self.measure(route)[0] for _ in range(LATENCY_RUNS)]
+            timings[key] = round(statistics.median(runs) * 1000, 2)
+
+        if os.environ.get('TASKFLOW_PERF_UPDATE_BASELINE'):
+            BASELINE_FILE.write_text(json.dumps({'size': LARGE, 'median_ms': timings}, indent=2) + '\n')
+            return
+
+        baseline = json.loads(BASELINE_FILE.read_text())['median_ms']
+        for key, elapsed in timings.items():
+            with self.subTest(route=key):
+                if key not in baseline:
+                    self.fail('No baseline; set TASKFLOW_PERF_UPDATE_BASELINE=1 to record one')
+                limit = baseline[key] * LATENCY_FACTOR + LATENCY_SLACK_MS
+                self.assertLessEqual(elapsed, limit, f'{key} took {elapsed}ms, baseline {baseline[key]}ms')
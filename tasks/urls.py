@@ -1,5 +1,7 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
+from . import async_views
+from .photos import photo_view
 from .views import TaskViewSet, UserProfileViewSet, QuickActionViewSet, task_list, update_user
 
 router = DefaultRouter()
@@ -9,6 +11,12 @@ router.register(r'quick-actions', QuickActionViewSet, basename='quickaction')
 
 urlpatterns = [
     path('api/', include(router.urls)),
+    path('api/async/tasks/', async_views.task_list, name='async-task-list'),
+    path('api/async/tasks/dashboard_stats/', async_views.dashboard_stats, name='async-task-dashboard-stats'),
+    path('api/async/profile/me/', async_views.profile_me, name='async-userprofile-me'),
+    path('api/async/quick-actions/', async_views.quick_action_list, name='async-quickaction-list'),
+    path('api/events/', async_views.task_events, name='task-events'),
+    path('photos/<path:name>', photo_view, name='profile-photo'),
     path('api/auth/update_user/', update_user, name='update_user'),
     path('tasks/', task_list, name='task_list'),
 ] 
\ No newline at end of file
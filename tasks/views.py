@@ -3,9 +3,11 @@ from django.contrib.auth import login, logout, authenticate
 from django.contrib.auth.models import User
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
-from django.http import JsonResponse
+from django.core.handlers.asgi import ASGIRequest
+from django.http import JsonResponse, StreamingHttpResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
+from django.db import IntegrityError, connection, transaction
 from django.db.models import Q, Count
 from django.utils import timezone
 from datetime import datetime, timedelta
@@ -15,21 +17,65 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.decorators import api_view, permission_classes, action
 from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
-from .models import Task, UserProfile, QuickAction
-from .serializers import TaskSerializer, UserProfileSerializer, QuickActionSerializer
+from .models import Task, TaskTombstone, UserProfile, QuickAction
+from .serializers import TaskSerializer, UserProfileSerializer, QuickActionSerializer, QuickActionOrderSerializer, requested_task_fields
+from .pagination import TaskCursorPagination, TaskSearchPagination
+from .cache import TASKS, PROFILE, QUICK_ACTIONS
+from .etags import versioned_etag
+from .export import EXPORT_CHUNK_SIZE, EXPORT_FORMATS, aexport_tasks, export_tasks
+from .filters import apply_task_filter
+from .imports import IMPORT_FORMATS, TaskImportError, import_tasks, iter_lines
+from .representation import task_representations, task_values
+from .search import search_tasks
+from .backends import users_with_email
+from .bootstrap import task_page_data
+from .bulk import BulkTaskOperations
+from .signals import quick_actions_changed
+from .stats import get_dashboard_stats, parse_breakdowns
+from .sync import SYNC_MAX_CHANGES, SYNC_OVERLAP, TOMBSTONE_RETENTION, make_sync_token, parse_sync_token
 
 # Create your views here.
 
 class TaskViewSet(viewsets.ModelViewSet):
     serializer_class = TaskSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = TaskCursorPagination
+    # Rows read per query by the export action
+    export_chunk_size = EXPORT_CHUNK_SIZE
 
     def get_queryset(self):
-        return Task.objects.filter(user=self.request.user)
+        queryset = Task.objects.filter(user=self.request.user)
+        fields = self.get_requested_fields()
+        if fields is not None:
+            # The cursor is built from the ordering columns, so always load them
+            queryset = queryset.only('id', 'created_at', *fields)
+        return queryset
+
+    def get_requested_fields(self):
+        """Return the task fields selected with ?fields=, or None for all of them"""
+        if self.request.method != 'GET':
+            return None
+        return requested_task_fields(self.request.query_params.get('fields'))
+
+    def get_serializer(self, *args, **kwargs):
+        fields = self.get_requested_fields()
+        if fields is not None:
+            kwargs.setdefault('fields', fields)
+        return super().get_serializer(*args, **kwargs)
 
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
 
+    def list_tasks(self, queryset):
+        """Paginated response for a read-only task list, built without model instances"""
+        fields = self.get_requested_fields()
+        page = self.paginate_queryset(task_values(self.filter_queryset(queryset), fields))
+        return self.get_paginated_response(task_representations(page, fields))
+
+    @versioned_etag(TASKS)
+    def list(self, request, *args, **kwargs):
+        return self.list_tasks(self.get_queryset())
+
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         if serializer.is_valid():
@@ -38,44 +84,15 @@ class TaskViewSet(viewsets.ModelViewSet):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
     @action(detail=False, methods=['get'])
+    @versioned_etag(TASKS, daily=True)
     def dashboard_stats(self, request):
         """Get dashboard statistics for the current user"""
-        user = request.user
-        today = timezone.now().date()
-        
-        # Task counts
-        total_tasks = Task.objects.filter(user=user).count()
-        completed_tasks = Task.objects.filter(user=user, status='completed').count()
-        in_progress_tasks = Task.objects.filter(user=user, status='in_progress').count()
-        overdue_tasks = Task.objects.filter(
-            user=user, 
-            due_date__lt=today, 
-            status__in=['pending', 'in_progress']
-        ).count()
-        
-        # Calculate productivity percentage
-        productivity = round((completed_tasks / total_tasks * 100) if total_tasks > 0 else 0)
-        
-        # Tasks by priority
-        high_priority = Task.objects.filter(user=user, priority='high', status__in=['pending', 'in_progress']).count()
-        
-        # Recent tasks (last 7 days)
-        week_ago = today - timedelta(days=7)
-        recent_completed = Task.objects.filter(
-            user=user, 
-            status='completed', 
-            updated_at__date__gte=week_ago
-        ).count()
-        
-        return Response({
-            'total_tasks': total_tasks,
-            'completed_tasks': completed_tasks,
-            'in_progress_tasks': in_progress_tasks,
-            'overdue_tasks': overdue_tasks,
-            'productivity': productivity,
-            'high_priority_tasks': high_priority,
-            'recent_completed': recent_completed
-        })
+        try:
+            breakdowns = parse_breakdowns(request.query_params.get('breakdown'))
+        except ValueError as exc:
+            return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(get_dashboard_stats(request.user, breakdowns))
 
     @action(detail=False, methods=['get'])
     def filter_tasks(self, request):
@@ -83,29 +100,117 @@ class TaskViewSet(viewsets.ModelViewSet):
         filter_type = request.query_params.get('filter_type')
         filter_value = request.query_params.get('filter_value')
         
-        queryset = self.get_queryset()
-        
-        if filter_type == 'due_date':
-            today = timezone.now().date()
-            if filter_value == 'today':
-                queryset = queryset.filter(due_date=today)
-            elif filter_value == 'overdue':
-                queryset = queryset.filter(due_date__lt=today, status__in=['pending', 'in_progress'])
-            elif filter_value == 'this_week':
-                week_end = today + timedelta(days=7)
-                queryset = queryset.filter(due_date__range=[today, week_end])
-        
-        elif filter_type == 'priority':
-            queryset = queryset.filter(priority=filter_value)
-        
-        elif filter_type == 'status':
-            queryset = queryset.filter(status=filter_value)
-        
-        elif filter_type == 'category':
-            queryset = queryset.filter(category=filter_value)
-        
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data)
+        queryset = apply_task_filter(self.get_queryset(), filter_type, filter_value)
+        return self.list_tasks(queryset)
+
+    @action(detail=False, methods=['get'], pagination_class=TaskSearchPagination)
+    def search(self, request):
+        """Full-text search over task titles and descriptions, best matches first"""
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            return Response({'error': 'A search query (q) is required'}, status=status.HTTP_400_BAD_REQUEST)
+
+        queryset = apply_task_filter(
+            self.get_queryset(),
+            request.query_params.get('filter_type'),
+            request.query_params.get('filter_value'),
+        )
+        queryset = search_tasks(queryset, query)
+
+        page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+    @action(detail=False, methods=['post'])
+    def bulk(self, request):
+        """Apply a list of create/update/delete/status operations in one transaction"""
+        # A body that isn't a JSON object is reported like missing operations
+        operations = BulkTaskOperations(
+            request.user,
+            request.data.get('operations') if isinstance(request.data, dict) else None,
+            context=self.get_serializer_context(),
+        )
+        if not operations.is_valid():
+            return Response(operations.error_response, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response({'results': operations.save()})
+
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        """Stream all matching tasks as CSV or NDJSON (?output=csv|ndjson), in constant memory"""
+        export_format = request.query_params.get('output', 'csv')
+        if export_format not in EXPORT_FORMATS:
+            return Response({'error': f"output must be one of: {', '.join(EXPORT_FORMATS)}"},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        queryset = apply_task_filter(
+            self.get_queryset(),
+            request.query_params.get('filter_type'),
+            request.query_params.get('filter_value'),
+        )
+        content_type, _ = EXPORT_FORMATS[export_format]
+        # Django reads a sync iterator to the end before sending it under ASGI
+        export = aexport_tasks if isinstance(request._request, ASGIRequest) else export_tasks
+        response = StreamingHttpResponse(export(queryset, export_format, self.export_chunk_size),
+                                         content_type=f'{content_type}; charset=utf-8')
+        filename = f'tasks-{timezone.localdate().isoformat()}.{export_format}'
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+
+    @action(detail=False, methods=['post'], url_path='import', url_name='import')
+    def import_file(self, request):
+        """Create tasks from a CSV or NDJSON body, read as a stream; invalid rows are skipped and reported"""
+        content_type = request.content_type.split(';')[0].strip()
+        import_format = next((name for name, (accepted, _) in IMPORT_FORMATS.items() if accepted == content_type), None)
+        if import_format is None:
+            accepted = ', '.join(accepted for accepted, _ in IMPORT_FORMATS.values())
+            return Response({'error': f'Content-Type must be one of: {accepted}'},
+                            status=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE)
+
+        lines = iter_lines(request.stream) if request.stream is not None else []
+        try:
+            result = import_tasks(request.user, lines, import_format, context=self.get_serializer_context())
+        except TaskImportError as exc:
+            return Response({'error': str(exc), **exc.result.as_dict()}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(result.as_dict())
+
+    @action(detail=False, methods=['get'])
+    def changes(self, request):
+        """Return tasks created, updated or deleted since a sync token"""
+        now = timezone.now()
+        token = make_sync_token(now)
+        since = request.query_params.get('since')
+        if not since:
+            # No baseline yet: hand out a token and let the client load the full list
+            return Response({'changed': [], 'deleted': [], 'token': token, 'reset': True})
+
+        try:
+            since = parse_sync_token(since)
+        except (ValueError, OverflowError, OSError):
+            return Response({'error': 'Invalid sync token'}, status=status.HTTP_400_BAD_REQUEST)
+
+        if since < now - TOMBSTONE_RETENTION:
+            # Deletions this old may have been pruned, so a patch could miss some
+            return Response({'changed': [], 'deleted': [], 'token': token, 'reset': True})
+
+        since -= SYNC_OVERLAP
+        fields = self.get_requested_fields()
+        changed = list(task_values(
+            self.get_queryset().filter(updated_at__gte=since).order_by('updated_at', 'id'), fields
+        )[:SYNC_MAX_CHANGES + 1])
+        if len(changed) > SYNC_MAX_CHANGES:
+            return Response({'changed': [], 'deleted': [], 'token': token, 'reset': True})
+
+        deleted = TaskTombstone.objects.filter(
+            user=request.user, deleted_at__gte=since
+        ).values_list('task_id', flat=True)
+
+        return Response({
+            'changed': task_representations(changed, fields),
+            'deleted': list(deleted),
+            'token': token,
+            'reset': False,
+        })
 
 class UserProfileViewSet(viewsets.ModelViewSet):
     serializer_class = UserProfileSerializer
@@ -116,10 +221,11 @@ class UserProfileViewSet(viewsets.ModelViewSet):
         return UserProfile.objects.filter(user=self.request.user)
 
     def get_object(self):
-        profile, created = UserProfile.objects.get_or_create(user=self.request.user)
-        return profile
+        # Loaded with the user by ProfileMiddleware; only created if missing
+        return self.request.profile
 
     @action(detail=False, methods=['get'])
+    @versioned_etag(PROFILE)
     def me(self, request):
         """Get current user's profile"""
         profile = self.get_object()
@@ -161,6 +267,18 @@ class UserProfileViewSet(viewsets.ModelViewSet):
         
         return Response({'message': 'Password changed successfully'})
 
+def _duplicate_labels(user, labels):
+    """Labels repeated in the list or already used by one of the user's quick actions"""
+    duplicates = {label for label in labels if labels.count(label) > 1}
+    duplicates.update(QuickAction.objects.filter(user=user, label__in=labels).values_list('label', flat=True))
+    return duplicates
+
+
+def _duplicates_response(duplicates):
+    return Response({'error': f'Quick actions already exist: {sorted(duplicates)}'},
+                    status=status.HTTP_400_BAD_REQUEST)
+
+
 class QuickActionViewSet(viewsets.ModelViewSet):
     serializer_class = QuickActionSerializer
     permission_classes = [IsAuthenticated]
@@ -168,69 +286,88 @@ class QuickActionViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         return QuickAction.objects.filter(user=self.request.user, is_active=True)
 
+    @versioned_etag(QUICK_ACTIONS)
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
 
     @action(detail=False, methods=['post'])
     def reorder(self, request):
         """Reorder quick actions"""
-        action_orders = request.data.get('actions', [])
-        
-        for item in action_orders:
-            try:
-                action = QuickAction.objects.get(
-                    id=item['id'], 
-                    user=request.user
-                )
-                action.order = item['order']
-                action.save()
-            except QuickAction.DoesNotExist:
-                continue
+        serializer = QuickActionOrderSerializer(data=request.data.get('actions', []), many=True)
+        if not serializer.is_valid():
+            return Response({'errors': serializer.errors}, status=status.HTTP_400_BAD_REQUEST)
+
+        orders = {item['id']: item['order'] for item in serializer.validated_data}
+        with transaction.atomic():
+            actions = list(QuickAction.objects.select_for_update().filter(user=request.user, id__in=orders).order_by())
+            missing = sorted(set(orders) - {action.id for action in actions})
+            if missing:
+                return Response({'error': f'Unknown quick actions: {missing}'}, status=status.HTTP_400_BAD_REQUEST)
+
+            for action in actions:
+                action.order = orders[action.id]
+            QuickAction.objects.bulk_update(actions, ['order'])
+            quick_actions_changed(request.user.id)
         
         return Response({'status': 'success'})
 
     @action(detail=False, methods=['post'])
     def bulk_create(self, request):
         """Create multiple quick actions at once"""
-        actions_data = request.data.get('actions', [])
-        created_actions = []
-        
-        for action_data in actions_data:
-            action_data['user'] = request.user.id
-            serializer = self.get_serializer(data=action_data)
-            if serializer.is_valid():
-                action = serializer.save(user=request.user)
-                created_actions.append(serializer.data)
-        
+        serializer = self.get_serializer(data=request.data.get('actions', []), many=True)
+        if not serializer.is_valid():
+            return Response({'errors': serializer.errors}, status=status.HTTP_400_BAD_REQUEST)
+
+        labels = [data['label'] for data in serializer.validated_data]
+        duplicates = _duplicate_labels(request.user, labels)
+        if duplicates:
+            return _duplicates_response(duplicates)
+
+        try:
+            with transaction.atomic():
+                actions = QuickAction.objects.bulk_create(
+                    [QuickAction(user=request.user, **data) for data in serializer.validated_data]
+                )
+                if not connection.features.can_return_rows_from_bulk_insert:
+                    # MySQL doesn't report the new ids; labels are unique per user
+                    actions = sorted(
+                        QuickAction.objects.filter(user=request.user, label__in=labels),
+                        key=lambda action: labels.index(action.label),
+                    )
+                quick_actions_changed(request.user.id)
+        except IntegrityError:
+            # A concurrent request created one of the labels after the check above;
+            # the unique (user, label) constraint rolled this one back
+            return _duplicates_response(_duplicate_labels(request.user, labels))
+
+        created_actions = self.get_serializer(actions, many=True).data
         return Response({'actions': created_actions, 'count': len(created_actions)})
 
 @login_required
 def task_list(request):
-    return render(request, 'tasks/task_list.html')
+    return render(request, 'tasks/task_list.html', {'page_data': task_page_data(request)})
 
 def login_view(request):
     if request.method == 'POST':
         email = request.POST.get('email')
         password = request.POST.get('password')
         
-        # Try to find user by email
-        try:
-            username = User.objects.get(email=email).username
-            user = authenticate(request, username=username, password=password)
-            if user is not None:
-                login(request, user)
-                return redirect('home')
-            else:
-                messages.error(request, 'Invalid email or password')
-        except User.DoesNotExist:
-            messages.error(request, 'Invalid email or password')
+        # Resolved by EmailBackend with one indexed, case-insensitive lookup
+        user = authenticate(request, email=email, password=password)
+        if user is not None:
+            login(request, user)
+            return redirect('home')
+        messages.error(request, 'Invalid email or password')
     
     return render(request, 'tasks/auth.html', {'is_login': True})
 
 def signup_view(request):
     if request.method == 'POST':
         username = request.POST.get('username')
-        email = request.POST.get('email')
+        email = (request.POST.get('email') or '').strip()
         password = request.POST.get('password')
         password2 = request.POST.get('password2')
 
@@ -242,12 +379,18 @@ def signup_view(request):
             messages.error(request, 'Username already exists')
             return render(request, 'tasks/auth.html', {'is_login': False})
 
-        if User.objects.filter(email=email).exists():
+        if users_with_email(email).exists():
             messages.error(request, 'Email already registered')
             return render(request, 'tasks/auth.html', {'is_login': False})
 
-        user = User.objects.create_user(username=username, email=email, password=password)
-        login(request, user)
+        try:
+            with transaction.atomic():
+                user = User.objects.create_user(username=username, email=email, password=password)
+        except IntegrityError:
+            # Lost a race with a concurrent signup for the same email or username
+            messages.error(request, 'Email already registered')
+            return render(request, 'tasks/auth.html', {'is_login': False})
+        login(request, user, backend='tasks.backends.EmailBackend')
         return redirect('home')
 
     return render(request, 'tasks/auth.html', {'is_login': False})
@@ -266,9 +409,15 @@ def update_user(request):
     first_name = request.data.get('first_name')
     last_name = request.data.get('last_name')
     
-    if email and email != user.email:
-        # Check if email is already taken
-        if User.objects.filter(email=email).exclude(id=user.id).exists():
+    if email is not None:
+        if not isinstance(email, str) or not email.strip():
+            return Response({'error': 'Email must be a non-empty string'}, status=status.HTTP_400_BAD_REQUEST)
+        email = email.strip()
+    # Emails are matched ignoring case, so a change of case alone isn't a change
+    email_changed = email is not None and email.lower() != user.email.lower()
+    if email_changed:
+        # Check if email is already taken, ignoring case
+        if users_with_email(email).exclude(id=user.id).exists():
             return Response({'error': 'Email already exists'}, status=status.HTTP_400_BAD_REQUEST)
         user.email = email
     
@@ -278,7 +427,15 @@ def update_user(request):
     if last_name is not None:
         user.last_name = last_name
     
-    user.save()
+    if email_changed:
+        try:
+            # The unique email index settles a race with another user taking it
+            with transaction.atomic():
+                user.save()
+        except IntegrityError:
+            return Response({'error': 'Email already exists'}, status=status.HTTP_400_BAD_REQUEST)
+    else:
+        user.save()
     
     return Response({
         'message': 'User updated successfully',